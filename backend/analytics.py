@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Offline per-sutra difficulty analytics over recorded game answers.
+
+Loads answers from the SQLite store into columnar NumPy arrays and computes
+error rates, time-to-answer distributions and level breakdowns in vectorized
+passes. The resulting report is what GameService reads through SutraReport.
+
+Only the SQLite backend (PANINI_REPOSITORY=sqlite) keeps answers; the memory
+backend loses them on restart, so there is nothing to analyze for it.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple
+
+import numpy as np
+import typer
+from rich.console import Console
+
+from .services.sutra_report import DEFAULT_REPORT_PATH, REPORT_VERSION
+
+# The store the server writes to with PANINI_REPOSITORY=sqlite
+DEFAULT_DB_PATH = os.environ.get("PANINI_SQLITE_PATH", "backend/panini.sqlite3")
+# Pseudo-attempts pulling sparse sutras towards the global error rate
+PRIOR_ATTEMPTS = 10
+TIME_QUANTILES = {"time_p50": 0.5, "time_p90": 0.9}
+
+
+class AnswerColumns(NamedTuple):
+    """One array per answer attribute, aligned by index; strings are stored as codes"""
+    sutra: np.ndarray          # int32 code into sutra_names (the step's correct sutra)
+    correct: np.ndarray        # bool
+    seconds: np.ndarray        # float64 time to answer
+    level: np.ndarray          # int32 code into level_names
+    sutra_names: np.ndarray
+    level_names: np.ndarray
+
+
+class _Codes:
+    """Assigns dense integer codes to strings while loading, so no string sort is needed later"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+
+    def __call__(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes)
+        return code
+
+    def names(self) -> np.ndarray:
+        return np.array(list(self.codes), dtype=str)
+
+
+class _Loader:
+    def __init__(self):
+        self.sutra_codes, self.level_codes = _Codes(), _Codes()
+        self.sutras: List[int] = []
+        self.correct: List[bool] = []
+        self.seconds: List[float] = []
+        self.levels: List[int] = []
+
+    def add(self, sutra: str, correct: bool, seconds: float, level: str) -> None:
+        self.sutras.append(self.sutra_codes(sutra))
+        self.correct.append(correct)
+        self.seconds.append(seconds)
+        self.levels.append(self.level_codes(level))
+
+    def columns(self) -> AnswerColumns:
+        return AnswerColumns(
+            sutra=np.array(self.sutras, dtype=np.int32),
+            correct=np.array(self.correct, dtype=bool),
+            seconds=np.array(self.seconds, dtype=np.float64),
+            level=np.array(self.levels, dtype=np.int32),
+            sutra_names=self.sutra_codes.names(),
+            level_names=self.level_codes.names(),
+        )
+
+
+def load_sqlite_answers(path: Path, chunk_size: int = 100_000) -> AnswerColumns:
+    """Read answers, with the level of their game, from the SQLite store"""
+    loader = _Loader()
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(
+            "SELECT a.correct_answer, a.status = 'correct', a.time_taken_seconds, "
+            "COALESCE(a.level, s.difficulty, 'unknown') "
+            "FROM answers a LEFT JOIN sessions s ON s.id = a.session_id"
+        )
+        while rows := cursor.fetchmany(chunk_size):
+            for sutra, is_correct, taken, level in rows:
+                loader.add(sutra, bool(is_correct), taken, level)
+    finally:
+        conn.close()
+    return loader.columns()
+
+
+def compute_report(answers: AnswerColumns) -> Dict[str, Any]:
+    """Per-sutra and per-level aggregates; every pass is a vectorized group-by"""
+    total = len(answers.sutra)
+    report = {
+        "version": REPORT_VERSION,
+        "generated_at": datetime.now().isoformat(),
+        "answers": total,
+        "levels": {},
+        "sutras": {},
+    }
+    if total == 0:
+        return report
+
+    sutra_idx, level_idx = answers.sutra, answers.level
+    n_sutras, n_levels = len(answers.sutra_names), len(answers.level_names)
+    wrong = ~answers.correct
+
+    attempts = np.bincount(sutra_idx, minlength=n_sutras)
+    errors = np.bincount(sutra_idx, weights=wrong, minlength=n_sutras).astype(np.int64)
+    seen = attempts > 0
+    mean_seconds = np.bincount(sutra_idx, weights=answers.seconds, minlength=n_sutras) / np.maximum(attempts, 1)
+
+    # Sutra x level cells flattened into one bincount
+    cells = sutra_idx.astype(np.int64) * n_levels + level_idx
+    cell_attempts = np.bincount(cells, minlength=n_sutras * n_levels).reshape(n_sutras, n_levels)
+    cell_errors = np.bincount(cells, weights=wrong, minlength=n_sutras * n_levels).reshape(n_sutras, n_levels)
+
+    global_rate = errors.sum() / total
+    smoothed = (errors + PRIOR_ATTEMPTS * global_rate) / (attempts + PRIOR_ATTEMPTS)
+
+    # One sort of sutra-offset times orders every group at once; quantiles are then plain indexing
+    low = answers.seconds.min()
+    span = answers.seconds.max() - low + 1
+    keyed = np.sort(sutra_idx * span + (answers.seconds - low))
+    sorted_seconds = keyed - np.repeat(np.arange(n_sutras) * span, attempts) + low
+    starts = np.concatenate(([0], np.cumsum(attempts)[:-1]))
+    quantiles = {
+        name: sorted_seconds[np.minimum(starts + np.floor(q * np.maximum(attempts - 1, 0)).astype(np.int64), total - 1)]
+        for name, q in TIME_QUANTILES.items()
+    }
+
+    level_attempts = cell_attempts.sum(axis=0)
+    level_errors = cell_errors.sum(axis=0)
+    for j, level in enumerate(answers.level_names.tolist()):
+        if level_attempts[j]:
+            report["levels"][level] = {
+                "attempts": int(level_attempts[j]),
+                "errors": int(level_errors[j]),
+                "error_rate": float(level_errors[j] / level_attempts[j]),
+            }
+
+    level_names = answers.level_names.tolist()
+    for i, sutra in enumerate(answers.sutra_names.tolist()):
+        if not seen[i]:
+            continue
+        report["sutras"][sutra] = {
+            "attempts": int(attempts[i]),
+            "errors": int(errors[i]),
+            "error_rate": float(errors[i] / attempts[i]),
+            "smoothed_error_rate": float(smoothed[i]),
+            "time_mean": float(mean_seconds[i]),
+            **{name: float(values[i]) for name, values in quantiles.items()},
+            "by_level": {
+                level: [int(cell_attempts[i, j]), int(cell_errors[i, j])]
+                for j, level in enumerate(level_names)
+                if cell_attempts[i, j]
+            },
+        }
+    report["global_error_rate"] = float(global_rate)
+    return report
+
+
+def analyze(
+    db: Path = typer.Option(Path(DEFAULT_DB_PATH), "--db", help="SQLite store to read answers from"),
+    output: Path = typer.Option(Path(DEFAULT_REPORT_PATH), "--output", "-o", help="Report file to write"),
+):
+    """Compute per-sutra difficulty analytics and write the report."""
+    console = Console()
+    if not db.exists():
+        console.print(f"[red]✗ No SQLite store at {db}; answers are only kept with PANINI_REPOSITORY=sqlite[/red]")
+        sys.exit(1)
+    try:
+        answers = load_sqlite_answers(db)
+    except sqlite3.Error as e:
+        console.print(f"[red]✗ Error loading answers: {e}[/red]")
+        sys.exit(1)
+
+    report = compute_report(answers)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+    console.print(f"[green]✓ Analyzed {report['answers']} answers over {len(report['sutras'])} sutras → {output}[/green]")
+    hardest = sorted(report["sutras"].items(), key=lambda item: -item[1]["smoothed_error_rate"])[:5]
+    for sutra, figures in hardest:
+        console.print(
+            f"  {sutra}: {figures['error_rate']:.0%} errors over {figures['attempts']} attempts, "
+            f"p50 {figures['time_p50']:.1f}s"
+        )
+
+
+def main():
+    typer.run(analyze)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Pre-derive game words into the catalogue behind drill and adaptive games.
+
+Every dhatu playable at a level is combined with that level's prayoga,
+lakara, purusha and vacana values and derived once, offline. GameService
+loads the result into a DerivationIndex, so picking a word that exercises
+a sutra needs no derivation at request time.
+"""
+
+import itertools
+import json
+import random
+import sys
+from pathlib import Path
+from typing import List
+
+import typer
+from rich.console import Console
+from vidyut.kosha import Kosha
+
+from .services.derivation_index import DEFAULT_CATALOG_PATH
+from .services.word_service import WordService
+
+
+def build(
+    kosha_path: Path = typer.Option(Path("backend/vidyut-0.4.0/kosha"), "--kosha", help="Vidyut kosha directory"),
+    levels: List[str] = typer.Option(["beginner", "expert"], "--level", "-l", help="Levels to derive"),
+    per_dhatu: int = typer.Option(8, "--per-dhatu", help="Forms derived per dhatu and level (sampled when there are more)"),
+    seed: int = typer.Option(0, "--seed", help="Seed for sampling forms"),
+    output: Path = typer.Option(Path(DEFAULT_CATALOG_PATH), "--output", "-o", help="Catalogue file to write"),
+):
+    """Derive words for every playable dhatu and write the catalogue."""
+    console = Console()
+    try:
+        word_service = WordService(Kosha(str(kosha_path)))
+    except Exception as e:
+        console.print(f"[red]✗ Error loading kosha from {kosha_path}: {e}[/red]")
+        sys.exit(1)
+
+    rng = random.Random(seed)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_suffix(".tmp")
+    written = 0
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for level in levels:
+            options = word_service.get_tinanta_options(level)
+            forms = list(itertools.product(
+                options["prayoga"], options["lakara"], options["purusha"], options["vacana"]
+            ))
+            dhatus = word_service.get_dhatus(level)
+            console.print(f"[blue]Deriving {level}: {len(dhatus)} dhatus x {min(per_dhatu, len(forms))} forms[/blue]")
+            for entry in dhatus:
+                for form in rng.sample(forms, min(per_dhatu, len(forms))):
+                    try:
+                        prakriyas = word_service.derive_tinanta(entry.dhatu, *form)
+                    except Exception as e:
+                        console.print(f"[yellow]⚠ Skipping {entry.dhatu.aupadeshika}: {e}[/yellow]")
+                        continue
+                    for prakriya in prakriyas:
+                        f.write(json.dumps({
+                            "level": level,
+                            "root": entry.dhatu.aupadeshika,
+                            "text": prakriya.text,
+                            "history": [[step.code, list(step.result)] for step in prakriya.history],
+                        }, ensure_ascii=False) + "\n")
+                        written += 1
+    tmp_path.replace(output)
+    console.print(f"[green]✓ Wrote {written} derivations → {output}[/green]")
+
+
+def main():
+    typer.run(build)
+
+
+if __name__ == "__main__":
+    main()
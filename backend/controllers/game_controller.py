@@ -3,14 +3,19 @@ Game-related API controllers for the Panini Parser Sanskrit game.
 Provides RESTful endpoints for game session management and Panini grammar rule lookup.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 
 from ..dto.game_dto import (
     StartGameRequest, StartGameResponse, SubmitAnswerRequest, SubmitAnswerResponse,
-    GameStatusResponse, FinishGameResponse, GetChoicesResponse
+    GameStatusResponse, FinishGameResponse, GetChoicesResponse,
+    BulkStartGameRequest, BulkStartGameResponse
 )
 from ..services.interfaces import IGameService
-from ..dependencies import get_game_service
+from ..services.admission import AdmissionController, OverloadedError
+from ..dependencies import get_game_service, get_derivation_gate
+
 
 router = APIRouter(
     prefix="/game", 
@@ -19,6 +24,15 @@ router = APIRouter(
 )
 
 
+def _service_unavailable(error: OverloadedError) -> HTTPException:
+    """503 telling the client when to retry"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"{error}, please retry shortly",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
 @router.get(
     "/start", 
     response_model=StartGameResponse,
@@ -28,7 +42,15 @@ router = APIRouter(
 async def start_game(
     level: str = "beginner",
     length: int = 5,
-    game_service: IGameService = Depends(get_game_service)
+    pada: str = "tinanta",
+    user_id: Optional[str] = None,
+    sutra: Optional[str] = None,
+    adaptive: bool = False,
+    gana: Optional[List[str]] = Query(None),
+    prefixes: Optional[bool] = None,
+    sanadi: Optional[List[str]] = Query(None),
+    game_service: IGameService = Depends(get_game_service),
+    derivation_gate: AdmissionController = Depends(get_derivation_gate)
 ) -> StartGameResponse:
     """
     Start a new Sanskrit parsing game session.
@@ -42,14 +64,28 @@ async def start_game(
         - `intermediate`: Compound words and intermediate grammar
         - `expert`: Complex formations and advanced rules
     - **length**: Number of transformation steps (1-20)
+    - **pada**: `tinanta` (verb from a dhatu, default) or `subanta` (noun from a pratipadika)
+    - **user_id**: Optional player id; the final score is posted to the leaderboards on finish
+    - **sutra**: Drill mode; the word is drawn from catalogued derivations that apply this sutra
+    - **adaptive**: Draw from the catalogue, favouring the sutras this player (or everyone) gets wrong
+    - **gana**: Only dhatus of these ganas (repeatable, e.g. `bhvadi`)
+    - **prefixes**: Only dhatus with (`true`) or without (`false`) upasargas
+    - **sanadi**: Only dhatus with one of these sanadi pratyayas (repeatable, e.g. `san`; `none` for plain dhatus)
     
     **Returns:**
     - **gameId**: Unique session identifier for subsequent API calls
     - **steps**: Array of transformation challenges with Sanskrit forms
     
+    Game generation is admission controlled: when too many games are being
+    generated at once, the request fails fast with `503` and a `Retry-After` header.
+    
     **Example:**
     ```
     GET /game/start?level=beginner&length=3
+    GET /game/start?level=beginner&sutra=3.4.78
+    GET /game/start?level=expert&adaptive=true&user_id=alice
+    GET /game/start?level=expert&gana=adadi&gana=juhotyadi&prefixes=false
+    GET /game/start?level=beginner&pada=subanta
     ```
     
     **Response:**
@@ -68,8 +104,14 @@ async def start_game(
     ```
     """
     try:
-        request = StartGameRequest(level=level, length=length)
-        return await game_service.start_game(request)
+        request = StartGameRequest(
+            level=level, length=length, pada=pada, user_id=user_id, sutra=sutra, adaptive=adaptive,
+            gana=gana, prefixes=prefixes, sanadi=sanadi,
+        )
+        async with derivation_gate.admit():
+            return await game_service.start_game(request)
+    except OverloadedError as e:
+        raise _service_unavailable(e)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -82,6 +124,101 @@ async def start_game(
         )
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkStartGameResponse,
+    summary="Start Games in Bulk",
+    description="Start the same game for a whole class: one derivation, one session per student."
+)
+async def start_bulk_games(
+    request: BulkStartGameRequest,
+    game_service: IGameService = Depends(get_game_service),
+    derivation_gate: AdmissionController = Depends(get_derivation_gate)
+) -> BulkStartGameResponse:
+    """
+    Start the same game for many players at once.
+    
+    The word is derived once and every session shares its steps, so creating
+    hundreds of sessions costs about as much as creating one.
+    
+    **Request Body:**
+    - **level**, **length**, **pada**, **sutra**, **gana**, **prefixes**, **sanadi**: As for `/game/start`
+    - **count**: Number of anonymous sessions (1-1000)
+    - **user_ids**: One session per player instead of `count`
+    
+    **Returns:**
+    - **gameIds**: One session identifier per player, in request order
+    - **steps**: The shared transformation steps
+    
+    **Example:**
+    ```
+    POST /game/bulk
+    {
+      "level": "beginner",
+      "length": 5,
+      "user_ids": ["student-1", "student-2"]
+    }
+    ```
+    """
+    try:
+        async with derivation_gate.admit():
+            return await game_service.start_bulk_games(request)
+    except OverloadedError as e:
+        raise _service_unavailable(e)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error starting games: {str(e)}"
+        )
+
+
+@router.get(
+    "/daily",
+    response_model=StartGameResponse,
+    summary="Start Daily Challenge",
+    description="Start a session of today's challenge, which is the same derivation for every player."
+)
+async def start_daily_game(
+    level: str = "beginner",
+    user_id: Optional[str] = None,
+    game_service: IGameService = Depends(get_game_service)
+) -> StartGameResponse:
+    """
+    Start a session of the daily challenge.
+    
+    The challenge is derived once per day and level, together with its
+    transliterated steps and multiple choice options. Every session that day
+    shares it and only keeps its own progress.
+    
+    **Parameters:**
+    - **level**: Difficulty level (`beginner` or `expert`)
+    - **user_id**: Optional player id; the final score is posted to the leaderboards on finish
+    
+    **Example:**
+    ```
+    GET /game/daily?level=beginner
+    ```
+    """
+    try:
+        request = StartGameRequest(level=level, user_id=user_id)
+        return await game_service.start_daily_game(request.level, request.user_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error starting daily challenge: {str(e)}"
+        )
+
+
 @router.post(
     "/{game_id}/step/{step_id}/answer", 
     response_model=SubmitAnswerResponse,
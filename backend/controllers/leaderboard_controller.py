@@ -0,0 +1,103 @@
+"""
+Leaderboard API controllers.
+Serves per-difficulty boards over daily, weekly and all-time windows.
+"""
+
+from typing import Optional, Literal
+
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+
+from ..dto.leaderboard_dto import LeaderboardEntry, LeaderboardResponse, UserRankResponse
+from ..repositories.interfaces import ILeaderboardRepository
+from ..dependencies import get_leaderboard_repository
+
+router = APIRouter(
+    prefix="/leaderboard",
+    tags=["Leaderboard"],
+)
+
+
+@router.get(
+    "",
+    response_model=LeaderboardResponse,
+    summary="Get Leaderboard",
+    description="Top players by high score for a difficulty and time window."
+)
+async def get_leaderboard(
+    window: Literal["day", "week", "all"] = "all",
+    difficulty: Optional[str] = None,
+    limit: int = Query(default=10, ge=1, le=100),
+    page: int = Query(default=1, ge=1),
+    leaderboard: ILeaderboardRepository = Depends(get_leaderboard_repository)
+) -> LeaderboardResponse:
+    """
+    Get a page of the leaderboard.
+    
+    **Parameters:**
+    - **window**: `day`, `week` or `all`; daily and weekly boards start empty each period
+    - **difficulty**: Restrict to one game level, or omit for all levels
+    - **limit**: Entries per page (1-100)
+    - **page**: 1-based page number
+    
+    **Example:**
+    ```
+    GET /leaderboard?window=week&difficulty=beginner&limit=10
+    ```
+    """
+    try:
+        entries, total = await leaderboard.get_leaderboard(
+            difficulty=difficulty, limit=limit, page=page, window=window
+        )
+        return LeaderboardResponse(
+            window=window,
+            difficulty=difficulty,
+            entries=[
+                LeaderboardEntry(
+                    rank=entry.rank,
+                    user_id=entry.user_id,
+                    username=entry.username,
+                    high_score=entry.high_score,
+                    total_score=entry.total_score,
+                    sessions_played=entry.sessions_played
+                )
+                for entry in entries
+            ],
+            total=total,
+            page=page,
+            limit=limit
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error getting leaderboard: {str(e)}"
+        )
+
+
+@router.get(
+    "/{user_id}/rank",
+    response_model=UserRankResponse,
+    summary="Get User Rank",
+    description="A player's rank on a difficulty and time window board."
+)
+async def get_user_rank(
+    user_id: str,
+    window: Literal["day", "week", "all"] = "all",
+    difficulty: Optional[str] = None,
+    leaderboard: ILeaderboardRepository = Depends(get_leaderboard_repository)
+) -> UserRankResponse:
+    """
+    Get a player's 1-based rank; `rank` is null if they have no score on the board.
+    
+    **Example:**
+    ```
+    GET /leaderboard/alice/rank?window=day
+    ```
+    """
+    try:
+        rank = await leaderboard.get_user_rank(user_id, difficulty=difficulty, window=window)
+        return UserRankResponse(user_id=user_id, window=window, difficulty=difficulty, rank=rank)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error getting user rank: {str(e)}"
+        )
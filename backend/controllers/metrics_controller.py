@@ -0,0 +1,51 @@
+"""
+Operational metrics for the backend.
+"""
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends
+
+from ..services.event_queue import WriteBehindQueue
+from ..services.journal import GameJournal
+from ..services.interfaces import IGameService
+from ..services.admission import AdmissionController
+from ..dependencies import get_event_queue, get_journal, get_game_service, get_derivation_gate
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+)
+
+
+@router.get(
+    "",
+    summary="Get Metrics",
+    description="Queue depth, throughput counters and lag of background work."
+)
+async def get_metrics(
+    events: WriteBehindQueue = Depends(get_event_queue),
+    journal: Optional[GameJournal] = Depends(get_journal),
+    game_service: IGameService = Depends(get_game_service),
+    derivation_gate: AdmissionController = Depends(get_derivation_gate)
+) -> Dict[str, Any]:
+    """
+    Report backend metrics.
+    
+    **Returns:**
+    - **eventQueue**: Pending events, enqueued/flushed/dropped/failed counters,
+      flushed batches, age of the oldest pending event and flush lag in seconds
+    - **journal**: Appended events, fsyncs, snapshots, events since the last
+      snapshot and the duration of the last recovery (null when disabled)
+    - **derivations**: Derivation cache hits and misses; of the misses, how many
+      ran (`executed`) and how many joined an identical derivation already in
+      flight (`coalesced`), plus the same for daily challenge preparation
+    - **admission**: Limits, occupancy and admitted/queued/rejected/timed-out
+      counters of the gate in front of game generation
+    """
+    return {
+        "eventQueue": events.metrics(),
+        "journal": journal.metrics() if journal is not None else None,
+        "derivations": game_service.derivation_metrics(),
+        "admission": {"derivation": derivation_gate.metrics()},
+    }
@@ -2,12 +2,18 @@
 Dependency injection for FastAPI
 """
 
+import os
 from functools import lru_cache
+from typing import Optional
 
 from .repositories.memory_repository import (
     MemoryWordRepository, MemoryGameRepository, 
     MemoryLeaderboardRepository, MemoryStatsRepository
 )
+from .repositories.sqlite_repository import (
+    SQLiteDatabase, SQLiteWordRepository, SQLiteGameRepository,
+    SQLiteLeaderboardRepository, SQLiteStatsRepository
+)
 from .repositories.interfaces import (
     IWordRepository, IGameRepository, 
     ILeaderboardRepository, IStatsRepository
@@ -15,35 +21,92 @@ from .repositories.interfaces import (
 from .services.interfaces import IGameService, IWordService
 from .services.word_service import WordService
 from .services.game_service import GameService
+from .services.event_queue import WriteBehindQueue
+from .services.journal import GameJournal
+from .services.sutra_report import SutraReport, DEFAULT_REPORT_PATH
+from .services.derivation_index import DerivationIndex, DEFAULT_CATALOG_PATH
+from .services.admission import AdmissionController
 from vidyut.kosha import Kosha
 from vidyut.prakriya import Data, Source
 
 
-# Repository instances (singletons for memory repositories)
+# Repository backend: "memory" (default) or "sqlite"
+REPOSITORY_BACKEND = os.environ.get("PANINI_REPOSITORY", "memory")
+SQLITE_PATH = os.environ.get("PANINI_SQLITE_PATH", "backend/panini.sqlite3")
+SQLITE_POOL_SIZE = int(os.environ.get("PANINI_SQLITE_POOL_SIZE", "4"))
+# Derivation-heavy endpoints: concurrent requests, waiting requests, and how long one may wait
+DERIVE_CONCURRENCY = int(os.environ.get("PANINI_DERIVE_CONCURRENCY", str(os.cpu_count() or 4)))
+DERIVE_QUEUE = int(os.environ.get("PANINI_DERIVE_QUEUE", str(2 * DERIVE_CONCURRENCY)))
+DERIVE_QUEUE_TIMEOUT = float(os.environ.get("PANINI_DERIVE_QUEUE_TIMEOUT", "1.0"))
+RETRY_AFTER_SECONDS = int(os.environ.get("PANINI_RETRY_AFTER_SECONDS", "1"))
+
+if REPOSITORY_BACKEND not in ("memory", "sqlite"):
+    raise ValueError(f"Unknown PANINI_REPOSITORY: {REPOSITORY_BACKEND}")
+
+
+@lru_cache()
+def get_sqlite_database() -> SQLiteDatabase:
+    """Get the shared SQLite connection pool"""
+    return SQLiteDatabase(SQLITE_PATH, pool_size=SQLITE_POOL_SIZE)
+
+
+# Repository instances (singletons)
 @lru_cache()
 def get_word_repository() -> IWordRepository:
     """Get word repository instance"""
+    if REPOSITORY_BACKEND == "sqlite":
+        return SQLiteWordRepository(get_sqlite_database())
     return MemoryWordRepository()
 
 
 @lru_cache()
 def get_game_repository() -> IGameRepository:
     """Get game repository instance"""
+    if REPOSITORY_BACKEND == "sqlite":
+        return SQLiteGameRepository(get_sqlite_database())
     return MemoryGameRepository()
 
 
 @lru_cache()
 def get_leaderboard_repository() -> ILeaderboardRepository:
     """Get leaderboard repository instance"""
+    if REPOSITORY_BACKEND == "sqlite":
+        return SQLiteLeaderboardRepository(get_sqlite_database())
     return MemoryLeaderboardRepository()
 
 
 @lru_cache()
 def get_stats_repository() -> IStatsRepository:
     """Get stats repository instance"""
+    if REPOSITORY_BACKEND == "sqlite":
+        return SQLiteStatsRepository(get_sqlite_database())
     return MemoryStatsRepository()
 
 
+@lru_cache()
+def get_event_queue() -> WriteBehindQueue:
+    """Get the write-behind queue for answer and finish events"""
+    return WriteBehindQueue(
+        game_repository=get_game_repository(),
+        leaderboard_repository=get_leaderboard_repository(),
+        stats_repository=get_stats_repository(),
+        max_batch=int(os.environ.get("PANINI_EVENT_BATCH", "100")),
+        flush_interval=float(os.environ.get("PANINI_EVENT_FLUSH_SECONDS", "0.5")),
+    )
+
+
+@lru_cache()
+def get_derivation_gate() -> AdmissionController:
+    """Get the admission controller in front of endpoints that derive words"""
+    return AdmissionController(
+        "Game generation",
+        max_concurrent=DERIVE_CONCURRENCY,
+        max_queue=DERIVE_QUEUE,
+        queue_timeout=DERIVE_QUEUE_TIMEOUT,
+        retry_after=RETRY_AFTER_SECONDS,
+    )
+
+
 # Service instances
 def get_word_service() -> WordService:
     """Get word service instance"""
@@ -56,7 +119,26 @@ data = Data('backend/vidyut-0.4.0/prakriya')
 sutras = [sutra for sutra in data.load_sutras() if sutra.source == Source.Ashtadhyayi]
 
 
+@lru_cache()
+def get_journal() -> Optional[GameJournal]:
+    """Get the session journal, or None when PANINI_JOURNAL_DIR is set empty"""
+    directory = os.environ.get("PANINI_JOURNAL_DIR", "backend/journal")
+    if not directory:
+        return None
+    return GameJournal(
+        directory,
+        sessions,
+        snapshot_every=int(os.environ.get("PANINI_JOURNAL_SNAPSHOT_EVERY", "10000")),
+    )
+
+
 @lru_cache()
 def get_game_service() -> IGameService:
     """Get game service instance"""
-    return GameService(kosha=kosha,sessions=sessions, sutras=sutras) 
\ No newline at end of file
+    return GameService(
+        kosha=kosha, sessions=sessions, sutras=sutras,
+        events=get_event_queue(), journal=get_journal(),
+        report=SutraReport.load(os.environ.get("PANINI_ANALYTICS_REPORT", DEFAULT_REPORT_PATH)),
+        catalog=DerivationIndex.load(os.environ.get("PANINI_DERIVATION_CATALOG", DEFAULT_CATALOG_PATH)),
+        derive_workers=DERIVE_CONCURRENCY
+    ) 
\ No newline at end of file
@@ -11,6 +11,26 @@ class StartGameRequest(BaseModel):
     """Request DTO for GET /game/start"""
     level: Literal["beginner", "expert"] = Field(default="beginner", description="Difficulty level: beginner, expert")
     length: int = Field(default=5, ge=1, le=20, description="Number of steps in the game")
+    pada: Literal["tinanta", "subanta"] = Field(default="tinanta", description="Derive a verb (tinanta) or a noun (subanta)")
+    user_id: Optional[str] = Field(default=None, description="Player to credit on the leaderboards when the game finishes")
+    sutra: Optional[str] = Field(default=None, description="Drill mode: only derivations that apply this sutra")
+    adaptive: bool = Field(default=False, description="Prefer derivations exercising the player's weakest sutras")
+    gana: Optional[List[str]] = Field(default=None, description="Only dhatus of these ganas, e.g. bhvadi")
+    prefixes: Optional[bool] = Field(default=None, description="Only dhatus with (true) or without (false) upasargas")
+    sanadi: Optional[List[str]] = Field(default=None, description="Only dhatus with one of these sanadi pratyayas; \"none\" for plain dhatus")
+
+
+class BulkStartGameRequest(BaseModel):
+    """Request DTO for POST /game/bulk"""
+    level: Literal["beginner", "expert"] = Field(default="beginner", description="Difficulty level: beginner, expert")
+    length: int = Field(default=5, ge=1, le=20, description="Number of steps in the game")
+    pada: Literal["tinanta", "subanta"] = Field(default="tinanta", description="Derive a verb (tinanta) or a noun (subanta)")
+    count: int = Field(default=1, ge=1, le=1000, description="Number of sessions, when user_ids is not given")
+    user_ids: Optional[List[str]] = Field(default=None, min_length=1, max_length=1000, description="One session per player")
+    sutra: Optional[str] = Field(default=None, description="Drill mode: only derivations that apply this sutra")
+    gana: Optional[List[str]] = Field(default=None, description="Only dhatus of these ganas, e.g. bhvadi")
+    prefixes: Optional[bool] = Field(default=None, description="Only dhatus with (true) or without (false) upasargas")
+    sanadi: Optional[List[str]] = Field(default=None, description="Only dhatus with one of these sanadi pratyayas; \"none\" for plain dhatus")
 
 
 class GameStep(BaseModel):
@@ -27,6 +47,12 @@ class StartGameResponse(BaseModel):
     steps: List[GameStep]
 
 
+class BulkStartGameResponse(BaseModel):
+    """Response DTO for POST /game/bulk"""
+    gameIds: List[str] = Field(alias="game_ids")
+    steps: List[GameStep]
+
+
 class SubmitAnswerRequest(BaseModel):
     """Request DTO for POST /game/:gameId/step/:stepId/answer"""
     sutra: str = Field(..., min_length=1, description="Panini grammar rule number or alias")
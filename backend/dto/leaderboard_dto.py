@@ -0,0 +1,34 @@
+"""
+Data Transfer Objects for leaderboard API endpoints
+"""
+
+from typing import List, Optional, Literal
+from pydantic import BaseModel, Field
+
+
+class LeaderboardEntry(BaseModel):
+    """Single ranked leaderboard row"""
+    rank: int
+    userId: str = Field(alias="user_id")
+    username: str
+    highScore: int = Field(alias="high_score")
+    totalScore: int = Field(alias="total_score")
+    sessionsPlayed: int = Field(alias="sessions_played")
+
+
+class LeaderboardResponse(BaseModel):
+    """Response DTO for GET /leaderboard"""
+    window: Literal["day", "week", "all"]
+    difficulty: Optional[str] = None
+    entries: List[LeaderboardEntry]
+    total: int = Field(description="Number of players on this board")
+    page: int
+    limit: int
+
+
+class UserRankResponse(BaseModel):
+    """Response DTO for GET /leaderboard/:userId/rank"""
+    userId: str = Field(alias="user_id")
+    window: Literal["day", "week", "all"]
+    difficulty: Optional[str] = None
+    rank: Optional[int] = Field(None, description="1-based rank, absent if the player is not on this board")
@@ -3,17 +3,42 @@
 Panini Parser FastAPI Backend
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
+from .dependencies import get_event_queue, get_game_service, get_journal
 from .controllers.game_controller import router as game_router
 from .controllers.rules_controller import router as rules_router
+from .controllers.leaderboard_controller import router as leaderboard_router
+from .controllers.metrics_controller import router as metrics_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Recover sessions from the journal, run background work, and drain it on shutdown"""
+    journal = get_journal()
+    if journal is not None:
+        # The game service rebuilds daily sessions for the journal, so it must exist first
+        get_game_service()
+        replayed = journal.recover()
+        print(f"Recovered {len(journal.sessions)} game sessions ({replayed} journal events replayed)")
+        journal.start()
+    events = get_event_queue()
+    events.start()
+    yield
+    await events.stop()
+    if journal is not None:
+        await journal.close()
+
 
 app = FastAPI(
     title="Panini Parser API",
     description="Backend API for Sanskrit parsing game using Vidyut engine",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Configure CORS for frontend integration
@@ -29,6 +54,8 @@ app.add_middleware(
 # app.include_router(word_router, prefix="/api/v1")
 app.include_router(game_router, prefix="/api/v1")
 app.include_router(rules_router, prefix="/api/v1")
+app.include_router(leaderboard_router, prefix="/api/v1")
+app.include_router(metrics_router, prefix="/api/v1")
 
 def start_server():
     """Start the FastAPI server - used by CLI script"""
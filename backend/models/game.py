@@ -4,7 +4,7 @@ Data models for game sessions and user progress
 
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import List, Optional, Union
 from pydantic import BaseModel, ConfigDict
 from vidyut.prakriya import Step,Prakriya, Dhatu, Pada, Prayoga, Lakara, Purusha, Vacana, Linga, Vibhakti, Gana
 
@@ -25,6 +25,13 @@ class GameStatus(str, Enum):
     ABANDONED = "abandoned"
 
 
+class LeaderboardWindow(str, Enum):
+    """Time window a leaderboard covers"""
+    DAY = "day"
+    WEEK = "week"
+    ALL = "all"
+
+
 class AnswerStatus(str, Enum):
     """Status of a user's answer"""
     CORRECT = "correct"
@@ -33,17 +40,29 @@ class AnswerStatus(str, Enum):
     SKIPPED = "skipped"
 
 
+class StoredStep(BaseModel):
+    """Derivation step read back from storage, with the fields used from vidyut's Step"""
+    code: str
+    result: List[str]
+
+
 class GameSession(BaseModel):
     """Model representing a game session"""
     id: Optional[str] = None       # UUID string
+    user_id: Optional[str] = None
+    status: GameStatus = GameStatus.ACTIVE
+    difficulty: Optional[GameDifficulty] = None
     root: str
     objective: str
-    history: list[Step] = []
+    history: list[Union[Step, StoredStep]] = []
     current_step: int = 1
     started_at: datetime 
+    last_answered_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
     score: int = 0
     correct_answers: int = 0
     mistakes: int = 0
+    daily: Optional[str] = None    # Date of the shared daily challenge this session plays
     model_config = ConfigDict(arbitrary_types_allowed = True)
 
 
@@ -58,6 +77,7 @@ class GameAnswer(BaseModel):
     points_earned: int = 0
     time_taken_seconds: int
     hint_used: bool = False
+    level: Optional[str] = None    # Difficulty of the game the answer belongs to
     submitted_at: datetime
 
     class Config:
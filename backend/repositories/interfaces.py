@@ -3,10 +3,18 @@ Repository interfaces for data access layer
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, NamedTuple, Optional, Dict, Any
 
 from ..models.word import SanskritWord, ParsedForm
-from ..models.game import GameSession, GameAnswer, Leaderboard
+from ..models.game import GameSession, GameAnswer, Leaderboard, LeaderboardWindow
+
+
+class ScoreUpdate(NamedTuple):
+    """One finished game's score, as passed to ILeaderboardRepository.update_user_scores"""
+    user_id: str
+    username: str
+    score: int
+    difficulty: Optional[str] = None
 
 
 class IWordRepository(ABC):
@@ -49,6 +57,18 @@ class IWordRepository(ABC):
         """List words with filters and pagination"""
         pass
 
+    @abstractmethod
+    async def list_words_by_cursor(
+        self,
+        word_type: Optional[str] = None,
+        difficulty_level: Optional[int] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> tuple[List[SanskritWord], Optional[str]]:
+        """List words in ID order after the cursor; returns the page and the next cursor (None on the last page)"""
+        pass
+
     @abstractmethod
     async def get_random_word(self, difficulty_level: Optional[int] = None) -> Optional[SanskritWord]:
         """Get a random word for gameplay"""
@@ -88,6 +108,10 @@ class IGameRepository(ABC):
         """Save a game answer"""
         pass
 
+    async def save_answers(self, answers: List[GameAnswer]) -> List[GameAnswer]:
+        """Save a batch of answers; implementations may override to write them together"""
+        return [await self.save_answer(answer) for answer in answers]
+
     @abstractmethod
     async def get_session_answers(self, session_id: str) -> List[GameAnswer]:
         """Get all answers for a session"""
@@ -104,27 +128,55 @@ class IGameRepository(ABC):
         """Get user's game sessions"""
         pass
 
+    @abstractmethod
+    async def get_user_sessions_by_cursor(
+        self,
+        user_id: str,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> tuple[List[GameSession], Optional[str]]:
+        """Get user's sessions in creation order after the cursor; returns the page and the next cursor"""
+        pass
+
 
 class ILeaderboardRepository(ABC):
     """Interface for leaderboard data access"""
 
     @abstractmethod
-    async def update_user_score(self, user_id: str, username: str, score: int) -> None:
-        """Update user's high score"""
+    async def update_user_score(
+        self,
+        user_id: str,
+        username: str,
+        score: int,
+        difficulty: Optional[str] = None
+    ) -> None:
+        """Update user's high score on the overall and difficulty boards of every window"""
         pass
 
+    async def update_user_scores(self, scores: List[ScoreUpdate]) -> None:
+        """Apply a batch of score updates; implementations may override to write them together"""
+        for update in scores:
+            await self.update_user_score(*update)
+
     @abstractmethod
     async def get_leaderboard(
         self,
         difficulty: Optional[str] = None,
         limit: int = 10,
-        page: int = 1
+        page: int = 1,
+        window: str = LeaderboardWindow.ALL.value
     ) -> tuple[List[Leaderboard], int]:
-        """Get leaderboard entries"""
+        """Get leaderboard entries for a difficulty (None for all) and time window"""
         pass
 
     @abstractmethod
-    async def get_user_rank(self, user_id: str, difficulty: Optional[str] = None) -> Optional[int]:
+    async def get_user_rank(
+        self,
+        user_id: str,
+        difficulty: Optional[str] = None,
+        window: str = LeaderboardWindow.ALL.value
+    ) -> Optional[int]:
         """Get user's rank in leaderboard"""
         pass
 
@@ -145,4 +197,9 @@ class IStatsRepository(ABC):
     @abstractmethod
     async def record_session_stats(self, session: GameSession) -> None:
         """Record statistics for a completed session"""
-        pass
\ No newline at end of file
+        pass
+
+    async def record_sessions_stats(self, sessions: List[GameSession]) -> None:
+        """Record a batch of completed sessions; implementations may override to write them together"""
+        for session in sessions:
+            await self.record_session_stats(session)
\ No newline at end of file
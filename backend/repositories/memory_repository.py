@@ -2,13 +2,69 @@
 In-memory repository implementations for development and testing
 """
 
+import random
 import uuid
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 
-from .interfaces import IWordRepository, IGameRepository, ILeaderboardRepository, IStatsRepository
+from shared.search_index import SearchIndex
+
+from .interfaces import IWordRepository, IGameRepository, ILeaderboardRepository, IStatsRepository, ScoreUpdate
+from .pagination import encode_cursor, decode_cursor
+from .ranking import RankedSkipList, window_period
+from .sketches import SessionAggregate, global_summary, session_seconds
 from ..models.word import SanskritWord, ParsedForm, WordType
-from ..models.game import GameSession, GameAnswer, Leaderboard, GameDifficulty, GameStatus
+from ..models.game import GameSession, GameAnswer, Leaderboard, GameDifficulty, GameStatus, LeaderboardWindow
+
+
+class _IdBucket:
+    """
+    Set of ids supporting O(1) membership and uniform random choice, with
+    the ids also kept in sorted order for keyset pagination
+    """
+
+    def __init__(self):
+        self._ids: List[int] = []
+        self._positions: Dict[int, int] = {}
+        self._sorted: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._positions
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def add(self, item_id: int) -> None:
+        if item_id not in self._positions:
+            self._positions[item_id] = len(self._ids)
+            self._ids.append(item_id)
+            insort(self._sorted, item_id)
+
+    def discard(self, item_id: int) -> None:
+        # Move the last id into the vacated slot so the list never has holes
+        position = self._positions.pop(item_id, None)
+        if position is None:
+            return
+        last = self._ids.pop()
+        if last != item_id:
+            self._ids[position] = last
+            self._positions[last] = position
+        del self._sorted[bisect_left(self._sorted, item_id)]
+
+    def sorted_ids(self) -> List[int]:
+        """The ids in ascending order; do not modify"""
+        return self._sorted
+
+    def choice(self) -> Optional[int]:
+        return random.choice(self._ids) if self._ids else None
+
+
+# Stands in for a filter value no word has
+_EMPTY_BUCKET = _IdBucket()
 
 
 class MemoryWordRepository(IWordRepository):
@@ -17,6 +73,13 @@ class MemoryWordRepository(IWordRepository):
     def __init__(self):
         self._words: Dict[int, SanskritWord] = {}
         self._forms: Dict[int, List[ParsedForm]] = {}
+        self._search_index = SearchIndex()
+        # Secondary indexes, kept consistent by _index_word/_unindex_word
+        self._all_ids = _IdBucket()
+        self._sorted_ids: List[int] = []
+        self._ids_by_text: Dict[str, Set[int]] = {}
+        self._ids_by_type: Dict[WordType, _IdBucket] = {}
+        self._ids_by_difficulty: Dict[int, _IdBucket] = {}
         self._next_id = 1
         self._init_sample_data()
 
@@ -57,22 +120,62 @@ class MemoryWordRepository(IWordRepository):
         
         for word in sample_words:
             self._words[word.id] = word
+            self._index_word(word)
         
         self._next_id = len(sample_words) + 1
 
+    def _index_word(self, word: SanskritWord):
+        self._search_index.add(word.id, (word.text, word.transliteration, word.meaning))
+        if word.id not in self._all_ids:
+            insort(self._sorted_ids, word.id)
+        self._all_ids.add(word.id)
+        self._ids_by_text.setdefault(word.text, set()).add(word.id)
+        self._ids_by_type.setdefault(WordType(word.word_type), _IdBucket()).add(word.id)
+        self._ids_by_difficulty.setdefault(word.difficulty_level, _IdBucket()).add(word.id)
+
+    def _unindex_word(self, word: SanskritWord):
+        self._search_index.remove(word.id)
+        self._all_ids.discard(word.id)
+        position = bisect_right(self._sorted_ids, word.id) - 1
+        if position >= 0 and self._sorted_ids[position] == word.id:
+            del self._sorted_ids[position]
+        self._discard(self._ids_by_text, word.text, word.id)
+        self._discard(self._ids_by_type, WordType(word.word_type), word.id)
+        self._discard(self._ids_by_difficulty, word.difficulty_level, word.id)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Any], key: Any, word_id: int):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(word_id)
+            if not ids:
+                del index[key]
+
+    def _filter_ids(self, word_type: Optional[str], difficulty_level: Optional[int]) -> Optional[List[_IdBucket]]:
+        """Id sets matching the type and difficulty filters, or None when unfiltered"""
+        buckets = []
+        if word_type:
+            try:
+                buckets.append(self._ids_by_type.get(WordType(word_type), _EMPTY_BUCKET))
+            except ValueError:
+                buckets.append(_EMPTY_BUCKET)
+        if difficulty_level:
+            buckets.append(self._ids_by_difficulty.get(difficulty_level, _EMPTY_BUCKET))
+        return buckets or None
+
     async def get_by_id(self, word_id: int) -> Optional[SanskritWord]:
         return self._words.get(word_id)
 
     async def get_by_text(self, text: str) -> Optional[SanskritWord]:
-        for word in self._words.values():
-            if word.text == text:
-                return word
-        return None
+        ids = self._ids_by_text.get(text)
+        # The oldest word wins when several share a text
+        return self._words[min(ids)] if ids else None
 
     async def create(self, word: SanskritWord) -> SanskritWord:
         word.id = self._next_id
         word.created_at = datetime.now()
         self._words[word.id] = word
+        self._index_word(word)
         self._next_id += 1
         return word
 
@@ -81,16 +184,18 @@ class MemoryWordRepository(IWordRepository):
             return None
         
         word = self._words[word_id]
+        self._unindex_word(word)
         for key, value in updates.items():
             if hasattr(word, key):
                 setattr(word, key, value)
         word.updated_at = datetime.now()
+        self._index_word(word)
         
         return word
 
     async def delete(self, word_id: int) -> bool:
         if word_id in self._words:
-            del self._words[word_id]
+            self._unindex_word(self._words.pop(word_id))
             if word_id in self._forms:
                 del self._forms[word_id]
             return True
@@ -104,19 +209,18 @@ class MemoryWordRepository(IWordRepository):
         page: int = 1,
         limit: int = 20
     ) -> tuple[List[SanskritWord], int]:
-        filtered_words = list(self._words.values())
-        
-        # Apply filters
-        if word_type:
-            filtered_words = [w for w in filtered_words if w.word_type == word_type]
-        if difficulty_level:
-            filtered_words = [w for w in filtered_words if w.difficulty_level == difficulty_level]
+        buckets = self._filter_ids(word_type, difficulty_level)
         if search:
-            search = search.lower()
-            filtered_words = [
-                w for w in filtered_words 
-                if search in w.text.lower() or search in w.transliteration.lower() or search in w.meaning.lower()
-            ]
+            ids = self._search_index.search(search)
+            if buckets:
+                ids = [word_id for word_id in ids if all(word_id in b for b in buckets)]
+        elif buckets:
+            # Walk the smallest bucket and probe the others
+            smallest, *others = sorted(buckets, key=len)
+            ids = [word_id for word_id in smallest.sorted_ids() if all(word_id in b for b in others)]
+        else:
+            ids = list(self._words)
+        filtered_words = [self._words[word_id] for word_id in ids]
         
         total = len(filtered_words)
         
@@ -127,14 +231,44 @@ class MemoryWordRepository(IWordRepository):
         
         return paginated_words, total
 
-    async def get_random_word(self, difficulty_level: Optional[int] = None) -> Optional[SanskritWord]:
-        import random
+    async def list_words_by_cursor(
+        self,
+        word_type: Optional[str] = None,
+        difficulty_level: Optional[int] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> tuple[List[SanskritWord], Optional[str]]:
+        after_id = decode_cursor(cursor)
+        buckets = self._filter_ids(word_type, difficulty_level) or []
+        if search:
+            ordered_ids = self._search_index.search(search)
+        elif buckets:
+            # Seek within the smallest filter bucket and probe the others
+            buckets = sorted(buckets, key=len)
+            ordered_ids = buckets.pop(0).sorted_ids()
+        else:
+            ordered_ids = self._sorted_ids
         
-        words = list(self._words.values())
-        if difficulty_level:
-            words = [w for w in words if w.difficulty_level == difficulty_level]
+        # Seek past the cursor, then collect one extra match to detect a next page
+        page_ids = []
+        for position in range(bisect_right(ordered_ids, after_id), len(ordered_ids)):
+            word_id = ordered_ids[position]
+            if all(word_id in b for b in buckets):
+                page_ids.append(word_id)
+                if len(page_ids) > limit:
+                    break
         
-        return random.choice(words) if words else None
+        next_cursor = encode_cursor(page_ids[limit - 1]) if len(page_ids) > limit else None
+        return [self._words[word_id] for word_id in page_ids[:limit]], next_cursor
+
+    async def get_random_word(self, difficulty_level: Optional[int] = None) -> Optional[SanskritWord]:
+        if difficulty_level:
+            bucket = self._ids_by_difficulty.get(difficulty_level)
+            word_id = bucket.choice() if bucket else None
+        else:
+            word_id = self._all_ids.choice()
+        return self._words[word_id] if word_id is not None else None
 
     async def get_forms_by_word_id(self, word_id: int) -> List[ParsedForm]:
         return self._forms.get(word_id, [])
@@ -146,12 +280,20 @@ class MemoryGameRepository(IGameRepository):
     def __init__(self):
         self._sessions: Dict[str, GameSession] = {}
         self._answers: Dict[str, List[GameAnswer]] = {}
+        # Creation sequence numbers give each user's sessions a stable keyset order
+        self._next_sequence = 1
+        self._user_sequences: Dict[str, List[int]] = {}
+        self._session_by_sequence: Dict[int, str] = {}
 
     async def create_session(self, session: GameSession) -> GameSession:
         session.id = str(uuid.uuid4())
         session.started_at = datetime.now()
         self._sessions[session.id] = session
         self._answers[session.id] = []
+        if session.user_id is not None:
+            self._user_sequences.setdefault(session.user_id, []).append(self._next_sequence)
+            self._session_by_sequence[self._next_sequence] = session.id
+        self._next_sequence += 1
         return session
 
     async def get_session(self, session_id: str) -> Optional[GameSession]:
@@ -177,14 +319,24 @@ class MemoryGameRepository(IGameRepository):
         return False
 
     async def save_answer(self, answer: GameAnswer) -> GameAnswer:
-        answer.id = len(self._answers.get(answer.session_id, [])) + 1
-        answer.submitted_at = datetime.now()
-        
-        if answer.session_id not in self._answers:
-            self._answers[answer.session_id] = []
+        return (await self.save_answers([answer]))[0]
+
+    async def save_answers(self, answers: List[GameAnswer]) -> List[GameAnswer]:
+        # Number the whole batch before storing any of it, so a batch that
+        # fails part way leaves nothing behind to be saved twice on retry
+        next_ids: Dict[str, int] = {}
+        numbered = []
+        for answer in answers:
+            if answer.session_id not in next_ids:
+                next_ids[answer.session_id] = len(self._answers.get(answer.session_id, [])) + 1
+            numbered.append((answer, next_ids[answer.session_id]))
+            next_ids[answer.session_id] += 1
         
-        self._answers[answer.session_id].append(answer)
-        return answer
+        # submitted_at is kept as given: answers may be written behind the request
+        for answer, answer_id in numbered:
+            answer.id = answer_id
+            self._answers.setdefault(answer.session_id, []).append(answer)
+        return answers
 
     async def get_session_answers(self, session_id: str) -> List[GameAnswer]:
         return self._answers.get(session_id, [])
@@ -196,7 +348,10 @@ class MemoryGameRepository(IGameRepository):
         page: int = 1,
         limit: int = 20
     ) -> tuple[List[GameSession], int]:
-        user_sessions = [s for s in self._sessions.values() if s.user_id == user_id]
+        user_sessions = [
+            self._sessions[self._session_by_sequence[sequence]]
+            for sequence in self._user_sequences.get(user_id, [])
+        ]
         
         if status:
             user_sessions = [s for s in user_sessions if s.status == status]
@@ -210,124 +365,223 @@ class MemoryGameRepository(IGameRepository):
         
         return paginated_sessions, total
 
+    async def get_user_sessions_by_cursor(
+        self,
+        user_id: str,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> tuple[List[GameSession], Optional[str]]:
+        after_sequence = decode_cursor(cursor)
+        sequences = self._user_sequences.get(user_id, [])
+        
+        page = []
+        for position in range(bisect_right(sequences, after_sequence), len(sequences)):
+            session = self._sessions[self._session_by_sequence[sequences[position]]]
+            if not status or session.status == status:
+                page.append((sequences[position], session))
+                if len(page) > limit:
+                    break
+        
+        next_cursor = encode_cursor(page[limit - 1][0]) if len(page) > limit else None
+        return [session for _, session in page[:limit]], next_cursor
 
-class MemoryLeaderboardRepository(ILeaderboardRepository):
-    """In-memory implementation of leaderboard repository"""
 
-    def __init__(self):
-        self._leaderboard: List[Leaderboard] = []
-
-    async def update_user_score(self, user_id: str, username: str, score: int) -> None:
-        # Find existing entry
-        entry = None
-        for lb in self._leaderboard:
-            if lb.user_id == user_id:
-                entry = lb
-                break
+class _RankedBoard:
+    """
+    One leaderboard: entries hashed by user id, ranked in a skip list.
+
+    Ranking keys are (-high_score, first-seen sequence, user_id), so ties on
+    high score keep first-seen order and updates stay O(log n).
+    """
+
+    def __init__(self, period: str):
+        self.period = period
+        self._entries: Dict[str, Leaderboard] = {}
+        self._keys: Dict[str, tuple] = {}
+        self._ranking = RankedSkipList()
+
+    def __len__(self) -> int:
+        return len(self._ranking)
+
+    def record(self, user_id: str, username: str, score: int, now: datetime) -> None:
+        entry = self._entries.get(user_id)
         
         if entry:
             if score > entry.high_score:
                 entry.high_score = score
+                self._rerank(user_id, score, self._keys[user_id][1])
             entry.total_score += score
             entry.sessions_played += 1
-            entry.updated_at = datetime.now()
+            entry.updated_at = now
         else:
-            # Create new entry
-            new_entry = Leaderboard(
+            self._entries[user_id] = Leaderboard(
                 user_id=user_id,
                 username=username,
                 high_score=score,
                 total_score=score,
                 accuracy_percentage=100.0,  # Will be calculated properly in real implementation
                 sessions_played=1,
-                updated_at=datetime.now()
+                updated_at=now
             )
-            self._leaderboard.append(new_entry)
+            self._rerank(user_id, score, len(self._entries))
+
+    def page(self, start: int, limit: int) -> List[Leaderboard]:
+        # Stored entries are left untouched; ranks go on the returned copies
+        return [
+            self._entries[key[2]].model_copy(update={"rank": start + i + 1})
+            for i, key in enumerate(self._ranking.slice(start, limit))
+        ]
+
+    def rank(self, user_id: str) -> Optional[int]:
+        key = self._keys.get(user_id)
+        if key is None:
+            return None
+        return self._ranking.rank(key) + 1
+
+    def _rerank(self, user_id: str, high_score: int, sequence: int) -> None:
+        old_key = self._keys.get(user_id)
+        if old_key is not None:
+            self._ranking.remove(old_key)
+        key = (-high_score, sequence, user_id)
+        self._keys[user_id] = key
+        self._ranking.insert(key)
+
+
+class MemoryLeaderboardRepository(ILeaderboardRepository):
+    """
+    In-memory implementation of leaderboard repository.
+
+    Keeps one board per (window, difficulty) pair, plus an overall board per
+    window under difficulty None. Each score update is applied to every board
+    it belongs to, so nothing is recomputed from session history. When a day
+    or week ends, the board for that window is swapped for an empty one.
+    """
+
+    def __init__(self):
+        self._boards: Dict[tuple, _RankedBoard] = {}
+
+    async def update_user_score(
+        self,
+        user_id: str,
+        username: str,
+        score: int,
+        difficulty: Optional[str] = None
+    ) -> None:
+        await self.update_user_scores([ScoreUpdate(user_id, username, score, difficulty)])
+
+    async def update_user_scores(self, scores: List[ScoreUpdate]) -> None:
+        now = datetime.now()
+        for window in LeaderboardWindow:
+            for update in scores:
+                for board_difficulty in {None, update.difficulty}:
+                    self._board(window, board_difficulty, now).record(update.user_id, update.username, update.score, now)
 
     async def get_leaderboard(
         self,
         difficulty: Optional[str] = None,
         limit: int = 10,
-        page: int = 1
+        page: int = 1,
+        window: str = LeaderboardWindow.ALL.value
     ) -> tuple[List[Leaderboard], int]:
-        # Sort by high score descending
-        sorted_leaderboard = sorted(self._leaderboard, key=lambda x: x.high_score, reverse=True)
-        
-        # Add ranks
-        for i, entry in enumerate(sorted_leaderboard):
-            entry.rank = i + 1
-        
-        total = len(sorted_leaderboard)
-        
-        # Apply pagination
-        start = (page - 1) * limit
-        end = start + limit
-        paginated_entries = sorted_leaderboard[start:end]
-        
-        return paginated_entries, total
+        board = self._current_board(LeaderboardWindow(window), difficulty, datetime.now())
+        return board.page((page - 1) * limit, limit), len(board)
 
-    async def get_user_rank(self, user_id: str, difficulty: Optional[str] = None) -> Optional[int]:
-        sorted_leaderboard = sorted(self._leaderboard, key=lambda x: x.high_score, reverse=True)
-        
-        for i, entry in enumerate(sorted_leaderboard):
-            if entry.user_id == user_id:
-                return i + 1
-        
-        return None
+    async def get_user_rank(
+        self,
+        user_id: str,
+        difficulty: Optional[str] = None,
+        window: str = LeaderboardWindow.ALL.value
+    ) -> Optional[int]:
+        return self._current_board(LeaderboardWindow(window), difficulty, datetime.now()).rank(user_id)
+
+    def _board(self, window: LeaderboardWindow, difficulty: Optional[str], now: datetime) -> _RankedBoard:
+        key = (window, difficulty)
+        period = window_period(window, now)
+        board = self._boards.get(key)
+        if board is None or board.period != period:
+            # Rotation drops the expired board as a whole
+            board = _RankedBoard(period)
+            self._boards[key] = board
+        return board
+
+    def _current_board(self, window: LeaderboardWindow, difficulty: Optional[str], now: datetime) -> _RankedBoard:
+        """Board for reads; unknown or expired boards read as empty without being stored"""
+        board = self._boards.get((window, difficulty))
+        if board is None or board.period != window_period(window, now):
+            return _RankedBoard(window_period(window, now))
+        return board
 
 
 class MemoryStatsRepository(IStatsRepository):
-    """In-memory implementation of stats repository"""
+    """
+    In-memory implementation of stats repository.
+
+    Global and per-level figures are streaming aggregates, so recording a
+    session is O(1) and memory does not grow with the number of sessions.
+    export_aggregates/merge_aggregates combine figures from other workers.
+    """
 
     def __init__(self):
         self._user_stats: Dict[str, Dict[str, Any]] = {}
-        self._global_stats: Dict[str, Any] = {
-            "total_sessions": 0,
-            "total_players": 0,
-            "total_words_parsed": 0,
-            "average_accuracy": 0.0
-        }
+        self._overall = SessionAggregate()
+        self._levels: Dict[str, SessionAggregate] = {}
 
     async def get_user_stats(self, user_id: str) -> Dict[str, Any]:
-        return self._user_stats.get(user_id, {
-            "total_sessions": 0,
-            "total_words_attempted": 0,
-            "total_words_correct": 0,
-            "average_accuracy": 0.0,
-            "best_score": 0,
-            "total_play_time_minutes": 0
-        })
+        return self._user_stats.get(user_id, self._empty_user_stats()).copy()
 
     async def get_global_stats(self) -> Dict[str, Any]:
-        return self._global_stats.copy()
+        return global_summary(self._overall, self._levels, len(self._user_stats))
 
     async def record_session_stats(self, session: GameSession) -> None:
+        attempted = session.correct_answers + session.mistakes
+        seconds = session_seconds(session)
+
         # Update user stats
         user_id = session.user_id or "anonymous"
         if user_id not in self._user_stats:
-            self._user_stats[user_id] = {
-                "total_sessions": 0,
-                "total_words_attempted": 0,
-                "total_words_correct": 0,
-                "average_accuracy": 0.0,
-                "best_score": 0,
-                "total_play_time_minutes": 0
-            }
+            self._user_stats[user_id] = self._empty_user_stats()
         
         user_stats = self._user_stats[user_id]
         user_stats["total_sessions"] += 1
-        user_stats["total_words_attempted"] += session.words_attempted
-        user_stats["total_words_correct"] += session.words_correct
+        user_stats["total_words_attempted"] += attempted
+        user_stats["total_words_correct"] += session.correct_answers
         
-        if session.words_attempted > 0:
+        if user_stats["total_words_attempted"] > 0:
             user_stats["average_accuracy"] = (user_stats["total_words_correct"] / user_stats["total_words_attempted"]) * 100
         
         if session.score > user_stats["best_score"]:
             user_stats["best_score"] = session.score
         
-        if session.total_time_seconds:
-            user_stats["total_play_time_minutes"] += session.total_time_seconds // 60
+        user_stats["total_play_time_seconds"] += seconds
+        user_stats["total_play_time_minutes"] = int(user_stats["total_play_time_seconds"] // 60)
         
-        # Update global stats
-        self._global_stats["total_sessions"] += 1
-        self._global_stats["total_words_parsed"] += session.words_attempted
\ No newline at end of file
+        # Update global and per-level aggregates
+        level = session.difficulty.value if session.difficulty else "unknown"
+        for aggregate in (self._overall, self._levels.setdefault(level, SessionAggregate())):
+            aggregate.add_session(session)
+
+    def export_aggregates(self) -> Dict[str, Any]:
+        """Serializable aggregates for merging into another worker's repository"""
+        return {
+            "overall": self._overall.to_dict(),
+            "levels": {level: aggregate.to_dict() for level, aggregate in self._levels.items()},
+        }
+
+    def merge_aggregates(self, data: Dict[str, Any]) -> None:
+        """Fold in aggregates exported by another worker; per-user stats stay local"""
+        self._overall.merge(SessionAggregate.from_dict(data["overall"]))
+        for level, aggregate in data["levels"].items():
+            self._levels.setdefault(level, SessionAggregate()).merge(SessionAggregate.from_dict(aggregate))
+
+    @staticmethod
+    def _empty_user_stats() -> Dict[str, Any]:
+        return {
+            "total_sessions": 0,
+            "total_words_attempted": 0,
+            "total_words_correct": 0,
+            "average_accuracy": 0.0,
+            "best_score": 0,
+            "total_play_time_seconds": 0.0,
+            "total_play_time_minutes": 0
+        }
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Opaque cursors for keyset pagination
+"""
+
+import base64
+import json
+from typing import Optional
+
+
+def encode_cursor(position: int) -> str:
+    """Encode the sort key of the last returned item as an opaque cursor"""
+    raw = json.dumps([position]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """Decode a cursor back to its sort key; no cursor means the first page"""
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        (position,) = json.loads(base64.urlsafe_b64decode(padded))
+        return int(position)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
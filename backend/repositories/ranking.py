@@ -0,0 +1,143 @@
+"""
+Indexable skip list for rank queries over ordered keys
+"""
+
+import random
+from datetime import datetime
+from typing import Any, List, Optional
+
+from ..models.game import LeaderboardWindow
+
+
+class _End:
+    """Sentinel key that sorts after every real key"""
+
+    def __lt__(self, other: Any) -> bool:
+        return False
+
+    def __le__(self, other: Any) -> bool:
+        return False
+
+
+_END = _End()
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Any, levels: int):
+        self.key = key
+        self.next: List[Optional["_Node"]] = [None] * levels
+        # width[level] is how many positions the link at that level skips
+        self.width: List[int] = [1] * levels
+
+
+class RankedSkipList:
+    """
+    Sorted collection of unique, comparable keys with positional access.
+
+    Each link records how many elements it skips, so insert, remove, the
+    rank of a key and the key at a position are all O(log n) expected.
+    Keys are kept in ascending order.
+    """
+
+    MAX_LEVELS = 24  # Comfortable for up to ~16M keys
+
+    def __init__(self):
+        self._tail = _Node(_END, 0)
+        self._head = _Node(None, self.MAX_LEVELS)
+        self._head.next = [self._tail] * self.MAX_LEVELS
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, key: Any) -> None:
+        """Insert a key that is not already present"""
+        chain = [self._head] * self.MAX_LEVELS
+        steps_at_level = [0] * self.MAX_LEVELS
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level].key < key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        levels = self._random_levels()
+        new_node = _Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            previous = chain[level]
+            new_node.next[level] = previous.next[level]
+            previous.next[level] = new_node
+            new_node.width[level] = previous.width[level] - steps
+            previous.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, self.MAX_LEVELS):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key: Any) -> None:
+        """Remove a key; raises KeyError if it is absent"""
+        chain = [self._head] * self.MAX_LEVELS
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is self._tail or target.key != key:
+            raise KeyError(key)
+        for level in range(len(target.next)):
+            previous = chain[level]
+            previous.width[level] += target.width[level] - 1
+            previous.next[level] = target.next[level]
+        for level in range(len(target.next), self.MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def rank(self, key: Any) -> Optional[int]:
+        """0-based position of a key, or None if it is absent"""
+        position = 0
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        target = node.next[0]
+        if target is self._tail or target.key != key:
+            return None
+        return position
+
+    def slice(self, start: int, count: int) -> List[Any]:
+        """Up to count keys starting at 0-based position start"""
+        if start < 0 or start >= self._size or count <= 0:
+            return []
+        # Positions are 1-based from the head node
+        remaining = start + 1
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.width[level] <= remaining and node.next[level] is not self._tail:
+                remaining -= node.width[level]
+                node = node.next[level]
+        keys = []
+        while node is not self._tail and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+    def _random_levels(self) -> int:
+        levels = 1
+        while levels < self.MAX_LEVELS and random.random() < 0.5:
+            levels += 1
+        return levels
+
+
+def window_period(window: LeaderboardWindow, now: datetime) -> str:
+    """Label of the period a moment falls in; boards are only valid within one"""
+    if window == LeaderboardWindow.DAY:
+        return now.strftime("%Y-%m-%d")
+    if window == LeaderboardWindow.WEEK:
+        return now.strftime("%G-W%V")
+    return ""
@@ -0,0 +1,310 @@
+"""
+Constant-memory streaming aggregates that can be merged across processes
+"""
+
+import math
+from bisect import bisect_right
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class RunningMean:
+    """Count, mean and variance updated one value at a time (Welford)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other: "RunningMean") -> None:
+        """Fold in another running mean, as if its values had been added here"""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "mean": self.mean, "m2": self._m2}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningMean":
+        running = cls()
+        running.count = data["count"]
+        running.mean = data["mean"]
+        running._m2 = data["m2"]
+        return running
+
+
+class Histogram:
+    """Counts per fixed bucket; edges are the upper bounds of all but the last bucket"""
+
+    def __init__(self, edges: Sequence[float], counts: Optional[List[int]] = None):
+        self.edges = list(edges)
+        self.counts = counts if counts is not None else [0] * (len(self.edges) + 1)
+
+    def add(self, value: float) -> None:
+        self.counts[bisect_right(self.edges, value)] += 1
+
+    def merge(self, other: "Histogram") -> None:
+        if other.edges != self.edges:
+            raise ValueError("Cannot merge histograms with different buckets")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"edges": self.edges, "counts": self.counts}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Histogram":
+        return cls(data["edges"], list(data["counts"]))
+
+
+class TDigest:
+    """
+    Merging t-digest for approximate quantiles in bounded memory.
+
+    Values are buffered and periodically merged into at most ~compression
+    centroids, which stay small near the tails, so extreme quantiles such
+    as p95 and p99 remain accurate. Adding is amortized O(1), and digests
+    from different processes combine with merge().
+    """
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means: List[float] = []
+        self._weights: List[float] = []
+        self._buffer: List[tuple] = []
+        self._buffer_size = compression * 5
+
+    def add(self, value: float, weight: float = 1) -> None:
+        self._buffer.append((value, weight))
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= self._buffer_size:
+            self._compress()
+
+    def merge(self, other: "TDigest") -> None:
+        """Fold in another digest's centroids"""
+        other._compress()
+        for mean, weight in zip(other._means, other._weights):
+            self._buffer.append((mean, weight))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at quantile q in [0, 1], or None when empty"""
+        self._compress()
+        if not self._means:
+            return None
+        if len(self._means) == 1 or q <= 0:
+            return self._means[0] if q > 0 else self.min
+        if q >= 1:
+            return self.max
+
+        target = q * self.count
+        first_half = self._weights[0] / 2
+        if target < first_half:
+            # Between the minimum and the first centroid's midpoint
+            return self.min + (self._means[0] - self.min) * target / first_half
+
+        cumulative = 0.0
+        for i in range(len(self._means) - 1):
+            left = cumulative + self._weights[i] / 2
+            right = cumulative + self._weights[i] + self._weights[i + 1] / 2
+            if target <= right:
+                fraction = (target - left) / (right - left)
+                return self._means[i] + fraction * (self._means[i + 1] - self._means[i])
+            cumulative += self._weights[i]
+
+        last_half = self._weights[-1] / 2
+        fraction = (target - (self.count - last_half)) / last_half
+        return self._means[-1] + (self.max - self._means[-1]) * min(fraction, 1.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        self._compress()
+        return {
+            "compression": self.compression,
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "centroids": [[m, w] for m, w in zip(self._means, self._weights)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TDigest":
+        digest = cls(data["compression"])
+        digest.count = data["count"]
+        if data["count"]:
+            digest.min = data["min"]
+            digest.max = data["max"]
+        for mean, weight in data["centroids"]:
+            digest._means.append(mean)
+            digest._weights.append(weight)
+        return digest
+
+    def _scale(self, q: float) -> float:
+        # k1 scale function: centroids shrink towards both tails
+        q = min(max(q, 0.0), 1.0)
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        points = sorted(list(zip(self._means, self._weights)) + self._buffer)
+        self._buffer = []
+        total = sum(weight for _, weight in points)
+
+        means: List[float] = []
+        weights: List[float] = []
+        mean, weight = points[0]
+        before = 0.0
+        k_left = self._scale(0.0)
+        for next_mean, next_weight in points[1:]:
+            if self._scale((before + weight + next_weight) / total) - k_left <= 1:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                before += weight
+                k_left = self._scale(before / total)
+                mean, weight = next_mean, next_weight
+        means.append(mean)
+        weights.append(weight)
+        self._means, self._weights = means, weights
+
+
+class SessionAggregate:
+    """
+    Streaming summary of finished sessions: running means, an accuracy
+    histogram and percentile sketches of accuracy and time per step.
+    """
+
+    ACCURACY_EDGES = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+
+    def __init__(self):
+        self.score = RunningMean()
+        self.accuracy = RunningMean()
+        self.time_per_step = RunningMean()
+        self.accuracy_histogram = Histogram(self.ACCURACY_EDGES)
+        self.accuracy_digest = TDigest()
+        self.time_per_step_digest = TDigest()
+        self.words_parsed = 0
+
+    @property
+    def sessions(self) -> int:
+        return self.score.count
+
+    def add(self, score: int, accuracy: float, seconds_per_step: float, steps: int) -> None:
+        self.score.add(score)
+        self.accuracy.add(accuracy)
+        self.time_per_step.add(seconds_per_step)
+        self.accuracy_histogram.add(accuracy)
+        self.accuracy_digest.add(accuracy)
+        self.time_per_step_digest.add(seconds_per_step)
+        self.words_parsed += steps
+
+    def add_session(self, session: Any) -> None:
+        """Add a finished GameSession"""
+        total_steps = len(session.history)
+        accuracy = session.correct_answers / total_steps if total_steps > 0 else 0.0
+        seconds = session_seconds(session)
+        self.add(session.score, accuracy, seconds / total_steps if total_steps > 0 else seconds, total_steps)
+
+    def merge(self, other: "SessionAggregate") -> None:
+        self.score.merge(other.score)
+        self.accuracy.merge(other.accuracy)
+        self.time_per_step.merge(other.time_per_step)
+        self.accuracy_histogram.merge(other.accuracy_histogram)
+        self.accuracy_digest.merge(other.accuracy_digest)
+        self.time_per_step_digest.merge(other.time_per_step_digest)
+        self.words_parsed += other.words_parsed
+
+    def summary(self) -> Dict[str, Any]:
+        """Readable figures; accuracy is reported as a percentage"""
+        return {
+            "sessions": self.sessions,
+            "words_parsed": self.words_parsed,
+            "average_score": self.score.mean,
+            "average_accuracy": self.accuracy.mean * 100,
+            "accuracy_p50": _percentage(self.accuracy_digest.quantile(0.5)),
+            "accuracy_histogram": dict(zip(
+                [f"<{edge:.0%}" for edge in self.ACCURACY_EDGES] + ["100%"],
+                self.accuracy_histogram.counts,
+            )),
+            "time_per_step_seconds": {
+                "mean": self.time_per_step.mean,
+                "stddev": math.sqrt(self.time_per_step.variance),
+                "p50": self.time_per_step_digest.quantile(0.5),
+                "p95": self.time_per_step_digest.quantile(0.95),
+                "p99": self.time_per_step_digest.quantile(0.99),
+            },
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "score": self.score.to_dict(),
+            "accuracy": self.accuracy.to_dict(),
+            "time_per_step": self.time_per_step.to_dict(),
+            "accuracy_histogram": self.accuracy_histogram.to_dict(),
+            "accuracy_digest": self.accuracy_digest.to_dict(),
+            "time_per_step_digest": self.time_per_step_digest.to_dict(),
+            "words_parsed": self.words_parsed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SessionAggregate":
+        aggregate = cls()
+        aggregate.score = RunningMean.from_dict(data["score"])
+        aggregate.accuracy = RunningMean.from_dict(data["accuracy"])
+        aggregate.time_per_step = RunningMean.from_dict(data["time_per_step"])
+        aggregate.accuracy_histogram = Histogram.from_dict(data["accuracy_histogram"])
+        aggregate.accuracy_digest = TDigest.from_dict(data["accuracy_digest"])
+        aggregate.time_per_step_digest = TDigest.from_dict(data["time_per_step_digest"])
+        aggregate.words_parsed = data["words_parsed"]
+        return aggregate
+
+
+def session_seconds(session: Any) -> float:
+    """Wall-clock seconds a GameSession took, up to now if still running"""
+    finished_at = session.completed_at or datetime.now()
+    return max((finished_at - session.started_at).total_seconds(), 0.0)
+
+
+def global_summary(
+    overall: SessionAggregate, levels: Dict[str, SessionAggregate], total_players: int
+) -> Dict[str, Any]:
+    """Global stats payload shared by the repository implementations"""
+    figures = overall.summary()
+    return {
+        "total_sessions": figures["sessions"],
+        "total_players": total_players,
+        "total_words_parsed": figures["words_parsed"],
+        "average_accuracy": figures["average_accuracy"],
+        "accuracy_p50": figures["accuracy_p50"],
+        "time_per_step_seconds": figures["time_per_step_seconds"],
+        "accuracy_histogram": figures["accuracy_histogram"],
+        "levels": {level: aggregate.summary() for level, aggregate in levels.items()},
+    }
+
+
+def _percentage(fraction: Optional[float]) -> Optional[float]:
+    return fraction * 100 if fraction is not None else None
@@ -0,0 +1,709 @@
+"""
+SQLite repository implementations for persistent storage
+"""
+
+import asyncio
+import json
+import queue
+import random
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from shared.search_index import normalize_variants
+
+from .interfaces import IWordRepository, IGameRepository, ILeaderboardRepository, IStatsRepository, ScoreUpdate
+from .pagination import encode_cursor, decode_cursor
+from .ranking import window_period
+from .sketches import SessionAggregate, global_summary, session_seconds
+from ..models.word import SanskritWord, ParsedForm
+from ..models.game import GameSession, GameAnswer, Leaderboard, GameStatus, LeaderboardWindow
+
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    transliteration TEXT NOT NULL,
+    meaning TEXT NOT NULL,
+    word_type TEXT NOT NULL,
+    root TEXT,
+    stem TEXT,
+    difficulty_level INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_words_text ON words (text, id);
+CREATE INDEX IF NOT EXISTS idx_words_type ON words (word_type, id);
+CREATE INDEX IF NOT EXISTS idx_words_difficulty ON words (difficulty_level, id);
+
+CREATE TABLE IF NOT EXISTS forms (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    word_id INTEGER NOT NULL REFERENCES words (id) ON DELETE CASCADE,
+    form TEXT NOT NULL,
+    gender TEXT,
+    number TEXT,
+    "case" TEXT,
+    person INTEGER,
+    tense TEXT,
+    mood TEXT,
+    voice TEXT,
+    analysis TEXT NOT NULL,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_forms_word ON forms (word_id);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    user_id TEXT,
+    status TEXT NOT NULL,
+    difficulty TEXT,
+    root TEXT NOT NULL,
+    objective TEXT NOT NULL,
+    history TEXT NOT NULL,
+    current_step INTEGER,
+    started_at TEXT NOT NULL,
+    completed_at TEXT,
+    score INTEGER NOT NULL DEFAULT 0,
+    correct_answers INTEGER NOT NULL DEFAULT 0,
+    mistakes INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions (user_id, seq);
+CREATE INDEX IF NOT EXISTS idx_sessions_user_status ON sessions (user_id, status, seq);
+
+CREATE TABLE IF NOT EXISTS answers (
+    session_id TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    word_id INTEGER NOT NULL,
+    user_answer TEXT NOT NULL,
+    correct_answer TEXT NOT NULL,
+    status TEXT NOT NULL,
+    points_earned INTEGER NOT NULL DEFAULT 0,
+    time_taken_seconds INTEGER NOT NULL,
+    hint_used INTEGER NOT NULL DEFAULT 0,
+    level TEXT,
+    submitted_at TEXT NOT NULL,
+    PRIMARY KEY (session_id, id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS leaderboard (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    time_window TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    period TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    username TEXT NOT NULL,
+    high_score INTEGER NOT NULL,
+    total_score INTEGER NOT NULL,
+    accuracy_percentage REAL NOT NULL,
+    sessions_played INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    UNIQUE (time_window, difficulty, period, user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_rank
+    ON leaderboard (time_window, difficulty, period, high_score DESC, seq);
+
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id TEXT PRIMARY KEY,
+    total_sessions INTEGER NOT NULL,
+    total_words_attempted INTEGER NOT NULL,
+    total_words_correct INTEGER NOT NULL,
+    best_score INTEGER NOT NULL,
+    total_play_time_seconds REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS stats_aggregates (
+    scope TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def _matches(field: Optional[str], query: str) -> int:
+    """SQL function mirroring SearchIndex: lowercased or diacritic-folded substring match"""
+    if not field:
+        return 0
+    return int(any(query in variant for variant in normalize_variants(field)))
+
+
+class SQLiteDatabase:
+    """
+    Small pool of WAL-mode connections to one SQLite file.
+
+    Queries run in worker threads through asyncio.to_thread so the event
+    loop never blocks on disk. Each connection keeps a cache of prepared
+    statements, and writes run in BEGIN IMMEDIATE transactions so
+    read-modify-write updates do not interleave.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        for _ in range(max(pool_size, 1)):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            isolation_level=None,  # Transactions are managed explicitly
+            check_same_thread=False,
+            cached_statements=256,
+            timeout=30,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.create_function("panini_matches", 2, _matches, deterministic=True)
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def _read(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        with self._connection() as conn:
+            return func(conn)
+
+    def _write(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return result
+
+    async def read(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        """Run func(connection) in a worker thread"""
+        return await asyncio.to_thread(self._read, func)
+
+    async def write(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        """Run func(connection) in a worker thread inside one write transaction"""
+        return await asyncio.to_thread(self._write, func)
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _value(value: Any) -> Any:
+    """Enum members are stored by value"""
+    return getattr(value, "value", value)
+
+
+WORD_COLUMNS = ("text", "transliteration", "meaning", "word_type", "root", "stem", "difficulty_level")
+
+
+class SQLiteWordRepository(IWordRepository):
+    """SQLite implementation of word repository"""
+
+    def __init__(self, db: SQLiteDatabase):
+        self._db = db
+
+    async def get_by_id(self, word_id: int) -> Optional[SanskritWord]:
+        row = await self._db.read(
+            lambda conn: conn.execute("SELECT * FROM words WHERE id = ?", (word_id,)).fetchone()
+        )
+        return SanskritWord(**row) if row else None
+
+    async def get_by_text(self, text: str) -> Optional[SanskritWord]:
+        # The oldest word wins when several share a text
+        row = await self._db.read(
+            lambda conn: conn.execute(
+                "SELECT * FROM words WHERE text = ? ORDER BY id LIMIT 1", (text,)
+            ).fetchone()
+        )
+        return SanskritWord(**row) if row else None
+
+    async def create(self, word: SanskritWord) -> SanskritWord:
+        word.created_at = datetime.now()
+
+        def insert(conn: sqlite3.Connection) -> int:
+            cursor = conn.execute(
+                "INSERT INTO words (text, transliteration, meaning, word_type, root, stem, difficulty_level, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*(_value(getattr(word, column)) for column in WORD_COLUMNS), _iso(word.created_at)),
+            )
+            return cursor.lastrowid
+
+        word.id = await self._db.write(insert)
+        return word
+
+    async def update(self, word_id: int, updates: Dict[str, Any]) -> Optional[SanskritWord]:
+        columns = [key for key in updates if key in WORD_COLUMNS]
+
+        def apply(conn: sqlite3.Connection) -> Optional[sqlite3.Row]:
+            assignments = ", ".join([f"{column} = ?" for column in columns] + ["updated_at = ?"])
+            cursor = conn.execute(
+                f"UPDATE words SET {assignments} WHERE id = ?",
+                (*(_value(updates[column]) for column in columns), _now(), word_id),
+            )
+            if cursor.rowcount == 0:
+                return None
+            return conn.execute("SELECT * FROM words WHERE id = ?", (word_id,)).fetchone()
+
+        row = await self._db.write(apply)
+        return SanskritWord(**row) if row else None
+
+    async def delete(self, word_id: int) -> bool:
+        return await self._db.write(
+            lambda conn: conn.execute("DELETE FROM words WHERE id = ?", (word_id,)).rowcount > 0
+        )
+
+    @staticmethod
+    def _filters(
+        word_type: Optional[str], difficulty_level: Optional[int], search: Optional[str]
+    ) -> tuple[str, list]:
+        clauses, params = [], []
+        if word_type:
+            clauses.append("word_type = ?")
+            params.append(word_type)
+        if difficulty_level:
+            clauses.append("difficulty_level = ?")
+            params.append(difficulty_level)
+        if search:
+            clauses.append(
+                "(panini_matches(text, ?) OR panini_matches(transliteration, ?) OR panini_matches(meaning, ?))"
+            )
+            params.extend([search.lower()] * 3)
+        return " AND ".join(clauses) or "1", params
+
+    async def list_words(
+        self,
+        word_type: Optional[str] = None,
+        difficulty_level: Optional[int] = None,
+        search: Optional[str] = None,
+        page: int = 1,
+        limit: int = 20
+    ) -> tuple[List[SanskritWord], int]:
+        where, params = self._filters(word_type, difficulty_level, search)
+
+        def query(conn: sqlite3.Connection):
+            total = conn.execute(f"SELECT COUNT(*) FROM words WHERE {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT * FROM words WHERE {where} ORDER BY id LIMIT ? OFFSET ?",
+                (*params, limit, (page - 1) * limit),
+            ).fetchall()
+            return rows, total
+
+        rows, total = await self._db.read(query)
+        return [SanskritWord(**row) for row in rows], total
+
+    async def list_words_by_cursor(
+        self,
+        word_type: Optional[str] = None,
+        difficulty_level: Optional[int] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> tuple[List[SanskritWord], Optional[str]]:
+        after_id = decode_cursor(cursor)
+        where, params = self._filters(word_type, difficulty_level, search)
+        # One extra row tells whether there is a next page
+        rows = await self._db.read(
+            lambda conn: conn.execute(
+                f"SELECT * FROM words WHERE id > ? AND {where} ORDER BY id LIMIT ?",
+                (after_id, *params, limit + 1),
+            ).fetchall()
+        )
+        next_cursor = encode_cursor(rows[limit - 1]["id"]) if len(rows) > limit else None
+        return [SanskritWord(**row) for row in rows[:limit]], next_cursor
+
+    async def get_random_word(self, difficulty_level: Optional[int] = None) -> Optional[SanskritWord]:
+        where, params = self._filters(None, difficulty_level, None)
+
+        def query(conn: sqlite3.Connection) -> Optional[sqlite3.Row]:
+            count = conn.execute(f"SELECT COUNT(*) FROM words WHERE {where}", params).fetchone()[0]
+            if count == 0:
+                return None
+            return conn.execute(
+                f"SELECT * FROM words WHERE {where} ORDER BY id LIMIT 1 OFFSET ?",
+                (*params, random.randrange(count)),
+            ).fetchone()
+
+        row = await self._db.read(query)
+        return SanskritWord(**row) if row else None
+
+    async def get_forms_by_word_id(self, word_id: int) -> List[ParsedForm]:
+        rows = await self._db.read(
+            lambda conn: conn.execute(
+                "SELECT * FROM forms WHERE word_id = ? ORDER BY id", (word_id,)
+            ).fetchall()
+        )
+        return [ParsedForm(**row) for row in rows]
+
+
+class SQLiteGameRepository(IGameRepository):
+    """SQLite implementation of game repository"""
+
+    def __init__(self, db: SQLiteDatabase):
+        self._db = db
+
+    @staticmethod
+    def _row(session: GameSession) -> tuple:
+        history = [{"code": step.code, "result": list(step.result)} for step in session.history]
+        return (
+            session.user_id, _value(session.status), _value(session.difficulty),
+            session.root, session.objective, json.dumps(history, ensure_ascii=False),
+            session.current_step, _iso(session.started_at), _iso(session.completed_at),
+            session.score, session.correct_answers, session.mistakes, session.id,
+        )
+
+    @staticmethod
+    def _session(row: sqlite3.Row) -> GameSession:
+        data = dict(row)
+        del data["seq"]
+        data["history"] = json.loads(data["history"])
+        return GameSession(**data)
+
+    async def create_session(self, session: GameSession) -> GameSession:
+        session.id = str(uuid.uuid4())
+        session.started_at = datetime.now()
+        await self._db.write(
+            lambda conn: conn.execute(
+                "INSERT INTO sessions (user_id, status, difficulty, root, objective, history, current_step, "
+                "started_at, completed_at, score, correct_answers, mistakes, id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._row(session),
+            )
+        )
+        return session
+
+    async def get_session(self, session_id: str) -> Optional[GameSession]:
+        row = await self._db.read(
+            lambda conn: conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        )
+        return self._session(row) if row else None
+
+    async def update_session(self, session_id: str, updates: Dict[str, Any]) -> Optional[GameSession]:
+        def apply(conn: sqlite3.Connection) -> Optional[GameSession]:
+            row = conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+            session = self._session(row)
+            for key, value in updates.items():
+                if hasattr(session, key):
+                    setattr(session, key, value)
+            self._save(conn, session)
+            return session
+
+        return await self._db.write(apply)
+
+    async def end_session(self, session_id: str) -> bool:
+        return await self._db.write(
+            lambda conn: conn.execute(
+                "UPDATE sessions SET status = ?, completed_at = ? WHERE id = ?",
+                (GameStatus.COMPLETED.value, _now(), session_id),
+            ).rowcount > 0
+        )
+
+    def _save(self, conn: sqlite3.Connection, session: GameSession) -> None:
+        conn.execute(
+            "UPDATE sessions SET user_id = ?, status = ?, difficulty = ?, root = ?, objective = ?, history = ?, "
+            "current_step = ?, started_at = ?, completed_at = ?, score = ?, correct_answers = ?, mistakes = ? "
+            "WHERE id = ?",
+            self._row(session),
+        )
+
+    async def save_answer(self, answer: GameAnswer) -> GameAnswer:
+        return (await self.save_answers([answer]))[0]
+
+    async def save_answers(self, answers: List[GameAnswer]) -> List[GameAnswer]:
+        def insert(conn: sqlite3.Connection) -> None:
+            # One transaction for the whole batch
+            next_ids: Dict[str, int] = {}
+            for answer in answers:
+                if answer.session_id not in next_ids:
+                    next_ids[answer.session_id] = conn.execute(
+                        "SELECT COUNT(*) + 1 FROM answers WHERE session_id = ?", (answer.session_id,)
+                    ).fetchone()[0]
+                answer.id = next_ids[answer.session_id]
+                next_ids[answer.session_id] += 1
+            conn.executemany(
+                "INSERT INTO answers (session_id, id, word_id, user_answer, correct_answer, status, "
+                "points_earned, time_taken_seconds, hint_used, level, submitted_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        answer.session_id, answer.id, answer.word_id, answer.user_answer, answer.correct_answer,
+                        _value(answer.status), answer.points_earned, answer.time_taken_seconds,
+                        int(answer.hint_used), answer.level, _iso(answer.submitted_at),
+                    )
+                    for answer in answers
+                ],
+            )
+
+        await self._db.write(insert)
+        return answers
+
+    async def get_session_answers(self, session_id: str) -> List[GameAnswer]:
+        rows = await self._db.read(
+            lambda conn: conn.execute(
+                "SELECT * FROM answers WHERE session_id = ? ORDER BY id", (session_id,)
+            ).fetchall()
+        )
+        return [GameAnswer(**row) for row in rows]
+
+    async def get_user_sessions(
+        self,
+        user_id: str,
+        status: Optional[str] = None,
+        page: int = 1,
+        limit: int = 20
+    ) -> tuple[List[GameSession], int]:
+        where, params = "user_id = ?", [user_id]
+        if status:
+            where += " AND status = ?"
+            params.append(_value(status))
+
+        def query(conn: sqlite3.Connection):
+            total = conn.execute(f"SELECT COUNT(*) FROM sessions WHERE {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT * FROM sessions WHERE {where} ORDER BY seq LIMIT ? OFFSET ?",
+                (*params, limit, (page - 1) * limit),
+            ).fetchall()
+            return rows, total
+
+        rows, total = await self._db.read(query)
+        return [self._session(row) for row in rows], total
+
+    async def get_user_sessions_by_cursor(
+        self,
+        user_id: str,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> tuple[List[GameSession], Optional[str]]:
+        where, params = "user_id = ? AND seq > ?", [user_id, decode_cursor(cursor)]
+        if status:
+            where += " AND status = ?"
+            params.append(_value(status))
+        rows = await self._db.read(
+            lambda conn: conn.execute(
+                f"SELECT * FROM sessions WHERE {where} ORDER BY seq LIMIT ?", (*params, limit + 1)
+            ).fetchall()
+        )
+        next_cursor = encode_cursor(rows[limit - 1]["seq"]) if len(rows) > limit else None
+        return [self._session(row) for row in rows[:limit]], next_cursor
+
+
+class SQLiteLeaderboardRepository(ILeaderboardRepository):
+    """
+    SQLite implementation of leaderboard repository.
+
+    Rows are keyed by (window, difficulty, period, user); the overall board
+    uses an empty difficulty. Reads only look at the current period, so a
+    new day or week starts from an empty board without moving any rows.
+    """
+
+    def __init__(self, db: SQLiteDatabase):
+        self._db = db
+
+    async def update_user_score(
+        self,
+        user_id: str,
+        username: str,
+        score: int,
+        difficulty: Optional[str] = None
+    ) -> None:
+        await self.update_user_scores([ScoreUpdate(user_id, username, score, difficulty)])
+
+    async def update_user_scores(self, scores: List[ScoreUpdate]) -> None:
+        now = datetime.now()
+        rows = [
+            (window.value, board_difficulty, window_period(window, now),
+             update.user_id, update.username, update.score, update.score, now.isoformat())
+            for update in scores
+            for window in LeaderboardWindow
+            for board_difficulty in {"", update.difficulty or ""}
+        ]
+
+        def upsert(conn: sqlite3.Connection) -> None:
+            # One transaction for the whole batch
+            conn.executemany(
+                "INSERT INTO leaderboard (time_window, difficulty, period, user_id, username, high_score, "
+                "total_score, accuracy_percentage, sessions_played, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 100.0, 1, ?) "
+                "ON CONFLICT (time_window, difficulty, period, user_id) DO UPDATE SET "
+                "high_score = max(high_score, excluded.high_score), "
+                "total_score = total_score + excluded.total_score, "
+                "sessions_played = sessions_played + 1, "
+                "updated_at = excluded.updated_at",
+                rows,
+            )
+
+        await self._db.write(upsert)
+
+    @staticmethod
+    def _board(window: str, difficulty: Optional[str]) -> tuple:
+        window = LeaderboardWindow(window)
+        return window.value, difficulty or "", window_period(window, datetime.now())
+
+    async def get_leaderboard(
+        self,
+        difficulty: Optional[str] = None,
+        limit: int = 10,
+        page: int = 1,
+        window: str = LeaderboardWindow.ALL.value
+    ) -> tuple[List[Leaderboard], int]:
+        board = self._board(window, difficulty)
+        start = (page - 1) * limit
+
+        def query(conn: sqlite3.Connection):
+            where = "time_window = ? AND difficulty = ? AND period = ?"
+            total = conn.execute(f"SELECT COUNT(*) FROM leaderboard WHERE {where}", board).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT * FROM leaderboard WHERE {where} ORDER BY high_score DESC, seq LIMIT ? OFFSET ?",
+                (*board, limit, start),
+            ).fetchall()
+            return rows, total
+
+        rows, total = await self._db.read(query)
+        return [self._entry(row, start + i + 1) for i, row in enumerate(rows)], total
+
+    async def get_user_rank(
+        self,
+        user_id: str,
+        difficulty: Optional[str] = None,
+        window: str = LeaderboardWindow.ALL.value
+    ) -> Optional[int]:
+        board = self._board(window, difficulty)
+
+        def query(conn: sqlite3.Connection) -> Optional[int]:
+            where = "time_window = ? AND difficulty = ? AND period = ?"
+            row = conn.execute(
+                f"SELECT high_score, seq FROM leaderboard WHERE {where} AND user_id = ?", (*board, user_id)
+            ).fetchone()
+            if row is None:
+                return None
+            ahead = conn.execute(
+                f"SELECT COUNT(*) FROM leaderboard WHERE {where} "
+                "AND (high_score > ? OR (high_score = ? AND seq < ?))",
+                (*board, row["high_score"], row["high_score"], row["seq"]),
+            ).fetchone()[0]
+            return ahead + 1
+
+        return await self._db.read(query)
+
+    @staticmethod
+    def _entry(row: sqlite3.Row, rank: int) -> Leaderboard:
+        return Leaderboard(
+            id=row["seq"],
+            user_id=row["user_id"],
+            username=row["username"],
+            high_score=row["high_score"],
+            total_score=row["total_score"],
+            accuracy_percentage=row["accuracy_percentage"],
+            sessions_played=row["sessions_played"],
+            rank=rank,
+            updated_at=row["updated_at"],
+        )
+
+
+class SQLiteStatsRepository(IStatsRepository):
+    """
+    SQLite implementation of stats repository.
+
+    Per-user counters are plain columns; the global and per-level streaming
+    aggregates are stored as serialized sketches and updated in place.
+    """
+
+    def __init__(self, db: SQLiteDatabase):
+        self._db = db
+
+    async def get_user_stats(self, user_id: str) -> Dict[str, Any]:
+        row = await self._db.read(
+            lambda conn: conn.execute("SELECT * FROM user_stats WHERE user_id = ?", (user_id,)).fetchone()
+        )
+        if row is None:
+            return {
+                "total_sessions": 0,
+                "total_words_attempted": 0,
+                "total_words_correct": 0,
+                "average_accuracy": 0.0,
+                "best_score": 0,
+                "total_play_time_seconds": 0.0,
+                "total_play_time_minutes": 0
+            }
+        attempted = row["total_words_attempted"]
+        return {
+            "total_sessions": row["total_sessions"],
+            "total_words_attempted": attempted,
+            "total_words_correct": row["total_words_correct"],
+            "average_accuracy": row["total_words_correct"] / attempted * 100 if attempted else 0.0,
+            "best_score": row["best_score"],
+            "total_play_time_seconds": row["total_play_time_seconds"],
+            "total_play_time_minutes": int(row["total_play_time_seconds"] // 60)
+        }
+
+    async def get_global_stats(self) -> Dict[str, Any]:
+        def query(conn: sqlite3.Connection):
+            players = conn.execute("SELECT COUNT(*) FROM user_stats").fetchone()[0]
+            return players, conn.execute("SELECT scope, data FROM stats_aggregates").fetchall()
+
+        players, rows = await self._db.read(query)
+        aggregates = {row["scope"]: SessionAggregate.from_dict(json.loads(row["data"])) for row in rows}
+        overall = aggregates.pop("overall", SessionAggregate())
+        levels = {scope.split(":", 1)[1]: aggregate for scope, aggregate in aggregates.items()}
+        return global_summary(overall, levels, players)
+
+    async def record_session_stats(self, session: GameSession) -> None:
+        await self.record_sessions_stats([session])
+
+    async def record_sessions_stats(self, sessions: List[GameSession]) -> None:
+        user_rows = [
+            (session.user_id or "anonymous", session.correct_answers + session.mistakes,
+             session.correct_answers, session.score, session_seconds(session))
+            for session in sessions
+        ]
+        by_scope: Dict[str, List[GameSession]] = {"overall": list(sessions)}
+        for session in sessions:
+            by_scope.setdefault(f"level:{_value(session.difficulty) or 'unknown'}", []).append(session)
+
+        def record(conn: sqlite3.Connection) -> None:
+            # One transaction for the whole batch; each aggregate is read and written once
+            conn.executemany(
+                "INSERT INTO user_stats (user_id, total_sessions, total_words_attempted, total_words_correct, "
+                "best_score, total_play_time_seconds) VALUES (?, 1, ?, ?, ?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET "
+                "total_sessions = total_sessions + 1, "
+                "total_words_attempted = total_words_attempted + excluded.total_words_attempted, "
+                "total_words_correct = total_words_correct + excluded.total_words_correct, "
+                "best_score = max(best_score, excluded.best_score), "
+                "total_play_time_seconds = total_play_time_seconds + excluded.total_play_time_seconds",
+                user_rows,
+            )
+            for scope, scope_sessions in by_scope.items():
+                row = conn.execute("SELECT data FROM stats_aggregates WHERE scope = ?", (scope,)).fetchone()
+                aggregate = SessionAggregate.from_dict(json.loads(row["data"])) if row else SessionAggregate()
+                for session in scope_sessions:
+                    aggregate.add_session(session)
+                conn.execute(
+                    "INSERT OR REPLACE INTO stats_aggregates (scope, data) VALUES (?, ?)",
+                    (scope, json.dumps(aggregate.to_dict())),
+                )
+
+        await self._db.write(record)
@@ -0,0 +1,78 @@
+"""
+Admission control for expensive endpoints
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+
+class OverloadedError(Exception):
+    """Raised when a request is shed; retry_after is a hint in seconds"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounded concurrency with a short, bounded wait queue.
+
+    Up to max_concurrent requests run at once. Up to max_queue more may
+    wait, each for at most queue_timeout seconds. Anything beyond that is
+    rejected at once, so a burst turns into fast 503s instead of a
+    backlog that times out every caller.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float = 1.0, retry_after: int = 1):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._active = 0
+        self._waiting = 0
+        self._counters = {"admitted": 0, "queued": 0, "rejected": 0, "timed_out": 0}
+        self._max_waiting = 0
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Hold a slot for the body of the block, or raise OverloadedError"""
+        if self._active >= self.max_concurrent or self._waiting > 0:
+            if self._waiting >= self.max_queue:
+                self._counters["rejected"] += 1
+                raise OverloadedError(f"{self.name} is at capacity", self.retry_after)
+            self._counters["queued"] += 1
+            self._waiting += 1
+            self._max_waiting = max(self._max_waiting, self._waiting)
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._counters["timed_out"] += 1
+                raise OverloadedError(f"{self.name} is at capacity", self.retry_after)
+            finally:
+                self._waiting -= 1
+        else:
+            await self._slots.acquire()
+
+        self._active += 1
+        self._counters["admitted"] += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._slots.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Configured limits, current occupancy and admission counters"""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "queue_timeout_seconds": self.queue_timeout,
+            "active": self._active,
+            "waiting": self._waiting,
+            "max_waiting": self._max_waiting,
+            **self._counters,
+        }
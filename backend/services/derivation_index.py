@@ -0,0 +1,286 @@
+"""
+Pre-derived catalogue of derivations indexed by the sutras they exercise
+"""
+
+import json
+import random
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from itertools import accumulate
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ..models.game import StoredStep
+
+DEFAULT_CATALOG_PATH = "backend/derivations.jsonl"
+
+# Pseudo-attempts pulling a player's sutra error rate towards the global one
+PLAYER_PRIOR_ATTEMPTS = 5
+# Weight floor so sutras nobody struggles with still come up now and then
+MIN_WEIGHT = 0.01
+
+
+class Derivation(NamedTuple):
+    """One derived word, stored compactly as (code, result) pairs"""
+    level: str
+    root: str
+    text: str
+    steps: Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+    def history(self) -> List[StoredStep]:
+        return [StoredStep(code=code, result=list(result)) for code, result in self.steps]
+
+    def changes(self) -> int:
+        """Number of steps that change the form; vidyut also records bookkeeping rules that do not"""
+        count, form = 0, self.root
+        for _, result in self.steps:
+            to_form = "".join(result)
+            count += to_form != form
+            form = to_form
+        return count
+
+    def tail(self, length: int) -> "Derivation":
+        """
+        The last length steps that change the form, starting from the form
+        reached just before them. Steps that leave the form as it was (such
+        as 1.4.14 or 8.4.68 at the end of most histories) are dropped, since
+        a player would see from == to.
+        """
+        kept: List[Tuple[str, Tuple[str, ...]]] = []
+        root = self.root
+        for i in range(len(self.steps) - 1, -1, -1):
+            if len(kept) == length:
+                break
+            before = "".join(self.steps[i - 1][1]) if i > 0 else self.root
+            if "".join(self.steps[i][1]) != before:
+                kept.append(self.steps[i])
+                root = before
+        kept.reverse()
+        if len(kept) == len(self.steps):
+            return self
+        return self._replace(root=root, steps=tuple(kept))
+
+
+class DerivationIndex:
+    """
+    Inverted index from sutra code to the derivations whose history uses it.
+
+    Posting lists are kept per level, so a drill is one dict lookup plus a
+    uniform pick from the list. Derivations are also bucketed by how many
+    of their steps change the form, with the counts present kept sorted for
+    bisect.
+    """
+
+    def __init__(self, derivations: Iterable[Derivation] = ()):
+        self.derivations: List[Derivation] = []
+        self._postings: Dict[Tuple[str, str], List[int]] = {}
+        self._sutras: Dict[str, List[str]] = {}
+        self._by_length: Dict[Tuple[str, int], List[int]] = {}
+        self._lengths: Dict[str, List[int]] = {}
+        for derivation in derivations:
+            self.add(derivation)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_CATALOG_PATH) -> "DerivationIndex":
+        """Load a catalogue written by panini-catalog; a missing file gives an empty index"""
+        catalog_path = Path(path)
+        if not catalog_path.exists():
+            return cls()
+        index = cls()
+        with open(catalog_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                index.add(Derivation(
+                    level=record["level"],
+                    root=record["root"],
+                    text=record["text"],
+                    steps=tuple((code, tuple(result)) for code, result in record["history"]),
+                ))
+        return index
+
+    def add(self, derivation: Derivation) -> int:
+        derivation_id = len(self.derivations)
+        self.derivations.append(derivation)
+        for code in {code for code, _ in derivation.steps}:
+            postings = self._postings.get((derivation.level, code))
+            if postings is None:
+                postings = self._postings[(derivation.level, code)] = []
+                self._sutras.setdefault(derivation.level, []).append(code)
+            postings.append(derivation_id)
+        length = derivation.changes()
+        bucket = self._by_length.get((derivation.level, length))
+        if bucket is None:
+            bucket = self._by_length[(derivation.level, length)] = []
+            insort(self._lengths.setdefault(derivation.level, []), length)
+        bucket.append(derivation_id)
+        return derivation_id
+
+    def __len__(self) -> int:
+        return len(self.derivations)
+
+    def sutras(self, level: str) -> List[str]:
+        """Sutra codes with at least one derivation at the level, in first-seen order"""
+        return self._sutras.get(level, [])
+
+    def postings(self, level: str, code: str) -> List[int]:
+        return self._postings.get((level, code), [])
+
+    def drill(self, level: str, code: str) -> Derivation:
+        """A random derivation at the level that applies the sutra"""
+        postings = self.postings(level, code)
+        if not postings:
+            raise ValueError(f"No {level} derivation uses sutra {code}")
+        return self.derivations[random.choice(postings)]
+
+    def with_length(self, level: str, length: int, rng: random.Random = random) -> Derivation:
+        """
+        A random derivation at the level with exactly length form-changing
+        steps, or else the shortest with more (which tail() can trim), or
+        else the one with the most
+        """
+        lengths = self._lengths.get(level)
+        if not lengths:
+            raise ValueError(f"No {level} derivations in the catalogue")
+        position = bisect_left(lengths, length)
+        nearest = lengths[position] if position < len(lengths) else lengths[-1]
+        return self.derivations[rng.choice(self._by_length[(level, nearest)])]
+
+
+class WeightedSampler:
+    """
+    Fenwick tree over non-negative weights.
+
+    Both changing one weight and drawing an index with probability
+    proportional to its weight take O(log n).
+    """
+
+    def __init__(self, weights: List[float]):
+        self._n = len(weights)
+        self._weights = list(weights)
+        # Linear-time build: each node passes its sum to its parent
+        self._tree = [0.0] + list(weights)
+        for i in range(1, self._n + 1):
+            parent = i + (i & -i)
+            if parent <= self._n:
+                self._tree[parent] += self._tree[i]
+        self._top = 1 << (self._n.bit_length() - 1) if self._n else 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def total(self) -> float:
+        total, i = 0.0, self._n
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def update(self, index: int, weight: float) -> None:
+        delta = weight - self._weights[index]
+        self._weights[index] = weight
+        i = index + 1
+        while i <= self._n:
+            self._tree[i] += delta
+            i += i & -i
+
+    def sample(self, rng: random.Random = random) -> int:
+        target = rng.random() * self.total()
+        # Walk down the implicit tree, keeping the prefix sum below target
+        position, step = 0, self._top
+        while step:
+            nxt = position + step
+            if nxt <= self._n and self._tree[nxt] <= target:
+                position = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return min(position, self._n - 1)
+
+
+class AdaptiveSelector:
+    """
+    Picks derivations weighted towards the sutras a player gets wrong.
+
+    Sampling is two-stage: a sutra is drawn in proportion to the player's
+    smoothed error rate on it, then a derivation is drawn uniformly from
+    that sutra's posting list. Players without history fall back to the
+    global weights, which are a cumulative array searched with bisect.
+    Each active player gets a WeightedSampler, updated in O(log n) per
+    answer; the least recently used players are evicted past max_players.
+    """
+
+    def __init__(self, index: DerivationIndex, global_rate: Callable[[str], float], max_players: int = 10_000):
+        self.index = index
+        self._global_rate = global_rate
+        self.max_players = max_players
+        self._base: Dict[str, List[float]] = {}
+        self._cumulative: Dict[str, List[float]] = {}
+        self._positions: Dict[str, Dict[str, int]] = {}
+        # (user_id, level) -> sampler, most recently used last
+        self._players: "OrderedDict[Tuple[str, str], WeightedSampler]" = OrderedDict()
+        # user_id -> code -> [attempts, errors]
+        self._answers: Dict[str, Dict[str, List[int]]] = {}
+
+    def pick(self, level: str, user_id: Optional[str] = None) -> Derivation:
+        sutras = self.index.sutras(level)
+        if not sutras:
+            raise ValueError(f"No {level} derivations in the catalogue")
+        sampler = self._players.get((user_id, level)) if user_id else None
+        if sampler is not None:
+            self._players.move_to_end((user_id, level))
+            code = sutras[sampler.sample()]
+        elif user_id and user_id in self._answers:
+            code = sutras[self._sampler(user_id, level).sample()]
+        else:
+            cumulative = self._global_cumulative(level)
+            position = bisect_right(cumulative, random.random() * cumulative[-1])
+            code = sutras[min(position, len(sutras) - 1)]
+        return self.index.drill(level, code)
+
+    def record(self, user_id: str, code: str, correct: bool) -> None:
+        """Count an answer by the player and reweight the sutra in their samplers"""
+        if user_id not in self._answers and len(self._answers) >= self.max_players:
+            self._evict()
+        counts = self._answers.setdefault(user_id, {}).setdefault(code, [0, 0])
+        counts[0] += 1
+        counts[1] += 0 if correct else 1
+        for level in self._positions:
+            sampler = self._players.get((user_id, level))
+            position = self._positions[level].get(code)
+            if sampler is not None and position is not None:
+                sampler.update(position, self._player_weight(user_id, code, self._base[level][position]))
+
+    def _sampler(self, user_id: str, level: str) -> WeightedSampler:
+        self._global_cumulative(level)
+        base = self._base[level]
+        answered = self._answers.get(user_id, {})
+        weights = [
+            self._player_weight(user_id, code, base[i]) if code in answered else base[i]
+            for i, code in enumerate(self.index.sutras(level))
+        ]
+        sampler = self._players[(user_id, level)] = WeightedSampler(weights)
+        return sampler
+
+    def _player_weight(self, user_id: str, code: str, base: float) -> float:
+        attempts, errors = self._answers[user_id][code]
+        return max((errors + PLAYER_PRIOR_ATTEMPTS * base) / (attempts + PLAYER_PRIOR_ATTEMPTS), MIN_WEIGHT)
+
+    def _global_cumulative(self, level: str) -> List[float]:
+        cumulative = self._cumulative.get(level)
+        if cumulative is None:
+            sutras = self.index.sutras(level)
+            self._base[level] = [max(self._global_rate(code), MIN_WEIGHT) for code in sutras]
+            self._positions[level] = {code: i for i, code in enumerate(sutras)}
+            cumulative = self._cumulative[level] = list(accumulate(self._base[level]))
+        return cumulative
+
+    def _evict(self) -> None:
+        # Players are ordered by their last adaptive game; drop the stalest one
+        if self._players:
+            (user_id, _), _ = self._players.popitem(last=False)
+        else:
+            user_id = next(iter(self._answers))
+        self._answers.pop(user_id, None)
+        for key in [key for key in self._players if key[0] == user_id]:
+            del self._players[key]
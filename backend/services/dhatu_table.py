@@ -0,0 +1,118 @@
+"""
+Columnar dhatu metadata with vectorized, memoized filters
+"""
+
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from vidyut.kosha import DhatuEntry
+from vidyut.prakriya import Gana, Sanadi
+
+GANAS = Gana.choices()
+SANADIS = Sanadi.choices()
+_GANA_CODES = {gana.name.lower(): i for i, gana in enumerate(GANAS)}
+_SANADI_BITS = {sanadi.name.lower(): 1 << i for i, sanadi in enumerate(SANADIS)}
+# Filter value matching dhatus with no sanadi pratyaya
+NO_SANADI = "none"
+
+# Each level is a filter signature: (ganas, prefixes, sanadi)
+LEVEL_FILTERS = {
+    "beginner": (("bhvadi", "divadi", "tudadi", "curadi"), False, (NO_SANADI,)),
+    "expert": (None, None, None),
+}
+
+Signature = Tuple[str, Optional[Tuple[str, ...]], Optional[bool], Optional[Tuple[str, ...]]]
+
+
+class DhatuTable:
+    """
+    Dhatu attributes as NumPy columns, one row per kosha entry.
+
+    select() turns a level plus optional gana, prefix and sanadi filters
+    into a boolean mask over the columns and returns the matching row
+    numbers. Results are memoized by their normalized signature, so repeated
+    filters cost one dict lookup.
+    """
+
+    def __init__(self, entries: Iterable[DhatuEntry], cache_size: int = 256):
+        ganas: List[int] = []
+        prefixes: List[bool] = []
+        sanadis: List[int] = []
+        gana_codes = {gana: i for i, gana in enumerate(GANAS)}
+        sanadi_bits = {sanadi: 1 << i for i, sanadi in enumerate(SANADIS)}
+        for entry in entries:
+            dhatu = entry.dhatu
+            ganas.append(gana_codes[dhatu.gana])
+            prefixes.append(bool(dhatu.prefixes))
+            bits = 0
+            for sanadi in dhatu.sanadi:
+                bits |= sanadi_bits[sanadi]
+            sanadis.append(bits)
+        self.gana = np.array(ganas, dtype=np.int8)
+        self.has_prefixes = np.array(prefixes, dtype=bool)
+        self.sanadi = np.array(sanadis, dtype=np.uint8)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Signature, np.ndarray]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.gana)
+
+    def select(
+        self,
+        level: str,
+        ganas: Optional[Iterable[str]] = None,
+        prefixes: Optional[bool] = None,
+        sanadi: Optional[Iterable[str]] = None,
+    ) -> np.ndarray:
+        """Read-only array of row numbers playable at the level that match every given filter"""
+        if level not in LEVEL_FILTERS:
+            raise ValueError(f"Invalid level: {level}")
+        signature = (
+            level,
+            tuple(sorted({gana.lower() for gana in ganas})) if ganas else None,
+            prefixes,
+            tuple(sorted({name.lower() for name in sanadi})) if sanadi else None,
+        )
+        rows = self._cache.get(signature)
+        if rows is not None:
+            self._cache.move_to_end(signature)
+            return rows
+
+        mask = np.ones(len(self), dtype=bool)
+        for filters in (LEVEL_FILTERS[level], signature[1:]):
+            mask &= self._mask(*filters)
+        rows = np.flatnonzero(mask)
+        rows.setflags(write=False)
+        self._cache[signature] = rows
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return rows
+
+    def _mask(
+        self,
+        ganas: Optional[Tuple[str, ...]],
+        prefixes: Optional[bool],
+        sanadi: Optional[Tuple[str, ...]],
+    ) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        if ganas is not None:
+            allowed = np.zeros(len(GANAS), dtype=bool)
+            for gana in ganas:
+                if gana not in _GANA_CODES:
+                    raise ValueError(f"Unknown gana: {gana}")
+                allowed[_GANA_CODES[gana]] = True
+            mask &= allowed[self.gana]
+        if prefixes is not None:
+            mask &= self.has_prefixes == prefixes
+        if sanadi is not None:
+            bits = 0
+            for name in sanadi:
+                if name != NO_SANADI and name not in _SANADI_BITS:
+                    raise ValueError(f"Unknown sanadi: {name}")
+                bits |= _SANADI_BITS.get(name, 0)
+            matches = (self.sanadi & bits) != 0
+            if NO_SANADI in sanadi:
+                matches |= self.sanadi == 0
+            mask &= matches
+        return mask
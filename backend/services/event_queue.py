@@ -0,0 +1,198 @@
+"""
+Write-behind queue that records game events off the request path
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Union
+
+from ..models.game import GameAnswer, GameSession
+from ..repositories.interfaces import IGameRepository, ILeaderboardRepository, IStatsRepository, ScoreUpdate
+
+logger = logging.getLogger(__name__)
+
+
+class AnswerEvent(NamedTuple):
+    """A submitted answer, saved through IGameRepository.save_answers"""
+    answer: GameAnswer
+
+
+class FinishEvent(NamedTuple):
+    """A finished game, posted to the leaderboards and stats"""
+    session: GameSession
+    # Set once the leaderboards have the score, so a retry only records stats
+    scored: bool = False
+
+
+GameEvent = Union[AnswerEvent, FinishEvent]
+
+
+class WriteBehindQueue:
+    """
+    Buffers game events in memory and flushes them to the repositories in batches.
+
+    submit() only appends to a bounded deque, so request handlers never wait on
+    storage. A background task flushes when max_batch events are pending or
+    the oldest has waited flush_interval seconds, and stop() drains whatever
+    is left. When the buffer is full new events are dropped and counted.
+
+    A batch that fails to write (say, a locked SQLite database) goes back to
+    the front of the queue, minus whatever was already written, and is
+    retried with exponential backoff. Only after max_retries consecutive
+    failures are its events given up on and counted as failed.
+    """
+
+    def __init__(
+        self,
+        game_repository: IGameRepository,
+        leaderboard_repository: ILeaderboardRepository,
+        stats_repository: IStatsRepository,
+        max_batch: int = 100,
+        flush_interval: float = 0.5,
+        max_pending: int = 10_000,
+        max_retries: int = 5,
+        retry_backoff: float = 0.1,
+    ):
+        self._games = game_repository
+        self._leaderboard = leaderboard_repository
+        self._stats = stats_repository
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        # Consecutive failed attempts at the batch at the front of the queue
+        self._attempts = 0
+        # (enqueued_at, event) pairs in arrival order
+        self._pending: Deque[tuple] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._counters = {
+            "enqueued": 0,
+            "flushed": 0,
+            "dropped": 0,
+            "failed": 0,
+            "retried": 0,
+            "batches": 0,
+        }
+        self._last_batch_lag = 0.0
+        self._max_lag = 0.0
+
+    def start(self) -> None:
+        """Start the flush task on the running event loop; safe to call repeatedly"""
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush every pending event and stop the background task"""
+        self._stopping = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        while self._pending:
+            await self._flush_or_back_off()
+
+    def submit(self, event: GameEvent) -> bool:
+        """Queue an event without waiting; returns False if it was dropped"""
+        if len(self._pending) >= self.max_pending:
+            self._counters["dropped"] += 1
+            return False
+        self._pending.append((time.monotonic(), event))
+        self._counters["enqueued"] += 1
+        self.start()
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+        return True
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, counters and lag in seconds"""
+        oldest = time.monotonic() - self._pending[0][0] if self._pending else 0.0
+        return {
+            "pending": len(self._pending),
+            **self._counters,
+            "oldest_pending_seconds": oldest,
+            "last_batch_lag_seconds": self._last_batch_lag,
+            "max_lag_seconds": self._max_lag,
+        }
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            # Wait until the batch fills or the oldest event is due
+            due = self._pending[0][0] + self.flush_interval - time.monotonic()
+            if len(self._pending) < self.max_batch and due > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=due)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._flush_or_back_off()
+
+    def _take_batch(self) -> List[tuple]:
+        return [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+
+    async def _flush_or_back_off(self) -> None:
+        if not await self._flush(self._take_batch()):
+            await asyncio.sleep(self.retry_backoff * 2 ** (self._attempts - 1))
+
+    async def _flush(self, batch: List[tuple]) -> bool:
+        """Write a batch; returns False if it was requeued for a retry"""
+        if not batch:
+            return True
+        lag = time.monotonic() - batch[0][0]
+        self._last_batch_lag = lag
+        self._max_lag = max(self._max_lag, lag)
+        self._counters["batches"] += 1
+
+        # Each repository takes its part of the batch in one call. Events are
+        # removed from unwritten as they land, so a retry never writes one twice
+        unwritten = list(batch)
+        try:
+            answers = [event.answer for _, event in unwritten if isinstance(event, AnswerEvent)]
+            if answers:
+                await self._games.save_answers(answers)
+                unwritten = [item for item in unwritten if not isinstance(item[1], AnswerEvent)]
+            scores = [
+                ScoreUpdate(
+                    event.session.user_id, event.session.user_id, event.session.score,
+                    event.session.difficulty.value if event.session.difficulty else None
+                )
+                for _, event in unwritten
+                if event.session.user_id and not event.scored
+            ]
+            if scores:
+                await self._leaderboard.update_user_scores(scores)
+                unwritten = [(enqueued_at, event._replace(scored=True)) for enqueued_at, event in unwritten]
+            if unwritten:
+                await self._stats.record_sessions_stats([event.session for _, event in unwritten])
+                unwritten = []
+        except Exception:
+            written = len(batch) - len(unwritten)
+            self._counters["flushed"] += written
+            # Progress means the store is taking writes again, so the retry budget starts over
+            self._attempts = 1 if written else self._attempts + 1
+            if self._attempts <= self.max_retries:
+                self._counters["retried"] += len(unwritten)
+                self._pending.extendleft(reversed(unwritten))
+                logger.warning(
+                    "Writing %d game events failed (attempt %d of %d); retrying",
+                    len(unwritten), self._attempts, self.max_retries + 1, exc_info=True,
+                )
+                return False
+            self._counters["failed"] += len(unwritten)
+            logger.error("Giving up on %d game events after %d attempts", len(unwritten), self._attempts, exc_info=True)
+            self._attempts = 0
+            return True
+        self._counters["flushed"] += len(batch)
+        self._attempts = 0
+        return True
@@ -2,22 +2,46 @@
 Service layer for game-related business logic
 """
 
+import os
 import uuid
 from datetime import datetime
-from typing import Optional, Dict
+from functools import partial
+from typing import Any, Callable, Optional, Dict, List, NamedTuple, Tuple
 import random
 
 from .interfaces import IGameService
 from .word_service import WordService
-from ..models.game import GameSession
+from .event_queue import WriteBehindQueue, AnswerEvent, FinishEvent
+from .journal import GameJournal
+from .sutra_report import SutraReport
+from .derivation_index import AdaptiveSelector, Derivation, DerivationIndex
+from .recency import RecencyTracker, RecentlyServed
+from .singleflight import SingleFlight
+from ..models.game import GameSession, GameDifficulty, GameStatus, GameAnswer, AnswerStatus, StoredStep
 from ..dto.game_dto import (
     StartGameRequest, StartGameResponse, SubmitAnswerRequest, SubmitAnswerResponse,
     GameStatusResponse, FinishGameResponse, RuleDetailsResponse, GameStep, 
-    GetChoicesResponse, SutraChoice
+    GetChoicesResponse, SutraChoice, BulkStartGameRequest, BulkStartGameResponse
 )
 from vidyut.kosha import Kosha
 from vidyut.lipi import transliterate, Scheme
 
+# Draws per game start before a recently served word is accepted anyway
+MAX_FRESH_DRAWS = 8
+# Steps in the daily challenge
+DAILY_LENGTH = 5
+
+
+class PreparedGame(NamedTuple):
+    """A daily challenge, derived and rendered once and shared by every session that day"""
+    date: str
+    level: str
+    root: str
+    objective: str
+    history: Tuple[StoredStep, ...]
+    steps: Tuple[GameStep, ...]
+    choices: Tuple[GetChoicesResponse, ...]
+
 
 class GameService(IGameService):
     """Service for game-related operations"""
@@ -27,9 +51,25 @@ class GameService(IGameService):
         kosha: Kosha,
         sutras: Optional[list[str]] = None,
         sessions: Optional[Dict[str, GameSession]] = None,
+        events: Optional[WriteBehindQueue] = None,
+        journal: Optional[GameJournal] = None,
+        report: Optional[SutraReport] = None,
+        catalog: Optional[DerivationIndex] = None,
+        recent: Optional[RecencyTracker] = None,
+        derive_workers: Optional[int] = None,
     ):
         self.sessions = sessions if sessions is not None else {}
-        self._word_service = WordService(kosha)
+        self._events = events
+        self._journal = journal
+        if journal is not None:
+            journal.daily_games = self._daily_game
+        self.report = report if report is not None else SutraReport()
+        self.catalog = catalog if catalog is not None else DerivationIndex()
+        self._adaptive = AdaptiveSelector(self.catalog, self.report.error_rate)
+        self._recent = recent if recent is not None else RecencyTracker()
+        self._daily: Dict[str, PreparedGame] = {}
+        self._daily_flights = SingleFlight()
+        self._word_service = WordService(kosha, derive_workers=derive_workers)
         self.sutras = sutras if sutras is not None else []
         self.sutra_codes = list(set([sutra.code for sutra in sutras])) if sutras is not None else []
 
@@ -37,40 +77,85 @@ class GameService(IGameService):
         """Start a new game session"""
         # Generate unique game ID
         game_id = str(uuid.uuid4())
-        dhatu = self._word_service.get_random_dhatu(level=request.level)
-        prakriya = self._word_service.get_random_prakriya(dhatu, level=request.level)
+        derivation = await self._pick_derivation(request)
 
-        steps = []
-        from_word = dhatu.aupadeshika
-        for i, step in enumerate(prakriya.history):
-            print(f"Step {i + 1}: {step}, Code: {step.code}, Result: {step.result}")
-                  
-            to_word = ''.join(step.result)
-            steps.append(
-                GameStep(
-                    id=i + 1,
-                    from_word=self._convert(from_word, level=request.level),
-                    to_word=self._convert(to_word, level=request.level),
-                    hint=None,
-                )
-            )
-            from_word = to_word  # Update from_word for next step
+        steps = self._render_steps(derivation, request.level)
         session= GameSession(
             id=game_id,
-            root=self._convert(dhatu.aupadeshika, level=request.level),
-            objective=self._convert(prakriya.text, level=request.level),
-            history=prakriya.history,
+            user_id=request.user_id,
+            difficulty=GameDifficulty(request.level),
+            root=self._convert(derivation.root, level=request.level),
+            objective=self._convert(derivation.text, level=request.level),
+            history=derivation.history(),
             current_step=1,  # Start at the first step
             started_at=datetime.now()
         )
         self.sessions[game_id] = session
-        
+        if self._journal is not None:
+            self._journal.record_start(session)
 
         return StartGameResponse(
             game_id=game_id,
             steps=steps
         )
 
+    async def start_bulk_games(self, request: BulkStartGameRequest) -> BulkStartGameResponse:
+        """Derive once and start one session per player on the shared steps"""
+        derivation = await self._pick_derivation(StartGameRequest(
+            level=request.level, length=request.length, pada=request.pada, sutra=request.sutra,
+            gana=request.gana, prefixes=request.prefixes, sanadi=request.sanadi,
+        ))
+        steps = self._render_steps(derivation, request.level)
+        root = self._convert(derivation.root, level=request.level)
+        objective = self._convert(derivation.text, level=request.level)
+        history = tuple(derivation.history())
+        user_ids = request.user_ids if request.user_ids is not None else [None] * request.count
+        
+        # Sessions are shallow copies of one unvalidated template, and all
+        # their ids come from a single urandom call
+        template = GameSession.model_construct(
+            difficulty=GameDifficulty(request.level),
+            root=root,
+            objective=objective,
+            history=history,
+            started_at=datetime.now(),
+        )
+        entropy = os.urandom(16 * len(user_ids))
+        game_ids = []
+        sessions = []
+        for i, user_id in enumerate(user_ids):
+            game_id = str(uuid.UUID(bytes=entropy[16 * i:16 * i + 16], version=4))
+            session = template.model_copy(update={"id": game_id, "user_id": user_id})
+            self.sessions[game_id] = session
+            sessions.append(session)
+            game_ids.append(game_id)
+        if self._journal is not None:
+            # One record with the shared history, not one full copy per session
+            self._journal.record_bulk_start(sessions)
+
+        return BulkStartGameResponse.model_construct(gameIds=game_ids, steps=steps)
+
+    async def start_daily_game(self, level: str, user_id: Optional[str] = None) -> StartGameResponse:
+        """Start a session of today's daily challenge"""
+        prepared = await self._get_daily(level)
+        game_id = str(uuid.uuid4())
+        # Everything but the progress counters is shared, so skip validation and copying
+        session = GameSession.model_construct(
+            id=game_id,
+            user_id=user_id,
+            difficulty=GameDifficulty(level),
+            root=prepared.root,
+            objective=prepared.objective,
+            history=prepared.history,
+            started_at=datetime.now(),
+            daily=prepared.date,
+        )
+        self.sessions[game_id] = session
+        if self._journal is not None:
+            self._journal.record_start(session)
+
+        return StartGameResponse.model_construct(gameId=game_id, steps=list(prepared.steps))
+
     async def submit_answer(self, game_id: str, step_id: int, request: SubmitAnswerRequest) -> SubmitAnswerResponse:
         """Submit an answer for the current word"""
         # Validate game exists (simplified for demo)
@@ -86,6 +171,8 @@ class GameService(IGameService):
                 next_step_id=session.current_step
             )
         is_correct = session.history[step_id-1].code == request.sutra
+        if session.user_id and len(self.catalog) > 0:
+            self._adaptive.record(session.user_id, session.history[step_id-1].code, is_correct)
         next_step_id = step_id + 1 if is_correct and step_id < len(session.history) else step_id
         if is_correct and step_id == len(session.history):
             next_step_id = None
@@ -101,6 +188,23 @@ class GameService(IGameService):
             self.sessions[game_id].correct_answers += 1
         else:
             self.sessions[game_id].mistakes += 1
+        
+        now = datetime.now()
+        if self._events is not None:
+            self._events.submit(AnswerEvent(GameAnswer(
+                session_id=game_id,
+                word_id=step_id,  # Games are a sequence of steps rather than words
+                user_answer=request.sutra,
+                correct_answer=session.history[step_id-1].code,
+                status=AnswerStatus.CORRECT if is_correct else AnswerStatus.INCORRECT,
+                points_earned=10 if is_correct else 0,
+                time_taken_seconds=int((now - (session.last_answered_at or session.started_at)).total_seconds()),
+                level=session.difficulty.value if session.difficulty else None,
+                submitted_at=now
+            )))
+        session.last_answered_at = now
+        if self._journal is not None:
+            self._journal.record_answer(session)
 
         # Simple evaluation for demonstration
 
@@ -133,7 +237,9 @@ class GameService(IGameService):
             raise ValueError("Game session not found")
 
         # Calculate time taken in seconds
-        time_taken = (datetime.now() - session.started_at).total_seconds()
+        session.completed_at = datetime.now()
+        session.status = GameStatus.COMPLETED
+        time_taken = (session.completed_at - session.started_at).total_seconds()
         
         # Calculate rank based on performance
         total_steps = len(session.history)
@@ -141,6 +247,12 @@ class GameService(IGameService):
         
         rank = self._calculate_rank(accuracy, time_taken, total_steps)
         del self.sessions[game_id]  # Remove session after finishing
+        if self._journal is not None:
+            self._journal.record_finish(game_id)
+        
+        if self._events is not None:
+            # Leaderboards and stats are updated behind the response
+            self._events.submit(FinishEvent(session))
         
         return FinishGameResponse(
             score=session.score,
@@ -150,6 +262,10 @@ class GameService(IGameService):
             rank=rank
         )
 
+    def derivation_metrics(self) -> Dict[str, Any]:
+        """Derivation cache and coalescing counters"""
+        return {**self._word_service.metrics(), "daily": self._daily_flights.metrics()}
+
     async def get_rule_details(self, sutra: str) -> RuleDetailsResponse:
         """Get details for a specific Panini grammar rule"""
         # Sample rule details for demonstration
@@ -188,8 +304,107 @@ class GameService(IGameService):
         if step_id < 1 or step_id > len(session.history):
             raise ValueError("Invalid step ID")
         
-        # Get the correct answer
-        correct_code = session.history[step_id-1].code
+        if session.daily is not None:
+            prepared = self._daily.get(session.difficulty.value)
+            if prepared is not None and prepared.date == session.daily:
+                return prepared.choices[step_id-1]
+        
+        return self._build_choices(session.history[step_id-1].code)
+
+    async def get_sutra_candidate(self, game_id: str, step_id: int) -> str:
+        """Get a random sutra candidate for the current step"""
+        # Validate game exists
+        session = self.sessions.get(game_id, None)
+        if not session:
+            raise ValueError("Game session not found")
+        if step_id < 1 or step_id > len(session.history):
+            raise ValueError("Invalid step ID")
+        codes = [session.history[step_id-1].code]
+        codes.append(random.sample(self.sutra_codes,3))
+        
+        # Return a random sutra from the available sutras
+        return codes
+
+    async def _pick_derivation(self, request: StartGameRequest) -> Derivation:
+        """
+        Drill and adaptive games play a whole catalogued derivation, so the
+        targeted sutras stay in play. Other games are cut to request.length
+        steps, preferring a catalogued derivation of that length.
+
+        For a known player, dhatus and derivations served recently are
+        redrawn a bounded number of times before settling for a repeat.
+        Dhatu filters always derive live, from the matching rows of the
+        dhatu table.
+        """
+        recent = self._recent.get(request.user_id) if request.user_id else None
+        filters = {"ganas": request.gana, "prefixes": request.prefixes, "sanadi": request.sanadi}
+        filtered = any(value is not None for value in filters.values())
+        if filtered and (request.sutra or request.adaptive):
+            raise ValueError("Dhatu filters cannot be combined with sutra or adaptive games")
+        if request.pada == "subanta" and (filtered or request.sutra or request.adaptive):
+            raise ValueError("Subanta games cannot be combined with dhatu filters, sutra or adaptive games")
+        if request.pada == "subanta":
+            pratipadika, lingas = await self._word_service.get_random_pratipadika()
+            for _ in range(MAX_FRESH_DRAWS - 1):
+                if recent is None or pratipadika.text not in recent:
+                    break
+                pratipadika, lingas = await self._word_service.get_random_pratipadika()
+            prakriya = await self._word_service.get_random_subanta_prakriya(pratipadika, lingas)
+            if prakriya is None:
+                raise ValueError(f"Could not derive a word from {pratipadika.text}")
+            derivation = Derivation(
+                level=request.level,
+                root=pratipadika.text,
+                text=prakriya.text,
+                steps=tuple((step.code, tuple(step.result)) for step in prakriya.history),
+            )
+        elif request.sutra or request.adaptive:
+            if len(self.catalog) == 0:
+                raise ValueError("No derivation catalogue loaded; build one with panini-catalog")
+            if request.sutra:
+                draw = partial(self.catalog.drill, request.level, request.sutra)
+            else:
+                draw = partial(self._adaptive.pick, request.level, request.user_id)
+            derivation = self._draw_fresh(draw, recent)
+        elif len(self.catalog) > 0 and not filtered:
+            derivation = self._draw_fresh(partial(self.catalog.with_length, request.level, request.length), recent)
+        else:
+            # Deriving is the expensive part, so only the dhatu is redrawn
+            dhatu = self._word_service.get_random_dhatu(level=request.level, **filters)
+            for _ in range(MAX_FRESH_DRAWS - 1):
+                if recent is None or dhatu.aupadeshika not in recent:
+                    break
+                dhatu = self._word_service.get_random_dhatu(level=request.level, **filters)
+            prakriya = await self._word_service.get_random_prakriya(dhatu, level=request.level)
+            if prakriya is None:
+                raise ValueError(f"Could not derive a word from {dhatu.aupadeshika}")
+            derivation = Derivation(
+                level=request.level,
+                root=dhatu.aupadeshika,
+                text=prakriya.text,
+                steps=tuple((step.code, tuple(step.result)) for step in prakriya.history),
+            )
+        if recent is not None:
+            recent.add(derivation.root)
+            recent.add(self._derivation_key(derivation))
+        if request.sutra or request.adaptive:
+            return derivation
+        return derivation.tail(request.length)
+
+    def _draw_fresh(self, draw: Callable[[], Derivation], recent: Optional[RecentlyServed]) -> Derivation:
+        derivation = draw()
+        for _ in range(MAX_FRESH_DRAWS - 1):
+            if recent is None or (derivation.root not in recent and self._derivation_key(derivation) not in recent):
+                break
+            derivation = draw()
+        return derivation
+
+    @staticmethod
+    def _derivation_key(derivation: Derivation) -> str:
+        return f"{derivation.level}:{derivation.root}:{derivation.text}"
+
+    def _build_choices(self, correct_code: str, rng: random.Random = random) -> GetChoicesResponse:
+        """The correct sutra and 3 random wrong ones, shuffled"""
         correct_sutras = [sutra for sutra in self.sutras if sutra.code == correct_code]
         print(f"Correct code: {correct_code}, Sutras: {correct_sutras}")
         if not correct_sutras:
@@ -200,29 +415,89 @@ class GameService(IGameService):
         
         # Get 3 random wrong choices
         print(f"Correct sutra: {correct_sutra}")
-        wrong_choices = random.sample([sutra for sutra in self.sutras if sutra.code != correct_code], 3)
+        wrong_choices = rng.sample([sutra for sutra in self.sutras if sutra.code != correct_code], 3)
         for sutra in wrong_choices:
             print(f"Wrong choice: {sutra.code}, Description: {sutra.text}")
             choices.append(SutraChoice(sutra=sutra.code, description=self._convert(sutra.text, level='beginner'), answer=False))
         
         # Combine and shuffle choices
-        random.shuffle(choices)
+        rng.shuffle(choices)
         
         return GetChoicesResponse(choices=choices)
 
-    async def get_sutra_candidate(self, game_id: str, step_id: int) -> str:
-        """Get a random sutra candidate for the current step"""
-        # Validate game exists
-        session = self.sessions.get(game_id, None)
-        if not session:
-            raise ValueError("Game session not found")
-        if step_id < 1 or step_id > len(session.history):
-            raise ValueError("Invalid step ID")
-        codes = [session.history[step_id-1].code]
-        codes.append(random.sample(self.sutra_codes,3))
-        
-        # Return a random sutra from the available sutras
-        return codes
+    async def _get_daily(self, level: str) -> PreparedGame:
+        """Today's challenge for the level, prepared on the first request after rollover"""
+        today = datetime.now().date().isoformat()
+        prepared = self._daily.get(level)
+        if prepared is None or prepared.date != today:
+            # Requests arriving during preparation wait for the same one, which
+            # derives on the derivation threads rather than the default pool
+            prepared = await self._daily_flights.do(
+                f"{today}:{level}", partial(self._word_service.run_in_executor, self._prepare_daily, today, level)
+            )
+            self._daily[level] = prepared
+        return prepared
+
+    def _daily_game(self, date: str, level: str) -> Tuple[str, str, Tuple[StoredStep, ...]]:
+        """Root, objective and history of a day's challenge, for rebuilding journaled daily sessions"""
+        prepared = self._daily.get(level)
+        if prepared is None or prepared.date != date:
+            # Preparation is seeded by date and level, so this is the challenge the session played
+            prepared = self._prepare_daily(date, level)
+            if date == datetime.now().date().isoformat():
+                self._daily[level] = prepared
+        return prepared.root, prepared.objective, prepared.history
+
+    def _prepare_daily(self, date: str, level: str) -> PreparedGame:
+        # Seeded by date and level, so every worker prepares the same challenge
+        rng = random.Random(f"daily:{date}:{level}")
+        derivation = None
+        if len(self.catalog) > 0:
+            derivation = self.catalog.with_length(level, DAILY_LENGTH, rng)
+        else:
+            options = self._word_service.get_tinanta_options(level)
+            for _ in range(MAX_FRESH_DRAWS):
+                dhatu = rng.choice(self._word_service.get_dhatus(level)).dhatu
+                prakriyas = self._word_service.derive_tinanta(
+                    dhatu, *(rng.choice(options[name]) for name in ("prayoga", "lakara", "purusha", "vacana"))
+                )
+                if prakriyas:
+                    derivation = Derivation(
+                        level=level,
+                        root=dhatu.aupadeshika,
+                        text=prakriyas[0].text,
+                        steps=tuple((step.code, tuple(step.result)) for step in prakriyas[0].history),
+                    )
+                    break
+        if derivation is None:
+            raise ValueError(f"Could not derive a daily {level} challenge")
+        derivation = derivation.tail(DAILY_LENGTH)
+
+        steps = self._render_steps(derivation, level)
+        return PreparedGame(
+            date=date,
+            level=level,
+            root=self._convert(derivation.root, level=level),
+            objective=self._convert(derivation.text, level=level),
+            history=tuple(derivation.history()),
+            steps=tuple(steps),
+            choices=tuple(self._build_choices(code, rng) for code, _ in derivation.steps),
+        )
+
+    def _render_steps(self, derivation: Derivation, level: str) -> List[GameStep]:
+        """Transliterated from/to forms of every step"""
+        steps = []
+        from_word = derivation.root
+        for i, (code, result) in enumerate(derivation.steps):
+            to_word = ''.join(result)
+            steps.append(GameStep(
+                id=i + 1,
+                from_word=self._convert(from_word, level=level),
+                to_word=self._convert(to_word, level=level),
+                hint=None,
+            ))
+            from_word = to_word
+        return steps
 
     def _get_difficulty_level(self, difficulty: str) -> int:
         """Convert difficulty string to numeric level"""
@@ -4,11 +4,12 @@ These interfaces define the contracts for business logic services.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from ..dto.game_dto import (
     StartGameRequest, StartGameResponse, SubmitAnswerRequest, SubmitAnswerResponse,
-    GameStatusResponse, FinishGameResponse, RuleDetailsResponse, GetChoicesResponse
+    GameStatusResponse, FinishGameResponse, RuleDetailsResponse, GetChoicesResponse,
+    BulkStartGameRequest, BulkStartGameResponse
 )
 
 
@@ -39,6 +40,45 @@ class IGameService(ABC):
         """
         pass
 
+    @abstractmethod
+    async def start_daily_game(self, level: str, user_id: Optional[str] = None) -> StartGameResponse:
+        """
+        Start a session of today's daily challenge.
+        
+        Every player gets the same derivation for the day. It is prepared
+        once per day and level, and each session only tracks its own progress.
+        
+        Args:
+            level: Difficulty level of the challenge
+            user_id: Optional player to credit on the leaderboards
+            
+        Returns:
+            Game session with unique ID and the shared transformation steps
+            
+        Raises:
+            ValueError: If the level is invalid or nothing could be derived
+        """
+        pass
+
+    @abstractmethod
+    async def start_bulk_games(self, request: BulkStartGameRequest) -> BulkStartGameResponse:
+        """
+        Start the same game for many players at once.
+        
+        Derives a single word and creates one session per player, all
+        sharing its steps.
+        
+        Args:
+            request: Game configuration plus the number of sessions or player ids
+            
+        Returns:
+            The new session IDs and the shared transformation steps
+            
+        Raises:
+            ValueError: If no words available for the difficulty level
+        """
+        pass
+
     @abstractmethod
     async def submit_answer(self, game_id: str, step_id: int, request: SubmitAnswerRequest) -> SubmitAnswerResponse:
         """
@@ -98,6 +138,15 @@ class IGameService(ABC):
         """
         pass
 
+    def derivation_metrics(self) -> Dict[str, Any]:
+        """
+        Counters describing derivation work, for the metrics endpoint.
+        
+        Returns:
+            Implementation-specific counters; empty by default
+        """
+        return {}
+
     @abstractmethod
     async def get_rule_details(self, sutra: str) -> RuleDetailsResponse:
         """
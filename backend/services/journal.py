@@ -0,0 +1,303 @@
+"""
+Append-only journal of game events with snapshots for crash recovery
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+from ..models.game import GameSession, StoredStep
+
+logger = logging.getLogger(__name__)
+
+# Fields a daily session shares with the day's challenge, rebuilt on load
+DAILY_FIELDS = {"root", "objective", "history"}
+
+# (date, level) -> root, objective and history of that day's challenge
+DailyResolver = Callable[[str, str], Tuple[str, str, Sequence[StoredStep]]]
+
+
+def session_to_dict(session: GameSession, with_history: bool = True) -> Dict[str, Any]:
+    """
+    JSON-ready copy of a session; history steps are kept as code/result
+    pairs. A daily session keeps only its reference to the day's challenge
+    (daily date and difficulty) plus its own progress. Without with_history
+    the history is left for the caller to store once for many sessions.
+    """
+    if session.daily:
+        return session.model_dump(mode="json", exclude=DAILY_FIELDS)
+    data = session.model_dump(mode="json", exclude={"history"})
+    if with_history:
+        data["history"] = history_to_list(session.history)
+    return data
+
+
+def history_to_list(history: Sequence[StoredStep]) -> List[Dict[str, Any]]:
+    return [{"code": step.code, "result": list(step.result)} for step in history]
+
+
+def history_from_list(items: List[Dict[str, Any]]) -> Tuple[StoredStep, ...]:
+    return tuple(StoredStep(code=item["code"], result=item["result"]) for item in items)
+
+
+class GameJournal:
+    """
+    Durable log of the in-memory session store.
+
+    Every start, answer and finish is appended as one JSON line to the
+    current segment. A background task fsyncs the segment every
+    fsync_interval seconds, so many events share each fsync. After
+    snapshot_every events, the whole store is written to snapshot.json and
+    older segments are deleted. Recovery therefore reads one snapshot plus
+    at most one snapshot interval of events, however long the server has run.
+
+    Daily sessions are journaled by reference; daily_games, set by the game
+    service, rebuilds their shared steps when they are loaded. Sessions
+    sharing one history object (a bulk start) are journaled as one record,
+    and snapshots store each shared history once.
+    """
+
+    SNAPSHOT = "snapshot.json"
+
+    def __init__(
+        self,
+        directory: str,
+        sessions: Dict[str, GameSession],
+        fsync_interval: float = 0.05,
+        snapshot_every: int = 10_000,
+    ):
+        self.directory = Path(directory)
+        self.sessions = sessions
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self._seq = 0
+        self._segment: Optional[TextIO] = None
+        self._segment_path: Optional[Path] = None
+        self._dirty = False
+        self._since_snapshot = 0
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._counters = {"appended": 0, "fsyncs": 0, "snapshots": 0, "replayed": 0, "unrecoverable": 0}
+        self.daily_games: Optional[DailyResolver] = None
+        self._last_recovery_seconds = 0.0
+
+    def recover(self) -> int:
+        """Load the latest snapshot and replay newer events into sessions; returns events replayed"""
+        started = time.monotonic()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        snapshot_path = self.directory / self.SNAPSHOT
+        snapshot_seq = 0
+        if snapshot_path.exists():
+            snapshot = json.loads(snapshot_path.read_text(encoding="utf-8"))
+            snapshot_seq = snapshot["seq"]
+            histories = [history_from_list(items) for items in snapshot.get("histories", [])]
+            for data in snapshot["sessions"]:
+                ref = data.pop("history_ref", None)
+                self._load_session(data, histories[ref] if ref is not None else None)
+        self._seq = snapshot_seq
+
+        replayed = 0
+        for path in self._segments():
+            for record in self._read_segment(path):
+                if record["seq"] > snapshot_seq:
+                    self._apply(record)
+                    replayed += 1
+                self._seq = max(self._seq, record["seq"])
+
+        self._open_segment()
+        self._counters["replayed"] = replayed
+        self._last_recovery_seconds = time.monotonic() - started
+        return replayed
+
+    def start(self) -> None:
+        """Start the background fsync and snapshot task"""
+        if self._segment is None:
+            self.recover()
+        if self._task is None or self._task.done():
+            self._stopping = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the background task and leave a fresh snapshot behind"""
+        if self._task is not None:
+            # Let an fsync in flight finish before the segment is closed
+            self._stopping.set()
+            await self._task
+            self._task = None
+        if self._segment is not None:
+            await self.snapshot()
+            self._segment.close()
+            self._segment = None
+
+    def record_start(self, session: GameSession) -> None:
+        self._append({"type": "start", "session": session_to_dict(session)})
+
+    def record_bulk_start(self, sessions: List[GameSession]) -> None:
+        """
+        One record for freshly started sessions that differ only in id and
+        user_id; the first one's fields and history are written once
+        """
+        shared = session_to_dict(sessions[0], with_history=False)
+        del shared["id"], shared["user_id"]
+        self._append({
+            "type": "bulk_start",
+            "session": shared,
+            "history": history_to_list(sessions[0].history),
+            "players": [[session.id, session.user_id] for session in sessions],
+        })
+
+    def record_answer(self, session: GameSession) -> None:
+        # The resulting progress is logged rather than the answer, so replay is a plain overwrite
+        self._append({
+            "type": "answer",
+            "game_id": session.id,
+            "current_step": session.current_step,
+            "score": session.score,
+            "correct_answers": session.correct_answers,
+            "mistakes": session.mistakes,
+            "last_answered_at": session.last_answered_at.isoformat() if session.last_answered_at else None,
+        })
+
+    def record_finish(self, game_id: str) -> None:
+        self._append({"type": "finish", "game_id": game_id})
+
+    async def snapshot(self) -> None:
+        """Write the session store as of the latest event, then drop the segments it covers"""
+        # Captured on the event loop, so no event can slip between the copy and the rotation
+        seq = self._seq
+        sessions, histories = self._snapshot_sessions()
+        old_segments = self._segments()
+        self._sync()
+        self._segment.close()
+        self._open_segment()
+        self._since_snapshot = 0
+        await asyncio.to_thread(self._write_snapshot, seq, sessions, histories, old_segments)
+        self._counters["snapshots"] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "seq": self._seq,
+            "events_since_snapshot": self._since_snapshot,
+            "last_recovery_seconds": self._last_recovery_seconds,
+        }
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._seq += 1
+        record["seq"] = self._seq
+        self._segment.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._dirty = True
+        self._since_snapshot += 1
+        self._counters["appended"] += 1
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.fsync_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._dirty:
+                # Buffered lines are handed to the OS here; only the fsync leaves the loop
+                self._dirty = False
+                self._segment.flush()
+                await asyncio.to_thread(os.fsync, self._segment.fileno())
+                self._counters["fsyncs"] += 1
+            if self._since_snapshot >= self.snapshot_every:
+                await self.snapshot()
+
+    def _sync(self) -> None:
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+        self._counters["fsyncs"] += 1
+
+    def _open_segment(self) -> None:
+        self._segment_path = self.directory / f"journal-{self._seq + 1:012d}.jsonl"
+        self._segment = open(self._segment_path, "a", encoding="utf-8")
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.directory.glob("journal-*.jsonl"))
+
+    def _snapshot_sessions(self) -> Tuple[List[Dict[str, Any]], List[List[Dict[str, Any]]]]:
+        # Sessions started together share one history object; store it once and refer to it
+        sessions, histories = [], []
+        refs: Dict[int, int] = {}
+        for session in self.sessions.values():
+            data = session_to_dict(session, with_history=False)
+            if not session.daily:
+                ref = refs.get(id(session.history))
+                if ref is None:
+                    ref = refs[id(session.history)] = len(histories)
+                    histories.append(history_to_list(session.history))
+                data["history_ref"] = ref
+            sessions.append(data)
+        return sessions, histories
+
+    def _write_snapshot(
+        self, seq: int, sessions: List[Dict[str, Any]], histories: List[List[Dict[str, Any]]], old_segments: List[Path]
+    ) -> None:
+        path = self.directory / self.SNAPSHOT
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"seq": seq, "histories": histories, "sessions": sessions}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        # Only once the snapshot is durable are the events it covers redundant
+        for segment in old_segments:
+            if segment != self._segment_path:
+                segment.unlink(missing_ok=True)
+
+    @staticmethod
+    def _read_segment(path: Path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write
+                    return
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        kind = record["type"]
+        if kind == "start":
+            self._load_session(record["session"])
+        elif kind == "bulk_start":
+            history = history_from_list(record["history"])
+            for game_id, user_id in record["players"]:
+                self._load_session({**record["session"], "id": game_id, "user_id": user_id}, history)
+        elif kind == "answer":
+            session = self.sessions.get(record["game_id"])
+            if session is not None:
+                session.current_step = record["current_step"]
+                session.score = record["score"]
+                session.correct_answers = record["correct_answers"]
+                session.mistakes = record["mistakes"]
+                if record["last_answered_at"]:
+                    session.last_answered_at = datetime.fromisoformat(record["last_answered_at"])
+        elif kind == "finish":
+            self.sessions.pop(record["game_id"], None)
+
+    def _load_session(self, data: Dict[str, Any], history: Optional[Sequence[StoredStep]] = None) -> None:
+        """Restore a session; a given history is shared as is rather than validated per session"""
+        if data.get("daily"):
+            try:
+                root, objective, history = self.daily_games(data["daily"], data["difficulty"])
+            except Exception:
+                self._counters["unrecoverable"] += 1
+                logger.warning("Could not rebuild daily session %s", data.get("id"), exc_info=True)
+                return
+            data = {**data, "root": root, "objective": objective}
+        if history is None:
+            session = GameSession(**data)
+        else:
+            session = GameSession(**{**data, "history": []})
+            session.history = history
+        self.sessions[session.id] = session
@@ -0,0 +1,77 @@
+"""
+Compact, lazily built sampling index over the kosha's pratipadikas
+"""
+
+import random
+import threading
+from array import array
+from typing import List, Optional, Tuple
+
+from vidyut.kosha import Kosha, PratipadikaEntry
+from vidyut.prakriya import Linga, Pratipadika
+
+LINGAS = Linga.choices()
+
+
+class PratipadikaPool:
+    """
+    Basic (non-krdanta, non-avyaya) pratipadikas packed for random sampling.
+
+    The kosha holds over a million pratipadikas, so they are not kept as
+    Python objects. On first use, one pass packs every stem's SLP1 text
+    into a single bytes buffer with an offsets array, plus one byte of
+    linga flags per stem. A sample is then a random row whose stem is
+    sliced out and wrapped in a fresh Pratipadika. The pass takes a while,
+    so async callers should run build() off the event loop first.
+    """
+
+    def __init__(self, kosha: Kosha):
+        self._kosha = kosha
+        self._text: Optional[bytes] = None
+        self._offsets = array("I", [0])
+        self._lingas = bytearray()
+        self._build_lock = threading.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self._text is not None
+
+    def __len__(self) -> int:
+        self._ensure_built()
+        return len(self._lingas)
+
+    def sample(self, rng: random.Random = random) -> Tuple[Pratipadika, List[Linga]]:
+        """A random stem and the lingas it is used in"""
+        self._ensure_built()
+        if not self._lingas:
+            raise ValueError("The kosha has no pratipadikas")
+        row = rng.randrange(len(self._lingas))
+        text = self._text[self._offsets[row]:self._offsets[row + 1]].decode("ascii")
+        flags = self._lingas[row]
+        return Pratipadika.basic(text), [linga for i, linga in enumerate(LINGAS) if flags & (1 << i)]
+
+    def build(self) -> None:
+        """Pack the kosha's stems, once; concurrent callers wait for the first"""
+        with self._build_lock:
+            if self._text is not None:
+                return
+            linga_bits = {linga: 1 << i for i, linga in enumerate(LINGAS)}
+            text = bytearray()
+            offsets = array("I", [0])
+            lingas = bytearray()
+            for entry in self._kosha.pratipadikas():
+                if not isinstance(entry, PratipadikaEntry.Basic) or entry.is_avyaya or not entry.lingas:
+                    continue
+                flags = 0
+                for linga in entry.lingas:
+                    flags |= linga_bits[linga]
+                text += entry.pratipadika.text.encode("ascii")
+                offsets.append(len(text))
+                lingas.append(flags)
+            self._offsets, self._lingas = offsets, lingas
+            # Set last: a non-None _text means the columns are complete
+            self._text = bytes(text)
+
+    def _ensure_built(self) -> None:
+        if self._text is None:
+            self.build()
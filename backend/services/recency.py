@@ -0,0 +1,90 @@
+"""
+Bounded per-player memory of recently served dhatus and derivations
+"""
+
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import List, Optional
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing"""
+
+    def __init__(self, bits: int, hashes: int):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray((bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._array[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def clear(self) -> None:
+        self._array = bytearray(len(self._array))
+
+
+class RecentlyServed:
+    """
+    The last `size` keys served to one player.
+
+    Keys go into a fixed ring and a Bloom filter. Bloom filters cannot
+    forget, so the filter is rebuilt from the ring every time the ring wraps.
+    A key therefore counts as recent for between size and 2 * size further
+    inserts, and lookups may rarely report a false positive. Both add and
+    lookup cost O(1).
+    """
+
+    # About 1% false positives at 2 * size keys
+    BITS_PER_KEY = 10
+    HASHES = 7
+
+    def __init__(self, size: int = 32):
+        self.size = size
+        self._ring: List[Optional[str]] = [None] * size
+        self._next = 0
+        self._filter = BloomFilter(2 * size * self.BITS_PER_KEY, self.HASHES)
+
+    def add(self, key: str) -> None:
+        self._ring[self._next] = key
+        self._filter.add(key)
+        self._next += 1
+        if self._next == self.size:
+            self._next = 0
+            self._filter.clear()
+            for recent in self._ring:
+                self._filter.add(recent)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._filter
+
+
+class RecencyTracker:
+    """RecentlyServed per player, dropping the least recently active players past max_players"""
+
+    def __init__(self, size: int = 32, max_players: int = 100_000):
+        self.size = size
+        self.max_players = max_players
+        self._players: "OrderedDict[str, RecentlyServed]" = OrderedDict()
+
+    def get(self, player: str) -> RecentlyServed:
+        recent = self._players.get(player)
+        if recent is None:
+            if len(self._players) >= self.max_players:
+                self._players.popitem(last=False)
+            recent = self._players[player] = RecentlyServed(self.size)
+        else:
+            self._players.move_to_end(player)
+        return recent
+
+    def __len__(self) -> int:
+        return len(self._players)
@@ -0,0 +1,56 @@
+"""
+Coalescing of identical concurrent computations
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time.
+
+    The first caller for a key starts the computation as a task; callers
+    arriving while it is in flight await the same task instead of starting
+    their own. The task is shielded, so a caller that is cancelled (say, a
+    client disconnect) does not cancel the work for everyone else. The key
+    is released as soon as the task completes, so results are never cached
+    here; that is left to the caller.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._counters = {"calls": 0, "executed": 0, "coalesced": 0, "failed": 0}
+        self._max_waiters = 0
+        self._waiters: Dict[str, int] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await fn() for the key, sharing a computation already in flight"""
+        self._counters["calls"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self._counters["executed"] += 1
+            task = self._inflight[key] = asyncio.ensure_future(fn())
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done, key=key: self._release(key, done))
+        else:
+            self._counters["coalesced"] += 1
+            self._waiters[key] += 1
+            self._max_waiters = max(self._max_waiters, self._waiters[key])
+        return await asyncio.shield(task)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Calls, computations actually run, calls that joined one in flight, and failures"""
+        return {
+            **self._counters,
+            "in_flight": len(self._inflight),
+            "max_coalesced_per_key": self._max_waiters,
+        }
+
+    def _release(self, key: str, task: asyncio.Task) -> None:
+        del self._inflight[key]
+        del self._waiters[key]
+        if task.cancelled() or task.exception() is not None:
+            self._counters["failed"] += 1
@@ -0,0 +1,49 @@
+"""
+Per-sutra difficulty figures produced by the panini-analytics command
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_REPORT_PATH = "backend/sutra_report.json"
+REPORT_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+class SutraReport:
+    """Read-only view of an analytics report"""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        data = data or {}
+        self.sutras: Dict[str, Dict[str, Any]] = data.get("sutras", {})
+        self.levels: Dict[str, Dict[str, Any]] = data.get("levels", {})
+        self.global_error_rate: Optional[float] = data.get("global_error_rate")
+        self.answers: int = data.get("answers", 0)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_REPORT_PATH) -> "SutraReport":
+        """Load a report; a missing or outdated file gives an empty report"""
+        report_path = Path(path)
+        if not report_path.exists():
+            return cls()
+        data = json.loads(report_path.read_text(encoding="utf-8"))
+        if data.get("version") != REPORT_VERSION:
+            logger.warning("Ignoring analytics report %s: version %s != %s", path, data.get("version"), REPORT_VERSION)
+            return cls()
+        return cls(data)
+
+    def __len__(self) -> int:
+        return len(self.sutras)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.sutras
+
+    def error_rate(self, code: str, default: float = 0.0) -> float:
+        """Smoothed error rate of a sutra, falling back to the global rate, then default"""
+        figures = self.sutras.get(code)
+        if figures is not None:
+            return figures["smoothed_error_rate"]
+        return self.global_error_rate if self.global_error_rate is not None else default
@@ -2,48 +2,143 @@
 Service layer for word-related business logic
 """
 
-from typing import  Optional
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import  Any, Dict, Optional
 import random
 
-from vidyut.prakriya import Vyakarana,Dhatu,Pada, Lakara, Prayoga, Purusha, Vacana, Prakriya, Linga, Vibhakti , Gana
+from vidyut.prakriya import Vyakarana,Dhatu,Pada, Lakara, Prayoga, Purusha, Vacana, Prakriya, Linga, Vibhakti , Gana, Pratipadika
 from vidyut.kosha import Kosha, DhatuEntry
 
+from .dhatu_table import DhatuTable
+from .pratipadika_pool import PratipadikaPool
+from .singleflight import SingleFlight
+
+# Derivations kept by WordService._derive, oldest evicted first
+DERIVATION_CACHE_SIZE = 4096
+
 class WordService:
     """Service for word-related operations"""
-    def __init__(self, kosha:Kosha ):
+    def __init__(self, kosha:Kosha, derive_workers: Optional[int] = None):
         self._v = Vyakarana()
         self.kosha:list[DhatuEntry] = list(kosha.dhatus())
-        self.kosha_begginer = list(filter(lambda d:  (d.dhatu.gana in [Gana.Bhvadi, Gana.Divadi, Gana.Tudadi, Gana.Curadi]) and d.dhatu.sanadi == [] and d.dhatu.prefixes==[] , self.kosha))
+        self.table = DhatuTable(self.kosha)
+        self.kosha_begginer = [self.kosha[i] for i in self.table.select("beginner")]
+        self.pratipadikas = PratipadikaPool(kosha)
+        self._derivations: "OrderedDict[str, list[Prakriya]]" = OrderedDict()
+        # The cache is also touched from worker threads (daily challenge preparation)
+        self._derivations_lock = threading.Lock()
+        self._cache_counters = {"cache_hits": 0, "cache_misses": 0}
+        self._flights = SingleFlight()
+        # Derivations get their own threads, so they cannot starve other to_thread work
+        self._executor = ThreadPoolExecutor(max_workers=derive_workers, thread_name_prefix="derive")
     
-    def get_random_dhatu(self, level:str) -> Optional[Dhatu]:
-        """ Get a random root word (dhatu) for gameplay """
-        if level not in ["beginner", "expert"]:
+    def get_dhatus(self, level: str) -> list[DhatuEntry]:
+        """ Dhatus playable at a difficulty level """
+        if level == "beginner":
+            return self.kosha_begginer
+        elif level == "expert":
+            return self.kosha
+        else:
             raise ValueError(f"Invalid level: {level}")
+
+    def get_random_dhatu(self, level:str, ganas: Optional[list[str]] = None, prefixes: Optional[bool] = None, sanadi: Optional[list[str]] = None) -> Optional[Dhatu]:
+        """ Get a random root word (dhatu) for gameplay, optionally filtered by gana, prefixes and sanadi """
+        candidates = self.table.select(level, ganas=ganas, prefixes=prefixes, sanadi=sanadi)
+        if len(candidates) == 0:
+            raise ValueError("No dhatu matches the requested filters")
+        return self.kosha[candidates[random.randrange(len(candidates))]].dhatu
+
+    def get_tinanta_options(self, level: str) -> dict[str, list]:
+        """ Prayoga, lakara, purusha and vacana values used at a difficulty level """
         if level == "beginner":
-            # For beginner level, return a simple dhatu
-            return random.choice(self.kosha_begginer).dhatu
+            return {
+                "prayoga": [Prayoga.Kartari],
+                "lakara": [Lakara.Lat],
+                "purusha": Purusha.choices(),
+                "vacana": [Vacana.Eka, Vacana.Bahu],
+            }
         elif level == "expert":
-            return random.choice(self.kosha).dhatu
+            return {
+                "prayoga": Prayoga.choices(),
+                "lakara": Lakara.choices(),
+                "purusha": Purusha.choices(),
+                "vacana": Vacana.choices(),
+            }
         else:
             raise ValueError(f"Invalid level: {level}")
-    def get_random_prakriya(self, dhatu, level: str) -> Optional[Prakriya]:
+
+    def derive_tinanta(self, dhatu, prayoga, lakara, purusha, vacana) -> list[Prakriya]:
+        """ All derivations of one tinanta form """
+        return self._derive(Pada.Tinanta, dhatu=dhatu, prayoga=prayoga, lakara=lakara, purusha=purusha, vacana=vacana)
+
+    def derive_subanta(self, pratipadika, linga, vibhakti, vacana) -> list[Prakriya]:
+        """ All derivations of one subanta form """
+        return self._derive(Pada.Subanta, pratipadika=pratipadika, linga=linga, vibhakti=vibhakti, vacana=vacana)
+
+    def metrics(self) -> Dict[str, Any]:
+        """ Derivation cache hits and misses, and how many misses shared an in-flight derivation """
+        return {**self._cache_counters, "cached": len(self._derivations), **self._flights.metrics()}
+
+    def _derive(self, pada, **args) -> list[Prakriya]:
+        """ Derive through an LRU cache keyed by the form's arguments """
+        key = self._derivation_key(pada, args)
+        prakriyas = self._cached(key)
+        if prakriyas is None:
+            prakriyas = self._v.derive(pada(**args))
+            self._store(key, prakriyas)
+        return prakriyas
+
+    async def _derive_async(self, pada, **args) -> list[Prakriya]:
+        """ Derive on a derivation thread; concurrent misses for one form share a single derivation """
+        key = self._derivation_key(pada, args)
+        prakriyas = self._cached(key)
+        if prakriyas is None:
+            prakriyas = await self._flights.do(key, partial(self.run_in_executor, self._v.derive, pada(**args)))
+            self._store(key, prakriyas)
+        return prakriyas
+
+    async def run_in_executor(self, fn, *args):
+        """ Run blocking vidyut work on the derivation threads rather than the default pool """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args))
+
+    @staticmethod
+    def _derivation_key(pada, args: Dict[str, Any]) -> str:
+        # vidyut objects are unhashable, but their reprs spell out every field
+        return pada.__name__ + "|" + "|".join(f"{name}={value!r}" for name, value in args.items())
+
+    def _cached(self, key: str) -> Optional[list[Prakriya]]:
+        with self._derivations_lock:
+            prakriyas = self._derivations.get(key)
+            if prakriyas is None:
+                self._cache_counters["cache_misses"] += 1
+                return None
+            self._cache_counters["cache_hits"] += 1
+            self._derivations.move_to_end(key)
+            return prakriyas
+
+    def _store(self, key: str, prakriyas: list[Prakriya]) -> None:
+        with self._derivations_lock:
+            self._derivations[key] = prakriyas
+            self._derivations.move_to_end(key)
+            if len(self._derivations) > DERIVATION_CACHE_SIZE:
+                self._derivations.popitem(last=False)
+
+    async def get_random_prakriya(self, dhatu, level: str) -> Optional[Prakriya]:
         # TODO: Implement logic to fetch a random dhatu or pratipadika
-        return self.get_random_tinanta_prakriya(dhatu, level)
+        return await self.get_random_tinanta_prakriya(dhatu, level)
 
-    def get_random_tinanta_prakriya(self, dhatu, level: str) -> Optional[Prakriya]:
+    async def get_random_tinanta_prakriya(self, dhatu, level: str) -> Optional[Prakriya]:
         """ Get a random prakriya (word parsing) for gameplay """
         prayoga = self._get_random_prayoaga(level)
         lakara = self._get_random_lakara(level)
         purusha = self._get_random_purusha(level)
         vacana =  self._get_random_vacana(level)
         print(f"Generating prakriya for dhatu: {dhatu}, prayoga: {prayoga}, lakara: {lakara}, purusha: {purusha}, vacana: {vacana}")
-        prakriyas = self._v.derive(Pada.Tinanta(
-            dhatu=dhatu,
-            prayoga=prayoga,
-            lakara=lakara,
-            purusha=purusha,
-            vacana=vacana
-        ))
+        prakriyas = await self._derive_async(Pada.Tinanta, dhatu=dhatu, prayoga=prayoga, lakara=lakara, purusha=purusha, vacana=vacana)
         if len(prakriyas) == 0:
             return None
         if len(prakriyas) > 1:
@@ -51,41 +146,28 @@ class WordService:
         return prakriyas[0]
     def _get_random_prayoaga(self, level: str) -> Prayoga:
         """ Get a random prayoga based on difficulty level """
-        if level == "beginner":
-            return Prayoga.Kartari
-        elif level == "expert":
-            return random.choice(Prayoga.choices())
-        else:
-            raise ValueError(f"Invalid level: {level}")
+        return random.choice(self.get_tinanta_options(level)["prayoga"])
     def _get_random_lakara(self, level: str) -> Lakara:
         """ Get a random lakara based on difficulty level """
-        if level == "beginner":
-            return Lakara.Lat
-        elif level == "expert":
-            return random.choice(Lakara.choices())
-        else:
-            raise ValueError(f"Invalid level: {level}")
+        return random.choice(self.get_tinanta_options(level)["lakara"])
     def _get_random_purusha(self, level: str) -> Purusha:
         return random.choice(Purusha.choices())
     def _get_random_vacana(self, level: str) -> Vacana:
         """ Get a random vacana based on difficulty level """
-        if level == "beginner":
-            return random.choice([Vacana.Eka, Vacana.Bahu])
-        elif level == "expert":
-            return random.choice(Vacana.choices())
-        else:
-            raise ValueError(f"Invalid level: {level}")
+        return random.choice(self.get_tinanta_options(level)["vacana"])
     
-    def get_random_subanta_prakriya(self, pratipadika) -> Optional[Prakriya]:
-        linga = random.choice(Linga.choices())
+    async def get_random_pratipadika(self) -> tuple[Pratipadika, list[Linga]]:
+        """ Get a random stem (pratipadika) and the lingas it takes """
+        if not self.pratipadikas.built:
+            # The first call packs the whole kosha; do it once, on a derivation thread
+            await self._flights.do("pratipadika-pool", partial(self.run_in_executor, self.pratipadikas.build))
+        return self.pratipadikas.sample()
+
+    async def get_random_subanta_prakriya(self, pratipadika, lingas: Optional[list[Linga]] = None) -> Optional[Prakriya]:
+        linga = random.choice(lingas or Linga.choices())
         vibhakti = random.choice(Vibhakti.choices())
         vacana = random.choice(Vacana.choices())
-        prakriyas =  self._v.derive(Pada.Subanta(
-            pratipadika=pratipadika,
-            linga=linga,
-            vibhakti=vibhakti,
-            vacana=vacana
-        ))
+        prakriyas = await self._derive_async(Pada.Subanta, pratipadika=pratipadika, linga=linga, vibhakti=vibhakti, vacana=vacana)
         if len(prakriyas) == 0:
             return None
         if len(prakriyas) > 1:
@@ -1 +1,6 @@
-# CLI module for Panini Parser
\ No newline at end of file
+# CLI module for Panini Parser
+
+from pathlib import Path
+
+# Per-user data, cache and socket directory
+PANINI_HOME = Path.home() / ".panini-parser"
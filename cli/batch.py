@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Batch processing helpers for running Vidyut over large inputs
+"""
+
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import batched
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple, TypeVar
+
+from rich.console import Console
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_worker_options: Dict[str, bool] = {}
+
+
+def _status_to_stderr() -> None:
+    """Send Vidyut status messages to stderr; stdout carries the JSON lines output"""
+    from . import vidyut_service
+
+    vidyut_service.console = Console(stderr=True)
+
+
+def init_worker(components: Tuple[str, ...] = ("kosha",), transliterate: bool = False) -> None:
+    """Initialize the per-process Vidyut service used by batch workers"""
+    from .vidyut_service import get_vidyut_service
+
+    _status_to_stderr()
+    get_vidyut_service().initialize(components)
+    _worker_options["transliterate"] = transliterate
+
+
+def parse_chunk(
+    words: Tuple[str, ...], vidyut: Optional[Any] = None, transliterate: Optional[bool] = None
+) -> List[Dict[str, any]]:
+    """Parse a chunk of words, by default with this process's service and worker options"""
+    if vidyut is None:
+        from .vidyut_service import get_vidyut_service
+
+        vidyut = get_vidyut_service()
+    if transliterate is None:
+        transliterate = _worker_options.get("transliterate", False)
+    results = []
+    for word in words:
+        info = vidyut.get_word_info(word)
+        if transliterate:
+            info["iast"] = vidyut.transliterate(word, "devanagari", "iast")
+        results.append(info)
+    return results
+
+
+def segment_chunk(
+    chunk: "TextChunk", segment: Optional[Callable[[str], List[Dict[str, str]]]] = None
+) -> List[Dict[str, any]]:
+    """Segment every line of a text chunk, by default with this process's Cheda"""
+    if segment is None:
+        from .vidyut_service import get_vidyut_service
+
+        segment = get_vidyut_service().segment
+    return [
+        {"text": line, "tokens": segment(line)}
+        for line in chunk.lines
+    ]
+
+
+def iter_words(stream: TextIO) -> Iterator[str]:
+    """Yield whitespace-separated words from a text stream, line by line"""
+    for line in stream:
+        yield from line.split()
+
+
+def run_pipeline(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    workers: int,
+    ordered: bool = True,
+    max_pending: Optional[int] = None,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: tuple = (),
+) -> Iterator[Tuple[T, R]]:
+    """
+    Apply func to items across a process pool, yielding (item, result) pairs.
+
+    At most max_pending items are in flight at once, so memory stays bounded
+    no matter how long the input is. Results come back in input order when
+    ordered is True, otherwise as soon as each one completes.
+    """
+    if workers <= 1:
+        if initializer:
+            initializer(*initargs)
+        for item in items:
+            yield item, func(item)
+        return
+
+    max_pending = max_pending or workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        if ordered:
+            queue = deque()
+            for item in items:
+                if len(queue) >= max_pending:
+                    done_item, future = queue.popleft()
+                    yield done_item, future.result()
+                queue.append((item, pool.submit(func, item)))
+            while queue:
+                done_item, future = queue.popleft()
+                yield done_item, future.result()
+        else:
+            pending = {}
+            for item in items:
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+                pending[pool.submit(func, item)] = item
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+
+
+def parse_words_to_jsonl(
+    words: Iterable[str],
+    output: TextIO = sys.stdout,
+    workers: int = 1,
+    chunk_size: int = 256,
+    ordered: bool = True,
+    transliterate: bool = False,
+    vidyut: Optional[Any] = None,
+) -> int:
+    """
+    Parse words in chunks across workers and write one JSON object per line.
+
+    Given vidyut (say, a daemon connection), words go through it in this
+    process instead of through worker processes that each load Kosha.
+    """
+    count = 0
+    chunks = batched(words, chunk_size)
+    if vidyut is not None:
+        # The connection may fail over to a local service that loads Kosha
+        _status_to_stderr()
+        results = run_pipeline(partial(parse_chunk, vidyut=vidyut, transliterate=transliterate), chunks, workers=1)
+    else:
+        results = run_pipeline(
+            parse_chunk,
+            chunks,
+            workers=workers,
+            ordered=ordered,
+            initializer=init_worker,
+            initargs=(("kosha", "lipi") if transliterate else ("kosha",), transliterate),
+        )
+    for _, infos in results:
+        for info in infos:
+            output.write(json.dumps(info, ensure_ascii=False) + "\n")
+        count += len(infos)
+    output.flush()
+    return count
+
+
+class TextChunk(NamedTuple):
+    """A run of complete lines read from a byte range of the input"""
+    start: int
+    end: int
+    lines: Tuple[str, ...]
+
+
+def iter_text_chunks(stream: BinaryIO, chunk_bytes: int, start: int = 0) -> Iterator[TextChunk]:
+    """
+    Read a binary stream in chunks of roughly chunk_bytes, split on line breaks.
+
+    Chunks always end on a line boundary so no word is cut in half, and their
+    byte offsets let a later run resume exactly after the last written chunk.
+    """
+    offset = start
+    lines: List[str] = []
+    size = 0
+    for raw in stream:
+        size += len(raw)
+        line = raw.decode("utf-8").strip()
+        if line:
+            lines.append(line)
+        if size >= chunk_bytes:
+            yield TextChunk(offset, offset + size, tuple(lines))
+            offset += size
+            lines = []
+            size = 0
+    if size:
+        yield TextChunk(offset, offset + size, tuple(lines))
+
+
+class Checkpoint(NamedTuple):
+    """Resume point for an interrupted segmentation run"""
+    input_offset: int
+    output_offset: int
+    chunks: int
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["Checkpoint"]:
+        if not path.exists():
+            return None
+        with open(path, encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    def save(self, path: Path) -> None:
+        # Write then rename so a crash never leaves a half-written checkpoint.
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._asdict(), f)
+        os.replace(tmp_path, path)
+
+
+def segment_file(
+    input_path: Path,
+    output_path: Path,
+    workers: int = 1,
+    chunk_bytes: int = 1 << 20,
+    max_pending: Optional[int] = None,
+    resume: bool = False,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    segment: Optional[Callable[[str], List[Dict[str, str]]]] = None,
+) -> Checkpoint:
+    """
+    Segment a large text file with Cheda and append JSON lines to output_path.
+
+    Chunks are written in input order as soon as they are ready, and a
+    checkpoint next to the output records how far the run got. With resume,
+    the output is truncated to the last checkpoint and the input is read from
+    the matching offset. on_progress receives (input offset, chunks written).
+    Given segment (say, a daemon connection's), lines go through it in this
+    process instead of through worker processes that each load Cheda.
+    """
+    checkpoint_path = output_path.with_name(output_path.name + ".checkpoint")
+    checkpoint = Checkpoint.load(checkpoint_path) if resume else None
+    if checkpoint is None:
+        checkpoint = Checkpoint(input_offset=0, output_offset=0, chunks=0)
+
+    with open(input_path, "rb") as source, open(output_path, "a+b") as sink:
+        source.seek(checkpoint.input_offset)
+        sink.truncate(checkpoint.output_offset)
+        sink.seek(checkpoint.output_offset)
+
+        chunks = iter_text_chunks(source, chunk_bytes, start=checkpoint.input_offset)
+        if segment is not None:
+            results = run_pipeline(partial(segment_chunk, segment=segment), chunks, workers=1)
+        else:
+            results = run_pipeline(
+                segment_chunk,
+                chunks,
+                workers=workers,
+                ordered=True,
+                max_pending=max_pending,
+                initializer=init_worker,
+                initargs=(("cheda",),),
+            )
+        for chunk, records in results:
+            for record in records:
+                sink.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+            sink.flush()
+            checkpoint = Checkpoint(
+                input_offset=chunk.end,
+                output_offset=sink.tell(),
+                chunks=checkpoint.chunks + 1,
+            )
+            checkpoint.save(checkpoint_path)
+            if on_progress:
+                on_progress(checkpoint.input_offset, checkpoint.chunks)
+
+    return checkpoint
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for Vidyut lookups shared across CLI invocations
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class WordCache:
+    """
+    Size-bounded SQLite cache keyed by (kind, key).
+
+    Entries are tied to a data version: opening the cache with a different
+    version drops everything, so results never outlive the Vidyut data they
+    came from. When the cache grows past max_entries, the least recently used
+    entries are evicted.
+
+    Hits only note the time in memory. The times are written in one batch
+    once EVICT_CHECK_INTERVAL keys are pending, before eviction and on
+    close, so a hit does not write to the database.
+    A lookup that hits a database error (say, a locked or corrupt file) is
+    treated as a miss, and a store that hits one is dropped.
+    """
+
+    # How often (in writes) to check whether eviction is needed
+    EVICT_CHECK_INTERVAL = 256
+
+    def __init__(self, path: Path, data_version: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.data_version = data_version
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        # (kind, key) -> last hit time, not yet written to entries.last_used
+        self._touched: Dict[Tuple[str, str], float] = {}
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # The daemon shares one cache between handler threads, serialized by its own lock
+        self._conn = sqlite3.connect(str(path), timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        if self._get_meta("data_version") != data_version:
+            self.clear()
+            self._set_meta("data_version", data_version)
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss"""
+        try:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            value = json.loads(row[0]) if row is not None else None
+        except (sqlite3.Error, ValueError):
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched[(kind, key)] = time.time()
+        if len(self._touched) >= self.EVICT_CHECK_INTERVAL:
+            try:
+                self.flush_touched()
+            except sqlite3.Error:
+                pass
+        return value
+
+    def put(self, kind: str, key: str, value: Any) -> None:
+        """Store a JSON-serializable value; a failed write is dropped"""
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (kind, key, value, last_used) VALUES (?, ?, ?, ?)",
+                (kind, key, json.dumps(value, ensure_ascii=False), time.time()),
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_CHECK_INTERVAL == 0:
+                self.evict()
+        except sqlite3.Error:
+            pass
+
+    def flush_touched(self) -> None:
+        """Write the pending hit times to entries.last_used in one transaction"""
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE entries SET last_used = ? WHERE kind = ? AND key = ?",
+                [(used, kind, key) for (kind, key), used in touched.items()],
+            )
+
+    def evict(self) -> int:
+        """Drop least recently used entries beyond max_entries"""
+        self.flush_touched()
+        count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+        self._conn.execute(
+            "DELETE FROM entries WHERE (kind, key) IN "
+            "(SELECT kind, key FROM entries ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        return excess
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters"""
+        self._touched.clear()
+        self._conn.execute("DELETE FROM entries")
+        self._conn.execute("DELETE FROM meta WHERE name IN ('hits', 'misses')")
+        self.hits = 0
+        self.misses = 0
+
+    def flush_stats(self) -> None:
+        """Add this process's hit/miss counters to the persisted totals"""
+        if not self.hits and not self.misses:
+            return
+        with self._conn:
+            for name, delta in (("hits", self.hits), ("misses", self.misses)):
+                self._conn.execute(
+                    "INSERT INTO meta (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = CAST(value AS INTEGER) + excluded.value",
+                    (name, str(delta)),
+                )
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        self.flush_stats()
+        by_kind = dict(self._conn.execute("SELECT kind, COUNT(*) FROM entries GROUP BY kind").fetchall())
+        hits = int(self._get_meta("hits") or 0)
+        misses = int(self._get_meta("misses") or 0)
+        lookups = hits + misses
+        return {
+            "path": str(self.path),
+            "data_version": self.data_version,
+            "entries": sum(by_kind.values()),
+            "max_entries": self.max_entries,
+            "by_kind": by_kind,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / lookups * 100) if lookups else 0.0,
+            "size_bytes": self.path.stat().st_size if self.path.exists() else 0,
+        }
+
+    def close(self) -> None:
+        """Persist hit times and counters and close the database"""
+        try:
+            self.flush_touched()
+            self.flush_stats()
+        except sqlite3.Error:
+            pass
+        self._conn.close()
+
+    def _get_meta(self, name: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, name: str, value: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
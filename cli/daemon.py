@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Resident daemon that keeps Vidyut data loaded between CLI invocations
+"""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .vidyut_service import PANINI_HOME, VidyutService, get_vidyut_service
+
+# Service methods that clients may call over the socket
+DAEMON_METHODS = ("get_word_info", "transliterate", "segment")
+# Seconds a client waits for one reply before giving up on the daemon
+CALL_TIMEOUT = float(os.environ.get("PANINI_DAEMON_TIMEOUT", "30"))
+
+
+def socket_path() -> Path:
+    """Socket location, overridable with PANINI_SOCKET"""
+    return Path(os.environ.get("PANINI_SOCKET", PANINI_HOME / "daemon.sock"))
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answer newline-delimited JSON requests until the client disconnects"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                method = request["method"]
+                if method == "ping":
+                    response = {"result": "pong"}
+                elif method in DAEMON_METHODS:
+                    with self.server.lock:
+                        result = getattr(self.server.service, method)(**request.get("params", {}))
+                    response = {"result": result}
+                else:
+                    response = {"error": f"Unknown method: {method}"}
+            except Exception as e:
+                response = {"error": str(e)}
+            self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class VidyutDaemon(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server holding one initialized VidyutService"""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, service: VidyutService):
+        self.path = path
+        self.service = service
+        # Vidyut objects and the SQLite cache are shared by all handler threads
+        self.lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            client = DaemonClient.connect(path)
+            if client is not None:
+                client.close()
+                raise RuntimeError(f"A daemon is already listening on {path}")
+            path.unlink()  # Stale socket from a daemon that did not shut down cleanly
+        super().__init__(str(path), _RequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        if self.path.exists():
+            self.path.unlink()
+
+
+class DaemonClient:
+    """Connection to a running daemon"""
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self._file = sock.makefile("rwb")
+
+    @classmethod
+    def connect(
+        cls, path: Optional[Path] = None, timeout: float = 0.2, call_timeout: Optional[float] = None
+    ) -> Optional["DaemonClient"]:
+        """Connect to the daemon, or return None if none is running"""
+        path = path or socket_path()
+        if not path.exists():
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            # A hung daemon makes reads time out instead of blocking forever
+            sock.settimeout(CALL_TIMEOUT if call_timeout is None else call_timeout)
+        except OSError:
+            sock.close()
+            return None
+        return cls(sock)
+
+    def call(self, method: str, **params) -> Any:
+        """
+        Send one request and wait for its result.
+
+        Raises OSError (including ConnectionError and socket timeouts) or
+        ValueError for a broken connection, RuntimeError for an error
+        reported by the daemon.
+        """
+        request = {"method": method, "params": params}
+        self._file.write((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Daemon closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    def close(self):
+        try:
+            self._file.close()
+        except OSError:
+            pass  # Buffered writes to a daemon that is already gone
+        self._sock.close()
+
+
+class RemoteVidyutService:
+    """
+    VidyutService stand-in that forwards calls to the daemon.
+
+    If the daemon dies, hangs past the call timeout or sends garbage, the
+    call is repeated on a local VidyutService, and every later call stays
+    local.
+    """
+
+    def __init__(self, client: DaemonClient):
+        self._client: Optional[DaemonClient] = client
+        self._local: Optional[VidyutService] = None
+
+    def initialize(self, components=None) -> bool:
+        return True
+
+    def is_initialized(self) -> bool:
+        return True
+
+    def get_word_info(self, word: str) -> Dict[str, any]:
+        return self._call("get_word_info", word=word)
+
+    def transliterate(self, text: str, source_script: str = "devanagari", target_script: str = "iast") -> str:
+        return self._call(
+            "transliterate", text=text, source_script=source_script, target_script=target_script
+        )
+
+    def segment(self, text: str) -> List[Dict[str, str]]:
+        return self._call("segment", text=text)
+
+    def _call(self, method: str, **params) -> Any:
+        if self._client is not None:
+            try:
+                return self._client.call(method, **params)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Lost the Vidyut daemon ({e or type(e).__name__}); continuing in-process", file=sys.stderr)
+                self._client.close()
+                self._client = None
+        if self._local is None:
+            self._local = get_vidyut_service()
+        return getattr(self._local, method)(**params)
+
+
+def get_service():
+    """Use the daemon when one is running, otherwise a local VidyutService"""
+    if os.environ.get("PANINI_NO_DAEMON") != "1":
+        client = DaemonClient.connect()
+        if client is not None:
+            return RemoteVidyutService(client)
+    return get_vidyut_service()
@@ -3,25 +3,50 @@
 Panini Parser CLI - Sanskrit parsing game using Vidyut
 """
 
+import os
+import sys
 import typer
-from typing import Optional
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-from rich.table import Table
-from rich.prompt import Prompt, Confirm
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+# Heavier modules (rich, Vidyut, batch workers) are imported inside the
+# commands that use them so that startup stays within STARTUP_BUDGET_MS.
+# The budget covers the CLI's own work after the interpreter is up. Typer
+# (~50 ms) and rich's console and panel (~45 ms) are the floor for `info`,
+# so it cannot sit well under 100 ms; 150 ms leaves room for run-to-run noise.
+STARTUP_BUDGET_MS = 150
+
+
+class _LazyConsole:
+    """Stands in for a rich Console, importing and creating it on first use"""
+
+    def __init__(self, **options):
+        self._options = options
+        self._console = None
+
+    def get(self):
+        """The underlying Console, for rich widgets that need a real one"""
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console(**self._options)
+        return self._console
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
 
-from .vidyut_service import get_vidyut_service, ParsedWord
-from .word_database import get_word_database, Difficulty
 
 app = typer.Typer(help="Panini Parser - A Sanskrit parsing game using Vidyut engine")
-console = Console()
+console = _LazyConsole()
+err_console = _LazyConsole(stderr=True)
 
 
 @app.command()
 def setup():
     """Set up Vidyut data and test the installation"""
+    from rich.panel import Panel
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from .vidyut_service import get_vidyut_service
+    
     console.print(Panel.fit("🔧 Panini Parser Setup", style="bold blue"))
     
     vidyut = get_vidyut_service()
@@ -29,7 +54,7 @@ def setup():
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
-        console=console,
+        console=console.get(),
     ) as progress:
         task = progress.add_task("Initializing Vidyut...", total=None)
         success = vidyut.initialize()
@@ -56,18 +81,57 @@ def setup():
 
 @app.command()
 def parse(
-    word: str = typer.Argument(..., help="Sanskrit word to parse"),
-    transliterate: bool = typer.Option(False, "--transliterate", "-t", help="Show transliteration")
+    word: Optional[str] = typer.Argument(None, help="Sanskrit word to parse"),
+    transliterate: bool = typer.Option(False, "--transliterate", "-t", help="Show transliteration"),
+    input_file: Optional[str] = typer.Option(None, "--input", "-i", help="File of words to parse ('-' for stdin)"),
+    output_format: str = typer.Option("table", "--format", "-f", help="Output format: table or jsonl"),
+    ordered: bool = typer.Option(True, "--ordered/--unordered", help="Keep output in input order"),
+    workers: int = typer.Option(os.cpu_count() or 1, "--workers", "-w", help="Worker processes for --input"),
+    chunk_size: int = typer.Option(256, "--chunk-size", help="Words per worker task for --input")
 ):
-    """Parse a Sanskrit word using Vidyut"""
-    console.print(f"🔍 Parsing: [bold yellow]{word}[/bold yellow]")
+    """Parse a Sanskrit word (or a stream of words) using Vidyut"""
+    from rich.table import Table
+    from .batch import iter_words, parse_words_to_jsonl
+    from .daemon import RemoteVidyutService, get_service
+    from .word_database import get_word_database
     
-    vidyut = get_vidyut_service()
-    if not vidyut.is_initialized():
-        console.print("⚠️ Vidyut not initialized. Initializing now...")
-        if not vidyut.initialize():
-            console.print("❌ Failed to initialize Vidyut")
-            return
+    if output_format not in ("table", "jsonl"):
+        err_console.print(f"❌ Invalid format: {output_format}")
+        raise typer.Exit(1)
+
+    # Forwarded to `panini-cli serve` when it is running; otherwise Kosha and
+    # Cheda are loaded on first use, and not at all on a cache hit
+    vidyut = get_service()
+    # JSON lines go through the daemon too, rather than through workers that
+    # each load Kosha; a local service is left to the workers
+    remote = vidyut if isinstance(vidyut, RemoteVidyutService) else None
+
+    if input_file is not None:
+        if output_format != "jsonl":
+            err_console.print("❌ --input requires --format jsonl")
+            raise typer.Exit(1)
+        stream = sys.stdin if input_file == "-" else open(input_file, encoding="utf-8")
+        with stream:
+            count = parse_words_to_jsonl(
+                iter_words(stream),
+                workers=workers,
+                chunk_size=chunk_size,
+                ordered=ordered,
+                transliterate=transliterate,
+                vidyut=remote,
+            )
+        err_console.print(f"✅ Parsed {count} word(s)")
+        return
+
+    if word is None:
+        err_console.print("❌ Provide a word or --input")
+        raise typer.Exit(1)
+
+    if output_format == "jsonl":
+        parse_words_to_jsonl([word], transliterate=transliterate, vidyut=remote)
+        return
+
+    console.print(f"🔍 Parsing: [bold yellow]{word}[/bold yellow]")
     
     # Get comprehensive word info
     info = vidyut.get_word_info(word)
@@ -113,12 +177,92 @@ def parse(
         console.print()
 
 
+@app.command()
+def segment(
+    input_file: Path = typer.Argument(..., exists=True, dir_okay=False, help="Sanskrit text file to segment"),
+    output: Path = typer.Option(..., "--output", "-o", help="JSON lines file to write"),
+    workers: int = typer.Option(os.cpu_count() or 1, "--workers", "-w", help="Worker processes"),
+    chunk_kb: int = typer.Option(1024, "--chunk-kb", help="Approximate chunk size in KiB"),
+    max_pending: Optional[int] = typer.Option(None, "--max-pending", help="Chunks in flight (default: 2 per worker)"),
+    resume: bool = typer.Option(False, "--resume", help="Continue from the last checkpoint")
+):
+    """Segment a large Sanskrit text with Cheda, writing results incrementally"""
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+    from .batch import segment_file
+    from .daemon import RemoteVidyutService, get_service
+    
+    # A running daemon already has Cheda loaded, so send lines to it instead
+    # of starting workers that each load their own
+    vidyut = get_service()
+    remote = vidyut if isinstance(vidyut, RemoteVidyutService) else None
+    
+    total = input_file.stat().st_size
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        console=err_console.get(),
+    ) as progress:
+        task = progress.add_task("Segmenting...", total=total)
+        checkpoint = segment_file(
+            input_file,
+            output,
+            workers=workers,
+            chunk_bytes=chunk_kb * 1024,
+            max_pending=max_pending,
+            resume=resume,
+            on_progress=lambda offset, chunks: progress.update(
+                task, completed=offset, description=f"Segmenting... ({chunks} chunks)"
+            ),
+            segment=remote.segment if remote else None,
+        )
+    
+    err_console.print(f"✅ Segmented {checkpoint.chunks} chunk(s) into {output}")
+
+
+@app.command()
+def serve(
+    socket: Optional[Path] = typer.Option(None, "--socket", help="Socket path (default: ~/.panini-parser/daemon.sock or $PANINI_SOCKET)")
+):
+    """Keep Vidyut loaded in a daemon that other commands forward to"""
+    import signal
+    from .daemon import VidyutDaemon, socket_path
+    from .vidyut_service import get_vidyut_service
+    
+    path = socket or socket_path()
+    vidyut = get_vidyut_service()
+    if not vidyut.initialize():
+        console.print("❌ [red]Failed to initialize Vidyut[/red]")
+        raise typer.Exit(1)
+    
+    try:
+        server = VidyutDaemon(path, vidyut)
+    except RuntimeError as e:
+        console.print(f"❌ [red]{e}[/red]")
+        raise typer.Exit(1)
+    
+    # Exit through the context manager on SIGTERM so the socket is removed
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    console.print(f"🛰️ Daemon listening on [bold]{path}[/bold] (Ctrl+C to stop)")
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            console.print("\n👋 Daemon stopped")
+
+
 @app.command()
 def play(
     difficulty: str = typer.Option("beginner", help="Difficulty: beginner, intermediate, advanced, expert"),
     rounds: int = typer.Option(5, help="Number of rounds to play")
 ):
     """Start the Sanskrit parsing game"""
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+    from .daemon import get_service
+    from .word_database import get_word_database, Difficulty
+    
     console.print(Panel.fit("🎮 Panini Parser Game", style="bold blue"))
     
     # Parse difficulty
@@ -135,7 +279,7 @@ def play(
         return
     
     # Initialize services
-    vidyut = get_vidyut_service()
+    vidyut = get_service()
     db = get_word_database()
     
     console.print(f"🎯 Difficulty: [bold]{difficulty.title()}[/bold]")
@@ -196,6 +340,9 @@ def search(
     limit: int = typer.Option(10, help="Maximum results to show")
 ):
     """Search for Sanskrit words"""
+    from rich.table import Table
+    from .word_database import get_word_database
+    
     console.print(f"🔍 Searching for: [bold]{query}[/bold]")
     
     db = get_word_database()
@@ -227,6 +374,9 @@ def search(
 @app.command()
 def stats():
     """Show word database statistics"""
+    from rich.table import Table
+    from .word_database import get_word_database
+    
     db = get_word_database()
     stats = db.get_stats()
     
@@ -243,9 +393,127 @@ def stats():
     console.print(table)
 
 
+cache_app = typer.Typer(help="Manage the on-disk lookup cache")
+app.add_typer(cache_app, name="cache")
+
+
+@cache_app.command("stats")
+def cache_stats():
+    """Show lookup cache statistics"""
+    from rich.table import Table
+    from .vidyut_service import get_vidyut_service
+    
+    cache = get_vidyut_service().get_cache()
+    if cache is None:
+        console.print("❌ Cache is not available")
+        return
+    stats = cache.stats()
+    
+    table = Table(title="🗄️ Lookup Cache Statistics")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="yellow", justify="right")
+    
+    table.add_row("Path", stats["path"])
+    table.add_row("Data Version", stats["data_version"])
+    table.add_row("Entries", f"{stats['entries']} / {stats['max_entries']}")
+    for kind, count in sorted(stats["by_kind"].items()):
+        table.add_row(f"  {kind.title()}", str(count))
+    table.add_row("Hits", str(stats["hits"]))
+    table.add_row("Misses", str(stats["misses"]))
+    table.add_row("Hit Rate", f"{stats['hit_rate']:.1f}%")
+    table.add_row("Size", f"{stats['size_bytes'] / 1024:.1f} KiB")
+    
+    console.print(table)
+
+
+@cache_app.command("clear")
+def cache_clear():
+    """Remove all cached lookups"""
+    from .vidyut_service import get_vidyut_service
+    
+    cache = get_vidyut_service().get_cache()
+    if cache is None:
+        console.print("❌ Cache is not available")
+        return
+    cache.clear()
+    console.print("✅ [green]Cache cleared[/green]")
+
+
+# Child process for `startup`: times the CLI from import to exit, leaving out
+# interpreter start and site hooks, which the CLI does not control
+_TIMED_RUN = """
+import sys, time
+start = time.perf_counter()
+sys.argv = ["panini-cli", *sys.argv[1:]]
+import cli.main
+try:
+    cli.main.app()
+except SystemExit:
+    pass
+sys.stderr.write(f"\\n{(time.perf_counter() - start) * 1000}")
+"""
+
+
+@app.command()
+def startup(
+    command: str = typer.Option("info", help="Command line to time, e.g. 'info' or 'stats'"),
+    runs: int = typer.Option(5, help="Number of timed runs")
+):
+    """Measure CLI startup time against the budget"""
+    import subprocess
+    import time
+    from rich.table import Table
+    
+    def run_ms() -> Tuple[float, float]:
+        """Wall time of one run, and the CLI's share of it as timed by the child"""
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", _TIMED_RUN, *command.split()], capture_output=True, text=True
+        )
+        wall = (time.perf_counter() - start) * 1000
+        return wall, float(result.stderr.rsplit("\n", 1)[-1])
+    
+    walls, timings = zip(*(run_ms() for _ in range(runs)))
+    
+    # `python -X importtime` reports "self | cumulative | module" in microseconds;
+    # unindented module names are the top-level imports.
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import cli.main"],
+        capture_output=True, text=True
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            imports.append((int(cumulative) / 1000, name.strip()))
+    imports.sort(reverse=True)
+    
+    best = min(timings)
+    table = Table(title=f"⏱️ Startup: panini-cli {command}")
+    table.add_column("Measure", style="cyan")
+    table.add_column("ms", style="yellow", justify="right")
+    table.add_row("Best wall time", f"{min(walls):.1f}")
+    table.add_row("Best CLI time", f"{best:.1f}")
+    table.add_row("Median CLI time", f"{sorted(timings)[len(timings) // 2]:.1f}")
+    table.add_row("Budget", str(STARTUP_BUDGET_MS))
+    for ms, name in imports[:8]:
+        table.add_row(f"  import {name}", f"{ms:.1f}")
+    console.print(table)
+    
+    if best > STARTUP_BUDGET_MS:
+        console.print(f"❌ [red]Over budget by {best - STARTUP_BUDGET_MS:.1f} ms[/red]")
+        raise typer.Exit(1)
+    console.print("✅ [green]Within budget[/green]")
+
+
 @app.command()
 def info():
     """Show information about Panini Parser"""
+    from rich.panel import Panel
+    from rich.text import Text
+    
     info_text = Text()
     info_text.append("Panini Parser\n", style="bold blue")
     info_text.append("A Sanskrit parsing game using the Vidyut parser engine\n\n")
@@ -253,8 +521,12 @@ def info():
     info_text.append("  setup     - Initialize Vidyut data\n")
     info_text.append("  play      - Start the parsing game\n")
     info_text.append("  parse     - Parse a specific word\n")
+    info_text.append("  segment   - Segment a large text with Cheda\n")
+    info_text.append("  serve     - Keep Vidyut loaded for other commands\n")
     info_text.append("  search    - Search for words\n")
-    info_text.append("  stats     - Show database statistics\n\n")
+    info_text.append("  stats     - Show database statistics\n")
+    info_text.append("  cache     - Show or clear the lookup cache\n")
+    info_text.append("  startup   - Measure startup time against the budget\n\n")
     info_text.append("Vidyut Repository: https://github.com/ambuda-org/vidyut\n", style="dim")
     
     console.print(Panel(info_text, title="About Panini Parser", border_style="green"))
@@ -262,6 +534,8 @@ def info():
 
 def display_word_info(word_data, show_transliteration: bool = False):
     """Display detailed word information"""
+    from rich.table import Table
+    
     table = Table(show_header=False, box=None)
     table.add_column("Field", style="cyan")
     table.add_column("Value", style="white")
@@ -3,15 +3,22 @@
 Vidyut Sanskrit parser service wrapper for CLI
 """
 
+import atexit
 import os
 import tempfile
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from rich.console import Console
 
+from . import PANINI_HOME
+from .cache import WordCache
+
 console = Console()
 
+# Vidyut components that can be loaded independently
+COMPONENTS = ("kosha", "cheda", "lipi")
+
 @dataclass
 class ParsedWord:
     """Represents a parsed Sanskrit word"""
@@ -31,26 +38,29 @@ class ParsedWord:
 class VidyutService:
     """Service for interacting with Vidyut Sanskrit parser"""
     
-    def __init__(self):
-        self.data_path: Optional[Path] = None
+    def __init__(self, use_cache: bool = True):
+        self.data_path: Path = PANINI_HOME / "vidyut-data"
         self.kosha = None
         self.cheda = None
         self.lipi = None
         self._initialized = False
+        self._attempted: set[str] = set()
+        self._use_cache = use_cache
+        self._cache: Optional[WordCache] = None
         
-    def initialize(self) -> bool:
-        """Initialize Vidyut with data download"""
+    def initialize(self, components: Tuple[str, ...] = COMPONENTS) -> bool:
+        """Initialize Vidyut with data download, loading only the requested components"""
+        self._attempted.update(components)
         try:
             import vidyut
             
             # Create data directory in user's home
-            home_dir = Path.home()
-            self.data_path = home_dir / ".panini-parser" / "vidyut-data"
             self.data_path.mkdir(parents=True, exist_ok=True)
             
             # Check if data already exists
             kosha_path = self.data_path / "kosha"
-            if not kosha_path.exists():
+            needs_data = "kosha" in components or "cheda" in components
+            if needs_data and not kosha_path.exists():
                 console.print("📥 Downloading Vidyut data (first time setup)...")
                 try:
                     vidyut.download_data(str(self.data_path))
@@ -60,33 +70,36 @@ class VidyutService:
                     # Continue anyway, maybe data exists in another location
             
             # Initialize modules with error handling
-            try:
-                from vidyut.kosha import Kosha
-                if kosha_path.exists():
-                    self.kosha = Kosha(str(kosha_path))
-                    console.print("✅ Kosha (dictionary) initialized")
-                else:
-                    console.print("⚠️ Kosha data not found, using fallback mode")
-            except Exception as e:
-                console.print(f"⚠️ Kosha initialization failed: {e}")
+            if "kosha" in components and self.kosha is None:
+                try:
+                    from vidyut.kosha import Kosha
+                    if kosha_path.exists():
+                        self.kosha = Kosha(str(kosha_path))
+                        console.print("✅ Kosha (dictionary) initialized")
+                    else:
+                        console.print("⚠️ Kosha data not found, using fallback mode")
+                except Exception as e:
+                    console.print(f"⚠️ Kosha initialization failed: {e}")
             
             # Try to initialize cheda if available
-            try:
-                from vidyut.cheda import Cheda
-                cheda_path = self.data_path / "cheda"
-                if cheda_path.exists():
-                    self.cheda = Cheda(str(cheda_path))
-                    console.print("✅ Cheda (segmentation) initialized")
-            except Exception as e:
-                console.print(f"⚠️ Cheda module not available: {e}")
+            if "cheda" in components and self.cheda is None:
+                try:
+                    from vidyut.cheda import Cheda
+                    cheda_path = self.data_path / "cheda"
+                    if cheda_path.exists():
+                        self.cheda = Cheda(str(cheda_path))
+                        console.print("✅ Cheda (segmentation) initialized")
+                except Exception as e:
+                    console.print(f"⚠️ Cheda module not available: {e}")
             
             # Initialize transliteration
-            try:
-                from vidyut.lipi import Lipi
-                self.lipi = Lipi()
-                console.print("✅ Lipi (transliteration) initialized")
-            except Exception as e:
-                console.print(f"⚠️ Lipi initialization failed: {e}")
+            if "lipi" in components and self.lipi is None:
+                try:
+                    from vidyut.lipi import Lipi
+                    self.lipi = Lipi()
+                    console.print("✅ Lipi (transliteration) initialized")
+                except Exception as e:
+                    console.print(f"⚠️ Lipi initialization failed: {e}")
             
             self._initialized = True
             return True
@@ -110,17 +123,66 @@ class VidyutService:
         """Check if Vidyut is properly initialized"""
         return self._initialized
     
+    def _require(self, component: str) -> bool:
+        """Load a single component on first use and report whether it is available"""
+        if component not in self._attempted:
+            self.initialize((component,))
+        return getattr(self, component) is not None
+    
+    def get_cache(self) -> Optional[WordCache]:
+        """Open the on-disk lookup cache for the current Vidyut data"""
+        if self._cache is None and self._use_cache:
+            try:
+                self._cache = WordCache(PANINI_HOME / "cache.sqlite3", self.data_version())
+                atexit.register(self._cache.close)
+            except Exception as e:
+                console.print(f"⚠️ Cache unavailable: {e}")
+                self._use_cache = False
+        return self._cache
+    
+    def data_version(self) -> str:
+        """Fingerprint of the Vidyut library and data files, used to invalidate the cache"""
+        from importlib import metadata
+        
+        try:
+            version = metadata.version("vidyut")
+        except metadata.PackageNotFoundError:
+            version = "unknown"
+        
+        size = 0
+        mtime = 0
+        for name in ("kosha", "cheda"):
+            path = self.data_path / name
+            if path.exists():
+                for file in path.rglob("*"):
+                    stat = file.stat()
+                    size += stat.st_size
+                    mtime = max(mtime, stat.st_mtime_ns)
+        return f"{version}:{size}:{mtime}"
+    
     def parse_word(self, word: str) -> List[ParsedWord]:
         """Parse a Sanskrit word and return possible interpretations"""
+        cache = self.get_cache()
+        if cache:
+            cached = cache.get("parse", word)
+            if cached is not None:
+                return [ParsedWord(**item) for item in cached]
+        
+        results = self._parse_word(word)
+        if cache and self._initialized:
+            cache.put("parse", word, [asdict(parsed) for parsed in results])
+        return results
+    
+    def _parse_word(self, word: str) -> List[ParsedWord]:
+        has_kosha = self._require("kosha")
         if not self._initialized:
-            if not self.initialize():
-                return []
+            return []
         
         try:
             results = []
             
             # Search in kosha (dictionary)
-            kosha_entries = list(self.kosha.get(word))
+            kosha_entries = list(self.kosha.get(word)) if has_kosha else []
             
             for entry in kosha_entries:
                 # Extract information from kosha entry
@@ -140,7 +202,7 @@ class VidyutService:
                 results.append(parsed)
             
             # If cheda is available, try word segmentation
-            if self.cheda and not results:
+            if not results and self._require("cheda"):
                 try:
                     cheda_results = self.cheda.run(word)
                     for result in cheda_results:
@@ -160,16 +222,46 @@ class VidyutService:
             console.print(f"❌ Error parsing word '{word}': {e}")
             return []
     
+    def segment(self, text: str) -> List[Dict[str, str]]:
+        """Segment a Sanskrit phrase into words using Cheda"""
+        if not self._require("cheda"):
+            return []
+        
+        try:
+            tokens = []
+            for token in self.cheda.run(text):
+                data = getattr(token, 'data', None)
+                tokens.append({
+                    "text": getattr(token, 'text', str(token)),
+                    "lemma": getattr(data, 'lemma', None) or getattr(token, 'lemma', None) or "",
+                    "info": str(data) if data is not None else ""
+                })
+            return tokens
+        except Exception as e:
+            console.print(f"⚠️ Cheda segmentation failed: {e}")
+            return []
+    
     def transliterate(self, text: str, source_script: str = "devanagari", target_script: str = "iast") -> str:
         """Transliterate text between scripts"""
-        if not self._initialized or not self.lipi:
+        cache = self.get_cache()
+        key = f"{source_script}:{target_script}:{text}"
+        if cache:
+            cached = cache.get("transliterate", key)
+            if cached is not None:
+                return cached
+        
+        if not self._require("lipi"):
             return text
         
         try:
-            return self.lipi.transliterate(text, source_script, target_script)
+            result = self.lipi.transliterate(text, source_script, target_script)
         except Exception as e:
             console.print(f"⚠️ Transliteration failed: {e}")
             return text
+        
+        if cache:
+            cache.put("transliterate", key, result)
+        return result
     
     def get_word_info(self, word: str) -> Dict[str, any]:
         """Get comprehensive information about a word"""
@@ -3,10 +3,23 @@
 Sample Sanskrit word database for the CLI game
 """
 
-from typing import List, Dict, NamedTuple
+from typing import List, Dict, NamedTuple, Optional
 from enum import Enum
+from pathlib import Path
+import hashlib
+import json
+import os
+import pickle
 import random
 
+from shared.search_index import SearchIndex
+
+from . import PANINI_HOME
+
+# Snapshots of parsed word files live here, keyed by the file's path
+SNAPSHOT_DIR = PANINI_HOME / "snapshots"
+SNAPSHOT_FORMAT = 1
+
 
 class Difficulty(Enum):
     BEGINNER = 1
@@ -29,10 +42,107 @@ class SanskritWordData(NamedTuple):
 
 
 class WordDatabase:
-    """Sample database of Sanskrit words for learning"""
+    """
+    Database of Sanskrit words for learning.
+    
+    Words come from a JSON lines file (path argument or PANINI_WORDS_FILE),
+    or from the built-in samples. Difficulty buckets, Devanagari/IAST maps
+    and the statistics summary are built in one pass at load time, and a
+    pickled snapshot of a file's words and indexes is reused until the file
+    changes.
+    """
+    
+    def __init__(self, path: Optional[Path] = None):
+        self._search_index: Optional[SearchIndex] = None
+        if path is None and os.environ.get("PANINI_WORDS_FILE"):
+            path = Path(os.environ["PANINI_WORDS_FILE"])
+        
+        if path is None:
+            self.words = self._initialize_words()
+            self._build_indexes()
+        elif not self._load_snapshot(path):
+            self.words = self._load_words_file(path)
+            self._build_indexes()
+            self._save_snapshot(path)
+    
+    def _build_indexes(self):
+        """Build lookup maps and statistics in a single pass over the words"""
+        self._by_difficulty: Dict[Difficulty, List[SanskritWordData]] = {d: [] for d in Difficulty}
+        self._by_devanagari: Dict[str, SanskritWordData] = {}
+        self._by_iast: Dict[str, SanskritWordData] = {}
+        for word in self.words:
+            self._by_difficulty[word.difficulty].append(word)
+            # Keep the first entry when a text appears more than once, as a scan would
+            self._by_devanagari.setdefault(word.devanagari, word)
+            self._by_iast.setdefault(word.iast, word)
+        
+        self._stats = {"total_words": len(self.words)}
+        for difficulty, bucket in self._by_difficulty.items():
+            self._stats[difficulty.name.lower()] = len(bucket)
+    
+    def _load_words_file(self, path: Path) -> List[SanskritWordData]:
+        """Load words from a JSON lines file, one SanskritWordData object per line"""
+        words = []
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    difficulty = record.pop("difficulty")
+                    if isinstance(difficulty, str):
+                        difficulty = Difficulty[difficulty.upper()]
+                    else:
+                        difficulty = Difficulty(difficulty)
+                    words.append(SanskritWordData(difficulty=difficulty, **record))
+                except (KeyError, TypeError, ValueError) as e:
+                    raise ValueError(f"{path}:{line_number}: invalid word entry: {e}") from e
+        return words
     
-    def __init__(self):
-        self.words = self._initialize_words()
+    def _snapshot_path(self, path: Path) -> Path:
+        digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+        return SNAPSHOT_DIR / f"words-{digest}.pickle"
+    
+    def _source_stamp(self, path: Path) -> tuple:
+        stat = path.stat()
+        return (SNAPSHOT_FORMAT, str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    
+    def _load_snapshot(self, path: Path) -> bool:
+        """Restore words and indexes from a snapshot that matches the file"""
+        snapshot_path = self._snapshot_path(path)
+        try:
+            with open(snapshot_path, "rb") as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return False
+        if snapshot.get("stamp") != self._source_stamp(path):
+            return False
+        self.words = snapshot["words"]
+        self._by_difficulty = snapshot["by_difficulty"]
+        self._by_devanagari = snapshot["by_devanagari"]
+        self._by_iast = snapshot["by_iast"]
+        self._stats = snapshot["stats"]
+        return True
+    
+    def _save_snapshot(self, path: Path):
+        """Write words and indexes so the next load skips parsing"""
+        snapshot = {
+            "stamp": self._source_stamp(path),
+            "words": self.words,
+            "by_difficulty": self._by_difficulty,
+            "by_devanagari": self._by_devanagari,
+            "by_iast": self._by_iast,
+            "stats": self._stats,
+        }
+        snapshot_path = self._snapshot_path(path)
+        try:
+            snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = snapshot_path.with_name(snapshot_path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, snapshot_path)
+        except OSError:
+            pass  # A missing snapshot only costs a re-parse next time
     
     def _initialize_words(self) -> List[SanskritWordData]:
         """Initialize with sample Sanskrit words"""
@@ -215,42 +325,30 @@ class WordDatabase:
     def get_random_word(self, difficulty: Difficulty = None) -> SanskritWordData:
         """Get a random word, optionally filtered by difficulty"""
         if difficulty:
-            filtered_words = [w for w in self.words if w.difficulty == difficulty]
+            filtered_words = self._by_difficulty[difficulty]
             return random.choice(filtered_words) if filtered_words else random.choice(self.words)
         return random.choice(self.words)
     
     def get_words_by_difficulty(self, difficulty: Difficulty) -> List[SanskritWordData]:
         """Get all words of a specific difficulty level"""
-        return [w for w in self.words if w.difficulty == difficulty]
+        return list(self._by_difficulty[difficulty])
     
     def search_words(self, query: str) -> List[SanskritWordData]:
-        """Search for words containing the query string"""
-        query = query.lower()
-        results = []
-        for word in self.words:
-            if (query in word.devanagari.lower() or 
-                query in word.iast.lower() or 
-                query in word.meaning.lower()):
-                results.append(word)
-        return results
+        """Search for words whose Devanagari, IAST (with or without diacritics) or meaning contains the query"""
+        if self._search_index is None:
+            # Built on first search so other commands don't pay for it
+            self._search_index = SearchIndex()
+            for i, word in enumerate(self.words):
+                self._search_index.add(i, (word.devanagari, word.iast, word.meaning))
+        return [self.words[i] for i in self._search_index.search(query)]
     
     def get_word_by_text(self, text: str) -> SanskritWordData:
         """Get word by Devanagari or IAST text"""
-        for word in self.words:
-            if word.devanagari == text or word.iast == text:
-                return word
-        return None
+        return self._by_devanagari.get(text) or self._by_iast.get(text)
     
     def get_stats(self) -> Dict[str, int]:
         """Get database statistics"""
-        stats = {
-            "total_words": len(self.words),
-            "beginner": len([w for w in self.words if w.difficulty == Difficulty.BEGINNER]),
-            "intermediate": len([w for w in self.words if w.difficulty == Difficulty.INTERMEDIATE]),
-            "advanced": len([w for w in self.words if w.difficulty == Difficulty.ADVANCED]),
-            "expert": len([w for w in self.words if w.difficulty == Difficulty.EXPERT])
-        }
-        return stats
+        return dict(self._stats)
 
 
 # Global database instance
@@ -0,0 +1,99 @@
+"""
+Incrementally maintained inverted index for substring word search
+"""
+
+import unicodedata
+from typing import Dict, Iterable, List, Set
+
+
+def fold_diacritics(text: str) -> str:
+    """
+    Strip Latin combining diacritics, so "devaḥ" folds to "devah".
+
+    Only the Combining Diacritical Marks block is removed; Devanagari vowel
+    signs and viramas are left untouched.
+    """
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(ch for ch in decomposed if not "̀" <= ch <= "ͯ")
+
+
+def normalize_variants(text: str) -> Set[str]:
+    """Lowercased text plus its diacritic-folded form"""
+    lowered = text.lower()
+    return {lowered, fold_diacritics(lowered)}
+
+
+class SearchIndex:
+    """
+    Inverted n-gram index over the text fields of documents.
+
+    Every 1- to 3-character gram of each normalized field maps to the ids
+    that contain it. Queries of up to three characters are answered straight
+    from the postings; longer queries intersect their trigram postings and
+    verify the few remaining candidates, so cost follows the number of
+    matches rather than the corpus size.
+    """
+
+    GRAM_SIZE = 3
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        self._texts: Dict[int, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, doc_id: int, fields: Iterable[str]) -> None:
+        """Index a document's fields, replacing any previous entry"""
+        if doc_id in self._texts:
+            self.remove(doc_id)
+        texts = set()
+        for field in fields:
+            if field:
+                texts |= normalize_variants(field)
+        self._texts[doc_id] = texts
+        for gram in self._grams(texts):
+            self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        """Drop a document from the index"""
+        texts = self._texts.pop(doc_id, None)
+        if texts is None:
+            return
+        for gram in self._grams(texts):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def search(self, query: str) -> List[int]:
+        """
+        Ids of documents with a field containing the query, in ascending order.
+
+        Fields are also indexed without diacritics, so "devah" finds "devaḥ",
+        while a query that spells out diacritics only matches them exactly.
+        """
+        query = query.lower()
+        if not query:
+            return sorted(self._texts)
+        if len(query) <= self.GRAM_SIZE:
+            return sorted(self._postings.get(query, ()))
+
+        grams = sorted(
+            (self._postings.get(query[i:i + self.GRAM_SIZE], set())
+             for i in range(len(query) - self.GRAM_SIZE + 1)),
+            key=len,
+        )
+        candidates = set.intersection(*grams)
+        return sorted(
+            doc_id for doc_id in candidates
+            if any(query in text for text in self._texts[doc_id])
+        )
+
+    def _grams(self, texts: Iterable[str]) -> Set[str]:
+        grams = set()
+        for text in texts:
+            for size in range(1, self.GRAM_SIZE + 1):
+                grams.update(text[i:i + size] for i in range(len(text) - size + 1))
+        return grams